@@ -0,0 +1,117 @@
+import threading
+from array import array
+from datetime import date
+from typing import Callable, Dict, Iterable, Optional, Set, Tuple
+
+# Carga los festivos de un año como pares (fecha, region); region None = nacional
+CargadorFestivos = Callable[[int], Iterable[Tuple[date, Optional[str]]]]
+
+# weekday() de sábado y domingo
+DIAS_NO_LABORABLES = (5, 6)
+
+# Días del año anterior incluidos en cada tabla, para resolver el 1 de enero sin cambiar de tabla
+_MARGEN_DIAS = 31
+
+
+def normalizar_region(region: Optional[str]) -> Optional[str]:
+    region = (region or "").strip().upper()
+    return region or None
+
+
+class _TablaAnio:
+    """
+    Calendario de un año y región: desde el 1 de diciembre del año anterior al 31/12.
+
+    - habiles[i] = 1 si el día base + i es laborable.
+    - anterior[i] = ordinal del último día laborable en o antes de base + i.
+    """
+
+    __slots__ = ("base", "habiles", "anterior")
+
+    def __init__(self, anio: int, festivos: Set[int]):
+        self.base = date(anio, 1, 1).toordinal() - _MARGEN_DIAS
+        fin = date(anio, 12, 31).toordinal()
+        self.habiles = bytearray(fin - self.base + 1)
+        self.anterior = array("l", [0]) * len(self.habiles)
+
+        # Último laborable antes del inicio de la tabla (solo fines de semana: margen de un mes)
+        ultimo = self.base - 1
+        while (ultimo + 6) % 7 in DIAS_NO_LABORABLES:
+            ultimo -= 1
+
+        for i in range(len(self.habiles)):
+            ordinal = self.base + i
+            # date.fromordinal(1) es lunes: weekday = (ordinal + 6) % 7
+            if (ordinal + 6) % 7 not in DIAS_NO_LABORABLES and ordinal not in festivos:
+                self.habiles[i] = 1
+                ultimo = ordinal
+            self.anterior[i] = ultimo
+
+
+class CalendarioLaboral:
+    """
+    Días laborables por año y región, precalculados y mantenidos en memoria.
+
+    Cada (año, región) se construye una vez a partir de los festivos nacionales y
+    los de esa región; a partir de ahí es_habil y dia_habil_anterior son un acceso
+    por índice. Sin cargador solo se consideran no laborables sábados y domingos.
+    comprobar, si se indica, se llama antes de cada consulta y puede invalidar() el
+    calendario si los festivos han cambiado (fuera del lock del calendario).
+    """
+
+    def __init__(self, cargador: Optional[CargadorFestivos] = None,
+                 comprobar: Optional[Callable[[], None]] = None):
+        self._cargador = cargador
+        self._comprobar = comprobar
+        self._festivos: Dict[int, Dict[Optional[str], Set[int]]] = {}
+        self._tablas: Dict[Tuple[int, Optional[str]], _TablaAnio] = {}
+        self._lock = threading.Lock()
+
+    def _festivos_anio(self, anio: int) -> Dict[Optional[str], Set[int]]:
+        if anio not in self._festivos:
+            por_region: Dict[Optional[str], Set[int]] = {}
+            if self._cargador is not None:
+                for fecha, region in self._cargador(anio):
+                    por_region.setdefault(normalizar_region(region), set()).add(fecha.toordinal())
+            self._festivos[anio] = por_region
+        return self._festivos[anio]
+
+    def _tabla(self, anio: int, region: Optional[str]) -> _TablaAnio:
+        if self._comprobar is not None:
+            self._comprobar()
+        clave = (anio, region)
+        tabla = self._tablas.get(clave)
+        if tabla is None:
+            with self._lock:
+                tabla = self._tablas.get(clave)
+                if tabla is None:
+                    festivos: Set[int] = set()
+                    for a in (anio - 1, anio):
+                        por_region = self._festivos_anio(a)
+                        festivos |= por_region.get(None, set())
+                        if region is not None:
+                            festivos |= por_region.get(region, set())
+                    tabla = self._tablas[clave] = _TablaAnio(anio, festivos)
+        return tabla
+
+    def es_habil(self, fecha: date, region: Optional[str] = None) -> bool:
+        tabla = self._tabla(fecha.year, normalizar_region(region))
+        return bool(tabla.habiles[fecha.toordinal() - tabla.base])
+
+    def dia_habil_anterior(self, fecha: date, region: Optional[str] = None) -> date:
+        """La propia fecha si es laborable; si no, el último día laborable anterior"""
+        tabla = self._tabla(fecha.year, normalizar_region(region))
+        ordinal = fecha.toordinal()
+        anterior = tabla.anterior[ordinal - tabla.base]
+        return fecha if anterior == ordinal else date.fromordinal(anterior)
+
+    def invalidar(self, anio: Optional[int] = None):
+        """Descarta los festivos y tablas de un año (y las del siguiente, que lo incluyen) o todo"""
+        with self._lock:
+            if anio is None:
+                self._festivos.clear()
+                self._tablas.clear()
+                return
+            self._festivos.pop(anio, None)
+            for clave in [c for c in self._tablas if c[0] in (anio, anio + 1)]:
+                del self._tablas[clave]
@@ -1,9 +1,35 @@
 from abc import ABC, abstractmethod
-from app.domain.entities.proceso import Proceso
+from app.domain.entities.cliente_proceso import ClienteProceso
 from app.domain.repositories.cliente_proceso_repository import ClienteProcesoRepository
-from app.domain.repositories.proceso_hito_maestro_repository import ProcesoHitoMaestroRepository
+from .plan_calendario import PlanCalendario
 
 class GeneradorTemporalidad(ABC):
     @abstractmethod
-    def generar(self, data, proceso_maestro: Proceso, repo: ClienteProcesoRepository, repo_hito_maestro: ProcesoHitoMaestroRepository) -> dict:
+    def generar(self, data, plan: PlanCalendario, repo: ClienteProcesoRepository) -> dict:
         pass
+
+    def crear_procesos(self, data, periodos, anio: int, repo: ClienteProcesoRepository) -> dict:
+        """Convierte los periodos de la serie en ClienteProceso y los inserta en un único lote"""
+        procesos_creados = [
+            ClienteProceso(
+                id=None,
+                cliente_id=data.cliente_id,
+                proceso_id=data.proceso_id,
+                fecha_inicio=fecha_inicio,
+                fecha_fin=fecha_fin,
+                mes=fecha_inicio.month,
+                anio=fecha_inicio.year,
+                anterior_id=None
+            )
+            for fecha_inicio, fecha_fin in periodos
+        ]
+
+        # Un único INSERT por lotes; el commit lo hace quien inserta los hitos
+        repo.guardar_lote(procesos_creados, confirmar=False)
+
+        return {
+            "mensaje": "Procesos cliente generados con éxito",
+            "cantidad": len(procesos_creados),
+            "anio": anio,
+            "procesos": procesos_creados
+        }
@@ -1,25 +1,13 @@
 from datetime import date
 from calendar import monthrange
-from app.domain.entities.cliente_proceso import ClienteProceso
-from app.domain.entities.proceso import Proceso
 from app.domain.repositories.cliente_proceso_repository import ClienteProcesoRepository
-from app.domain.repositories.proceso_hito_maestro_repository import ProcesoHitoMaestroRepository
 from .base_generador import GeneradorTemporalidad
+from .plan_calendario import PlanCalendario
+from .serie_fechas import serie_periodos
 
 class GeneradorTrimestral(GeneradorTemporalidad):
-    def generar(self, data, proceso_maestro: Proceso, repo: ClienteProcesoRepository, repo_hito_maestro: ProcesoHitoMaestroRepository) -> dict:
-        procesos_creados = []
-
-        # Obtener hitos del proceso maestro
-        hitos_maestros = repo_hito_maestro.listar_por_proceso(proceso_maestro.id)
-
-        if not hitos_maestros:
-            raise ValueError(f"No se encontraron hitos para el proceso {proceso_maestro.id}")
-
-        # Ordenar hitos por fecha límite para obtener el primero y último
-        hitos_ordenados = sorted(hitos_maestros, key=lambda x: x[1].fecha_limite or date.today())
-        primer_hito = hitos_ordenados[0][1]  # HitoModel
-        ultimo_hito = hitos_ordenados[-1][1]  # HitoModel
+    def generar(self, data, plan: PlanCalendario, repo: ClienteProcesoRepository) -> dict:
+        primer_hito = plan.primer_hito  # HitoModel
 
         # Determinar fecha de inicio: prioridad a data.fecha_inicio (respetando el día exacto)
         if hasattr(data, 'fecha_inicio') and data.fecha_inicio:
@@ -37,52 +25,7 @@ class GeneradorTrimestral(GeneradorTemporalidad):
         # La fecha de fin será el fin de año del año de inicio
         fecha_fin_proceso = date(anio, 12, 31)
 
-        # Generar procesos trimestrales desde el mes de inicio hasta el mes de fin
-        fecha_actual = fecha_inicio_proceso
-
-        while fecha_actual <= fecha_fin_proceso:
-            # Fecha de inicio del trimestre actual respetando día deseado
-            _, last_day_inicio = monthrange(fecha_actual.year, fecha_actual.month)
-            fecha_inicio = date(fecha_actual.year, fecha_actual.month, min(dia_inicio_deseado, last_day_inicio))
-
-            # Un trimestre son 3 meses, así que el mes final será mes_inicio + 2
-            mes_fin = min(fecha_actual.month + 2, 12)
-            _, last_day_fin = monthrange(fecha_actual.year, mes_fin)
-            fecha_fin = date(fecha_actual.year, mes_fin, last_day_fin)
-
-            # Si el periodo alcanza fin de año, ajustar a 31/12
-            if fecha_actual.year == fecha_fin_proceso.year and (fecha_actual.month + 2) >= 12:
-                fecha_fin = fecha_fin_proceso
-
-            cliente_proceso = ClienteProceso(
-                id=None,
-                cliente_id=data.cliente_id,
-                proceso_id=data.proceso_id,
-                fecha_inicio=fecha_inicio,
-                fecha_fin=fecha_fin,
-                mes=fecha_actual.month,
-                anio=fecha_actual.year,
-                anterior_id=None
-            )
-            procesos_creados.append(repo.guardar(cliente_proceso))
-
-            # Avanzar 3 meses para el siguiente trimestre
-            if fecha_actual.month + 3 > 12:
-                # Si el siguiente trimestre sería en el próximo año
-                if fecha_actual.year + 1 <= fecha_fin_proceso.year:
-                    fecha_actual = date(fecha_actual.year + 1, (fecha_actual.month + 3) - 12, 1)
-                else:
-                    break
-            else:
-                fecha_actual = date(fecha_actual.year, fecha_actual.month + 3, 1)
-
-            # Si hemos pasado la fecha de fin, terminar
-            if fecha_actual > fecha_fin_proceso:
-                break
+        # Trimestres desde el mes de inicio; el que alcanza diciembre termina el 31/12
+        periodos = serie_periodos("trimestre", fecha_inicio_proceso, fecha_fin_proceso, dia=dia_inicio_deseado)
 
-        return {
-            "mensaje": "Procesos cliente generados con éxito",
-            "cantidad": len(procesos_creados),
-            "anio": anio,
-            "procesos": procesos_creados
-        }
+        return self.crear_procesos(data, periodos, anio, repo)
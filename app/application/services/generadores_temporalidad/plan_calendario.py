@@ -0,0 +1,62 @@
+from datetime import date, datetime
+from calendar import monthrange
+from typing import List, Optional
+from app.application.services.calendario_laboral import CalendarioLaboral
+from app.domain.entities.cliente_proceso import ClienteProceso
+from app.domain.entities.cliente_proceso_hito import ClienteProcesoHito
+from app.domain.entities.proceso import Proceso
+from app.domain.repositories.proceso_hito_maestro_repository import ProcesoHitoMaestroRepository
+
+
+class PlanCalendario:
+    """
+    Datos de un proceso maestro necesarios para generar su calendario, cargados una sola vez.
+
+    Lo comparten el generador de periodos y la expansión de hitos por periodo, de modo
+    que el join ProcesoHitoMaestro + Hito se consulta una vez por generación. Las fechas
+    límite se ajustan al día laborable anterior según el calendario laboral recibido
+    (sin calendario, solo sábados y domingos).
+    """
+
+    def __init__(self, proceso: Proceso, hitos_maestros: list, calendario: Optional[CalendarioLaboral] = None):
+        if not hitos_maestros:
+            raise ValueError(f"No se encontraron hitos para el proceso {proceso.id}")
+
+        self.proceso = proceso
+        self.hitos_maestros = hitos_maestros  # [(ProcesoHitoMaestroModel, HitoModel)]
+        self.calendario = calendario or CalendarioLaboral()
+
+        # Ordenar hitos por fecha límite para obtener el primero y último
+        hitos_ordenados = sorted(hitos_maestros, key=lambda x: x[1].fecha_limite or date.today())
+        self.primer_hito = hitos_ordenados[0][1]  # HitoModel
+        self.ultimo_hito = hitos_ordenados[-1][1]  # HitoModel
+
+    @classmethod
+    def cargar(cls, proceso: Proceso, repo_hito_maestro: ProcesoHitoMaestroRepository,
+               calendario: Optional[CalendarioLaboral] = None) -> "PlanCalendario":
+        return cls(proceso, repo_hito_maestro.listar_por_proceso(proceso.id), calendario)
+
+    def fecha_limite_hito(self, hito, cliente_proceso: ClienteProceso, region: Optional[str] = None) -> date:
+        """Fecha límite del hito replicada en el mes/año del periodo, ajustada a día laborable"""
+        base = cliente_proceso.fecha_fin or cliente_proceso.fecha_inicio
+        dia_hito = hito.fecha_limite.day if hito.fecha_limite else 1
+        _, last_day = monthrange(base.year, base.month)
+        return self.calendario.dia_habil_anterior(date(base.year, base.month, min(dia_hito, last_day)), region)
+
+    def hitos_para(self, cliente_proceso: ClienteProceso, fecha_estado: datetime,
+                   region: Optional[str] = None) -> List[ClienteProcesoHito]:
+        """Instancia los hitos del proceso maestro para un ClienteProceso ya persistido.
+        region: provincia del cliente, para aplicar también sus festivos regionales."""
+        return [
+            ClienteProcesoHito(
+                id=None,
+                cliente_proceso_id=cliente_proceso.id,
+                hito_id=hito.id,
+                estado="Nuevo",
+                fecha_limite=self.fecha_limite_hito(hito, cliente_proceso, region),
+                hora_limite=hito.hora_limite,
+                fecha_estado=fecha_estado,
+                tipo=hito.tipo
+            )
+            for _, hito in self.hitos_maestros
+        ]
@@ -0,0 +1,83 @@
+from datetime import date
+from calendar import monthrange
+from functools import lru_cache
+from typing import Optional, Tuple
+
+# (fecha_inicio, fecha_fin) de un periodo
+Periodo = Tuple[date, date]
+
+# temporalidad -> (unidad, tamaño del paso, recortar el último periodo a fin_serie)
+# Los pasos en días con frecuencia None usan la frecuencia del proceso.
+_REGLAS = {
+    "dia": ("dias", None, False),
+    "semana": ("dias", 7, False),
+    "quincena": ("dias", 15, True),
+    "mes": ("meses", 1, True),
+    "trimestre": ("meses", 3, True),
+    "semestre": ("meses", 6, True),
+}
+
+
+@lru_cache(maxsize=4096)
+def serie_por_dias(inicio: date, dias: int, fin_serie: date, recortar_fin: bool = False) -> Tuple[Periodo, ...]:
+    """
+    Periodos de `dias` días que empiezan en inicio, inicio + dias, ... mientras el inicio
+    no pase de fin_serie. Con recortar_fin el último periodo termina como tarde en fin_serie.
+    """
+    if dias <= 0:
+        raise ValueError(f"El paso en días debe ser positivo: {dias}")
+    ultimo = fin_serie.toordinal()
+    periodos = []
+    for ordinal in range(inicio.toordinal(), ultimo + 1, dias):
+        fin = ordinal + dias - 1
+        if recortar_fin and fin > ultimo:
+            fin = ultimo
+        periodos.append((date.fromordinal(ordinal), date.fromordinal(fin)))
+    return tuple(periodos)
+
+
+@lru_cache(maxsize=4096)
+def serie_por_meses(inicio: date, meses: int, fin_serie: date, dia: Optional[int] = None) -> Tuple[Periodo, ...]:
+    """
+    Periodos de `meses` meses desde el mes de inicio mientras su arranque no pase de fin_serie.
+
+    - Cada periodo empieza el día `dia` (por defecto inicio.day) ajustado al último día del mes.
+    - Termina el último día de su mes final, sin cruzar diciembre.
+    - El periodo que alcanza el mes de fin_serie en su mismo año termina en fin_serie.
+    """
+    if meses <= 0:
+        raise ValueError(f"El paso en meses debe ser positivo: {meses}")
+    dia = dia or inicio.day
+    indice = inicio.year * 12 + inicio.month - 1
+    arranque = inicio
+    periodos = []
+    while arranque <= fin_serie:
+        anio, mes = divmod(indice, 12)
+        mes += 1
+        fecha_inicio = date(anio, mes, min(dia, monthrange(anio, mes)[1]))
+        mes_fin = min(mes + meses - 1, 12)
+        if anio == fin_serie.year and mes + meses - 1 >= fin_serie.month:
+            fecha_fin = fin_serie
+        else:
+            fecha_fin = date(anio, mes_fin, monthrange(anio, mes_fin)[1])
+        periodos.append((fecha_inicio, fecha_fin))
+
+        indice += meses
+        arranque = date(indice // 12, indice % 12 + 1, 1)
+    return tuple(periodos)
+
+
+def serie_periodos(temporalidad: str, inicio: date, fin_serie: date, frecuencia: int = 1, dia: Optional[int] = None) -> Tuple[Periodo, ...]:
+    """
+    Límites de los periodos de una temporalidad entre inicio y fin_serie.
+
+    Función pura y memorizada: no toca la base de datos, así que los generadores
+    pueden reutilizarla para todos los clientes de un mismo proceso y año.
+    """
+    regla = _REGLAS.get(temporalidad.lower())
+    if regla is None:
+        raise ValueError(f"Temporalidad no soportada: {temporalidad}")
+    unidad, paso, recortar = regla
+    if unidad == "dias":
+        return serie_por_dias(inicio, paso or frecuencia, fin_serie, recortar)
+    return serie_por_meses(inicio, paso, fin_serie, dia)
@@ -0,0 +1,156 @@
+from collections import OrderedDict
+from datetime import date, datetime, time
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.infrastructure.db.compartido.clientes_scope import preparar_mis_clientes
+
+
+# Una sola pasada sobre los cliente_proceso_hito del empleado. Agrega por
+# (cliente, proceso) con agregación condicional: cada columna es un KPI o una
+# de las dos ventanas de 30 días que antes eran consultas independientes.
+SQL_AGREGADOS_METRICAS = """
+SELECT
+    mc.id_cliente AS cliente_id,
+    p.id AS proceso_id,
+    LTRIM(RTRIM(p.nombre)) AS proceso_nombre,
+    DATEADD(day, -30, GETDATE()) AS limite_30,
+    DATEADD(day, -60, GETDATE()) AS limite_60,
+    MAX(cph.fecha_limite) AS ultima_fecha_limite,
+
+    COUNT(cph.id) AS total,
+    COUNT(CASE WHEN cph.estado = 'Finalizado' THEN 1 END) AS completados,
+    COUNT(CASE WHEN cph.estado != 'Finalizado' THEN 1 END) AS pendientes,
+
+    COUNT(CASE WHEN cph.fecha_limite >= DATEADD(day, -30, GETDATE()) THEN 1 END) AS total_actual,
+    COUNT(CASE WHEN cph.fecha_limite >= DATEADD(day, -60, GETDATE())
+                AND cph.fecha_limite < DATEADD(day, -30, GETDATE()) THEN 1 END) AS total_anterior,
+
+    COUNT(CASE WHEN cph.estado = 'Finalizado'
+                AND cph.fecha_limite >= DATEADD(day, -30, GETDATE()) THEN 1 END) AS completados_limite_actual,
+    COUNT(CASE WHEN cph.estado = 'Finalizado'
+                AND cph.fecha_limite >= DATEADD(day, -60, GETDATE())
+                AND cph.fecha_limite < DATEADD(day, -30, GETDATE()) THEN 1 END) AS completados_limite_anterior,
+
+    COUNT(CASE WHEN cph.estado != 'Finalizado'
+                AND cph.fecha_limite >= DATEADD(day, -30, GETDATE()) THEN 1 END) AS pendientes_actual,
+    COUNT(CASE WHEN cph.estado != 'Finalizado'
+                AND cph.fecha_limite >= DATEADD(day, -60, GETDATE())
+                AND cph.fecha_limite < DATEADD(day, -30, GETDATE()) THEN 1 END) AS pendientes_anterior,
+
+    COUNT(CASE WHEN cph.estado = 'Finalizado'
+                AND CAST(cph.fecha_estado AS DATE) >= DATEADD(day, -30, GETDATE()) THEN 1 END) AS completados_actual,
+    COUNT(CASE WHEN cph.estado = 'Finalizado'
+                AND CAST(cph.fecha_estado AS DATE) >= DATEADD(day, -60, GETDATE())
+                AND CAST(cph.fecha_estado AS DATE) < DATEADD(day, -30, GETDATE()) THEN 1 END) AS completados_anterior,
+
+    COUNT(CASE WHEN cph.estado != 'Finalizado' AND cph.fecha_limite < GETDATE() THEN 1 END) AS vencidos,
+    COUNT(CASE WHEN cph.estado != 'Finalizado' AND cph.fecha_limite < GETDATE()
+                AND cph.fecha_limite >= DATEADD(day, -30, GETDATE()) THEN 1 END) AS vencidos_actual,
+    COUNT(CASE WHEN cph.estado != 'Finalizado'
+                AND cph.fecha_limite < DATEADD(day, -30, GETDATE())
+                AND cph.fecha_limite >= DATEADD(day, -60, GETDATE()) THEN 1 END) AS vencidos_anterior,
+
+    SUM(CASE WHEN cph.estado = 'Finalizado'
+              AND CAST(cph.fecha_estado AS DATE) >= DATEADD(day, -30, GETDATE())
+             THEN DATEDIFF(day, cph.fecha_limite, CAST(cph.fecha_estado AS DATE)) END) AS dias_resolucion_actual,
+    COUNT(CASE WHEN cph.estado = 'Finalizado'
+                AND CAST(cph.fecha_estado AS DATE) >= DATEADD(day, -30, GETDATE())
+                AND cph.fecha_limite IS NOT NULL THEN 1 END) AS resueltos_actual,
+    SUM(CASE WHEN cph.estado = 'Finalizado'
+              AND CAST(cph.fecha_estado AS DATE) >= DATEADD(day, -60, GETDATE())
+              AND CAST(cph.fecha_estado AS DATE) < DATEADD(day, -30, GETDATE())
+             THEN DATEDIFF(day, cph.fecha_limite, CAST(cph.fecha_estado AS DATE)) END) AS dias_resolucion_anterior,
+    COUNT(CASE WHEN cph.estado = 'Finalizado'
+                AND CAST(cph.fecha_estado AS DATE) >= DATEADD(day, -60, GETDATE())
+                AND CAST(cph.fecha_estado AS DATE) < DATEADD(day, -30, GETDATE())
+                AND cph.fecha_limite IS NOT NULL THEN 1 END) AS resueltos_anterior
+FROM mis_clientes mc
+JOIN clientes c ON c.idcliente = mc.id_cliente
+LEFT JOIN cliente_proceso cp ON cp.cliente_id = c.idcliente
+LEFT JOIN proceso p ON p.id = cp.proceso_id
+LEFT JOIN cliente_proceso_hito cph ON cph.cliente_proceso_id = cp.id
+GROUP BY mc.id_cliente, p.id, p.nombre
+ORDER BY proceso_nombre
+"""
+
+# Columnas que se suman tal cual para obtener los totales del empleado
+_COLUMNAS_SUMABLES = (
+    "total", "completados", "pendientes",
+    "total_actual", "total_anterior",
+    "completados_limite_actual", "completados_limite_anterior",
+    "pendientes_actual", "pendientes_anterior",
+    "completados_actual", "completados_anterior",
+    "vencidos", "vencidos_actual", "vencidos_anterior",
+    "dias_resolucion_actual", "resueltos_actual",
+    "dias_resolucion_anterior", "resueltos_anterior",
+)
+
+
+class AgregadosMetricas:
+    """Resultado de la pasada única: totales, desglose por proceso y última actividad por cliente."""
+
+    def __init__(self, filas: List[Any]):
+        self.totales: Dict[str, int] = {col: 0 for col in _COLUMNAS_SUMABLES}
+        self.por_proceso: "OrderedDict[int, Dict[str, Any]]" = OrderedDict()
+        self.ultima_actividad_cliente: Dict[str, Optional[date]] = {}
+        self.limite_30: Optional[datetime] = None
+        self.limite_60: Optional[datetime] = None
+
+        for fila in filas:
+            self.limite_30 = fila.limite_30
+            self.limite_60 = fila.limite_60
+
+            for col in _COLUMNAS_SUMABLES:
+                self.totales[col] += int(getattr(fila, col) or 0)
+
+            ultima = fila.ultima_fecha_limite
+            previa = self.ultima_actividad_cliente.get(fila.cliente_id)
+            if previa is None or (ultima is not None and ultima > previa):
+                self.ultima_actividad_cliente[fila.cliente_id] = ultima
+
+            if fila.proceso_id is None or not fila.total:
+                continue
+            proceso = self.por_proceso.setdefault(fila.proceso_id, {
+                "nombreProceso": str(fila.proceso_nombre or "").strip(),
+                "hitosPendientes": 0,
+                "hitosCompletados": 0,
+            })
+            proceso["hitosPendientes"] += int(fila.pendientes or 0)
+            proceso["hitosCompletados"] += int(fila.completados or 0)
+
+    def clientes_inactivos(self, limite: Optional[datetime]) -> int:
+        """Clientes sin hitos o cuya última fecha límite es anterior al límite dado"""
+        if limite is None:
+            return 0
+        inactivos = 0
+        for ultima in self.ultima_actividad_cliente.values():
+            if ultima is None or datetime.combine(ultima, time.min) < limite:
+                inactivos += 1
+        return inactivos
+
+    @staticmethod
+    def media(suma: int, cantidad: int) -> float:
+        return float(suma) / cantidad if cantidad else 0.0
+
+
+class MotorMetricas:
+    """
+    Motor de métricas del dashboard: un único round trip por empleado.
+
+    Los agregados se memorizan por email durante la vida de la instancia
+    (una petición), de modo que varios KPIs pedidos juntos comparten la consulta.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+        self._agregados: Dict[str, AgregadosMetricas] = {}
+
+    def agregados(self, email: str) -> AgregadosMetricas:
+        if email not in self._agregados:
+            sql = preparar_mis_clientes(self.db, email) + SQL_AGREGADOS_METRICAS
+            filas = self.db.execute(text(sql), {"email": email}).fetchall()
+            self._agregados[email] = AgregadosMetricas(filas)
+        return self._agregados[email]
@@ -2,11 +2,24 @@ from typing import List, Dict, Any, Optional
 from datetime import datetime, date
 from sqlalchemy.orm import Session
 from sqlalchemy import text
-from app.infrastructure.db.compartido.mis_clientes_cte import MIS_CLIENTES_CTE
+from app.infrastructure.db.compartido.clientes_scope import preparar_mis_clientes
+from app.application.services.metricas_engine import MotorMetricas
 
 class MetricasService:
     def __init__(self, db: Session):
         self.db = db
+        self.motor = MotorMetricas(db)
+
+    def _mis_clientes_cte(self, email: str) -> str:
+        """CTE mis_clientes sobre la tabla temporal cargada desde la caché de alcance"""
+        return preparar_mis_clientes(self.db, email)
+
+    @staticmethod
+    def _select_periodo_kpi(alias: str) -> str:
+        """SELECT con el periodo 'yyyy-MM' formateado por grupo (no por fila) sobre el agregado diario"""
+        return f"""
+        SELECT
+            CONCAT(YEAR(k.dia), '-', RIGHT('0' + CAST(MONTH(k.dia) AS VARCHAR(2)), 2)) AS {alias}"""
 
     def _calcular_tendencia(self, valor_actual: float, valor_anterior: float) -> str:
         """Calcula la tendencia porcentual entre dos valores"""
@@ -22,60 +35,22 @@ class MetricasService:
 
     def get_cumplimiento_hitos(self, email: str) -> Dict[str, Any]:
         """Obtiene porcentaje de cumplimiento de hitos por cliente"""
-        # Consulta para últimos 30 días
-        sql_actual = MIS_CLIENTES_CTE + """
-        SELECT
-            COUNT(cph.id) AS hitos_totales,
-            COUNT(CASE WHEN cph.estado = 'Finalizado' THEN 1 END) AS hitos_completados
-        FROM mis_clientes mc
-        JOIN clientes c ON c.idcliente = mc.id_cliente
-        JOIN cliente_proceso cp ON cp.cliente_id = c.idcliente
-        JOIN cliente_proceso_hito cph ON cph.cliente_proceso_id = cp.id
-        WHERE cph.fecha_limite >= DATEADD(day, -30, GETDATE())
-        """
-
-        # Consulta para 30 días anteriores (días 31-60)
-        sql_anterior = MIS_CLIENTES_CTE + """
-        SELECT
-            COUNT(cph.id) AS hitos_totales,
-            COUNT(CASE WHEN cph.estado = 'Finalizado' THEN 1 END) AS hitos_completados
-        FROM mis_clientes mc
-        JOIN clientes c ON c.idcliente = mc.id_cliente
-        JOIN cliente_proceso cp ON cp.cliente_id = c.idcliente
-        JOIN cliente_proceso_hito cph ON cph.cliente_proceso_id = cp.id
-        WHERE cph.fecha_limite >= DATEADD(day, -60, GETDATE())
-          AND cph.fecha_limite < DATEADD(day, -30, GETDATE())
-        """
-
-        # Consulta general para todos los hitos
-        sql_general = MIS_CLIENTES_CTE + """
-        SELECT
-            COUNT(cph.id) AS hitos_totales,
-            COUNT(CASE WHEN cph.estado = 'Finalizado' THEN 1 END) AS hitos_completados
-        FROM mis_clientes mc
-        JOIN clientes c ON c.idcliente = mc.id_cliente
-        JOIN cliente_proceso cp ON cp.cliente_id = c.idcliente
-        JOIN cliente_proceso_hito cph ON cph.cliente_proceso_id = cp.id
-        """
-
-        result_actual = self.db.execute(text(sql_actual), {"email": email}).fetchone()
-        result_anterior = self.db.execute(text(sql_anterior), {"email": email}).fetchone()
-        result_general = self.db.execute(text(sql_general), {"email": email}).fetchone()
+        totales = self.motor.agregados(email).totales
 
         # Calcular porcentaje general
         porcentaje_general = 0.0
-        if result_general and result_general.hitos_totales > 0:
-            porcentaje_general = round((result_general.hitos_completados * 100.0) / result_general.hitos_totales, 2)
+        if totales["total"] > 0:
+            porcentaje_general = round((totales["completados"] * 100.0) / totales["total"], 2)
 
-        # Calcular tendencia
+        # Calcular tendencia (últimos 30 días frente a los 30 anteriores)
         porcentaje_actual = 0.0
         porcentaje_anterior = 0.0
 
-        if result_actual and result_actual.hitos_totales > 0:
-            porcentaje_actual = (result_actual.hitos_completados * 100.0) / result_actual.hitos_totales
+        if totales["total_actual"] > 0:
+            porcentaje_actual = (totales["completados_limite_actual"] * 100.0) / totales["total_actual"]
 
-        if result_anterior and result_anterior.hitos_totales > 0:
-            porcentaje_anterior = (result_anterior.hitos_completados * 100.0) / result_anterior.hitos_totales
+        if totales["total_anterior"] > 0:
+            porcentaje_anterior = (totales["completados_limite_anterior"] * 100.0) / totales["total_anterior"]
 
         tendencia = self._calcular_tendencia(porcentaje_actual, porcentaje_anterior)
 
@@ -86,85 +61,28 @@ class MetricasService:
 
     def get_hitos_por_proceso(self, email: str) -> Dict[str, Any]:
         """Obtiene total de hitos abiertos/pendientes por tipo de proceso"""
-        sql = MIS_CLIENTES_CTE + """
-        SELECT
-            p.id AS proceso_id,
-            LTRIM(RTRIM(p.nombre)) AS proceso_nombre,
-            COUNT(CASE WHEN cph.estado != 'Finalizado' THEN 1 END) AS hitos_pendientes,
-            COUNT(CASE WHEN cph.estado = 'Finalizado' THEN 1 END) AS hitos_completados
-        FROM mis_clientes mc
-        JOIN clientes c ON c.idcliente = mc.id_cliente
-        JOIN cliente_proceso cp ON cp.cliente_id = c.idcliente
-        JOIN proceso p ON p.id = cp.id_proceso
-        JOIN cliente_proceso_hito cph ON cph.cliente_proceso_id = cp.id
-        GROUP BY p.id, p.nombre
-        ORDER BY p.nombre
-        """
-
-        result = self.db.execute(text(sql), {"email": email}).fetchall()
+        agregados = self.motor.agregados(email)
+        totales = agregados.totales
 
-        total_pendientes = sum(row.hitos_pendientes for row in result)
-
-        proceso_data = []
-        for row in result:
-            proceso_data.append({
-                "nombreProceso": str(row.proceso_nombre or "").strip(),
-                "hitosPendientes": int(row.hitos_pendientes) if row.hitos_pendientes else 0,
-                "hitosCompletados": int(row.hitos_completados) if row.hitos_completados else 0
-            })
-
-        # Calcular tendencia para hitos pendientes
-        sql_actual_pendientes = MIS_CLIENTES_CTE + """
-        SELECT COUNT(CASE WHEN cph.estado != 'Finalizado' THEN 1 END) AS pendientes_actual
-        FROM mis_clientes mc
-        JOIN clientes c ON c.idcliente = mc.id_cliente
-        JOIN cliente_proceso cp ON cp.idcliente = c.idcliente
-        JOIN cliente_proceso_hito cph ON cph.cliente_proceso_id = cp.id
-        WHERE cph.fecha_limite >= DATEADD(day, -30, GETDATE())
-        """
-
-        sql_anterior_pendientes = MIS_CLIENTES_CTE + """
-        SELECT COUNT(CASE WHEN cph.estado != 'Finalizado' THEN 1 END) AS pendientes_anterior
-        FROM mis_clientes mc
-        JOIN clientes c ON c.idcliente = mc.id_cliente
-        JOIN cliente_proceso cp ON cp.idcliente = c.idcliente
-        JOIN cliente_proceso_hito cph ON cph.cliente_proceso_id = cp.id
-        WHERE cph.fecha_limite >= DATEADD(day, -60, GETDATE())
-          AND cph.fecha_limite < DATEADD(day, -30, GETDATE())
-        """
-
-        result_actual_pend = self.db.execute(text(sql_actual_pendientes), {"email": email}).fetchone()
-        result_anterior_pend = self.db.execute(text(sql_anterior_pendientes), {"email": email}).fetchone()
-
-        pendientes_actual = result_actual_pend.pendientes_actual if result_actual_pend else 0
-        pendientes_anterior = result_anterior_pend.pendientes_anterior if result_anterior_pend else 0
-
-        tendencia = self._calcular_tendencia(float(pendientes_actual), float(pendientes_anterior))
+        tendencia = self._calcular_tendencia(float(totales["pendientes_actual"]), float(totales["pendientes_anterior"]))
 
         return {
-            "totalPendientes": total_pendientes,
+            "totalPendientes": totales["pendientes"],
             "tendencia": tendencia,
-            "procesoData": proceso_data
+            "procesoData": list(agregados.por_proceso.values())
         }
 
     def get_tiempo_resolucion(self, email: str) -> Dict[str, Any]:
         """Obtiene tiempo medio de resolución de hitos"""
-        sql = MIS_CLIENTES_CTE + """
-        SELECT
-            FORMAT(cph.fecha_limite, 'yyyy-MM') AS periodo,
-            AVG(CASE
-                WHEN cph.estado = 'Finalizado' THEN
-                    DATEDIFF(day, cph.fecha_limite, CAST(cph.fecha_estado AS DATE))
-                ELSE NULL
-            END) AS tiempo_medio
+        # Serie mensual leída del agregado diario (kpi_hito_diario), no de cliente_proceso_hito
+        sql = self._mis_clientes_cte(email) + self._select_periodo_kpi("periodo") + """,
+            CAST(SUM(k.dias_resolucion) AS FLOAT) / NULLIF(SUM(k.resueltos), 0) AS tiempo_medio
         FROM mis_clientes mc
-        JOIN clientes c ON c.idcliente = mc.id_cliente
-        JOIN cliente_proceso cp ON cp.idcliente = c.idcliente
-        JOIN cliente_proceso_hito cph ON cph.cliente_proceso_id = cp.id
-        WHERE cph.estado = 'Finalizado'
-          AND cph.fecha_limite >= DATEADD(month, -6, GETDATE())
-        GROUP BY FORMAT(cph.fecha_limite, 'yyyy-MM')
-        ORDER BY FORMAT(cph.fecha_limite, 'yyyy-MM')
+        JOIN kpi_hito_diario k ON k.cliente_id = mc.id_cliente
+        WHERE k.estado = 'Finalizado'
+          AND k.dia >= CAST(DATEADD(month, -6, GETDATE()) AS DATE)
+        GROUP BY YEAR(k.dia), MONTH(k.dia)
+        ORDER BY YEAR(k.dia), MONTH(k.dia)
         """
 
         result = self.db.execute(text(sql), {"email": email}).fetchall()
@@ -195,41 +113,10 @@ class MetricasService:
                         "tiempoMedio": round(float(row.tiempo_medio), 2)
                     })
 
-        # Calcular tendencia para tiempo de resolución
-        sql_actual_tiempo = MIS_CLIENTES_CTE + """
-        SELECT AVG(CASE
-            WHEN cph.estado = 'Finalizado' THEN
-                DATEDIFF(day, cph.fecha_limite, CAST(cph.fecha_estado AS DATE))
-            ELSE NULL
-        END) AS tiempo_actual
-        FROM mis_clientes mc
-        JOIN clientes c ON c.idcliente = mc.id_cliente
-        JOIN cliente_proceso cp ON cp.idcliente = c.idcliente
-        JOIN cliente_proceso_hito cph ON cph.cliente_proceso_id = cp.id
-        WHERE cph.estado = 'Finalizado'
-          AND CAST(cph.fecha_estado AS DATE) >= DATEADD(day, -30, GETDATE())
-        """
-
-        sql_anterior_tiempo = MIS_CLIENTES_CTE + """
-        SELECT AVG(CASE
-            WHEN cph.estado = 'Finalizado' THEN
-                DATEDIFF(day, cph.fecha_limite, CAST(cph.fecha_estado AS DATE))
-            ELSE NULL
-        END) AS tiempo_anterior
-        FROM mis_clientes mc
-        JOIN clientes c ON c.idcliente = mc.id_cliente
-        JOIN cliente_proceso cp ON cp.idcliente = c.idcliente
-        JOIN cliente_proceso_hito cph ON cph.cliente_proceso_id = cp.id
-        WHERE cph.estado = 'Finalizado'
-          AND CAST(cph.fecha_estado AS DATE) >= DATEADD(day, -60, GETDATE())
-          AND CAST(cph.fecha_estado AS DATE) < DATEADD(day, -30, GETDATE())
-        """
-
-        result_actual_tiempo = self.db.execute(text(sql_actual_tiempo), {"email": email}).fetchone()
-        result_anterior_tiempo = self.db.execute(text(sql_anterior_tiempo), {"email": email}).fetchone()
-
-        tiempo_actual = float(result_actual_tiempo.tiempo_actual or 0) if result_actual_tiempo else 0.0
-        tiempo_anterior = float(result_anterior_tiempo.tiempo_anterior or 0) if result_anterior_tiempo else 0.0
+        # Tendencia: media de días de resolución en las dos ventanas de 30 días
+        agregados = self.motor.agregados(email)
+        tiempo_actual = agregados.media(agregados.totales["dias_resolucion_actual"], agregados.totales["resueltos_actual"])
+        tiempo_anterior = agregados.media(agregados.totales["dias_resolucion_anterior"], agregados.totales["resueltos_anterior"])
 
         tendencia_tiempo = self._calcular_tendencia(tiempo_actual, tiempo_anterior)
 
@@ -241,135 +128,40 @@ class MetricasService:
 
     def get_hitos_vencidos(self, email: str) -> Dict[str, Any]:
         """Obtiene alertas de hitos vencidos sin cerrar"""
-        sql = MIS_CLIENTES_CTE + """
-        SELECT
-            cph.id AS hito_id,
-            LTRIM(RTRIM(c.razsoc)) AS cliente_nombre,
-            LTRIM(RTRIM(p.nombre)) AS proceso_nombre,
-            FORMAT(cph.fecha_limite, 'yyyy-MM-dd') AS fecha_vencimiento,
-            DATEDIFF(day, cph.fecha_limite, GETDATE()) AS dias_vencido
-        FROM mis_clientes mc
-        JOIN clientes c ON c.idcliente = mc.id_cliente
-        JOIN cliente_proceso cp ON cp.idcliente = c.idcliente
-        JOIN proceso p ON p.id = cp.id_proceso
-        JOIN cliente_proceso_hito cph ON cph.cliente_proceso_id = cp.id
-        WHERE cph.estado != 'Finalizado'
-          AND cph.fecha_limite < GETDATE()
-        ORDER BY dias_vencido DESC
-        """
-
-        result = self.db.execute(text(sql), {"email": email}).fetchall()
+        totales = self.motor.agregados(email).totales
 
-        # Calcular tendencia para hitos vencidos
-        sql_actual_vencidos = MIS_CLIENTES_CTE + """
-        SELECT COUNT(*) AS vencidos_actual
-        FROM mis_clientes mc
-        JOIN clientes c ON c.idcliente = mc.id_cliente
-        JOIN cliente_proceso cp ON cp.idcliente = c.idcliente
-        JOIN cliente_proceso_hito cph ON cph.cliente_proceso_id = cp.id
-        WHERE cph.estado != 'Finalizado'
-          AND cph.fecha_limite < GETDATE()
-          AND cph.fecha_limite >= DATEADD(day, -30, GETDATE())
-        """
-
-        sql_anterior_vencidos = MIS_CLIENTES_CTE + """
-        SELECT COUNT(*) AS vencidos_anterior
-        FROM mis_clientes mc
-        JOIN clientes c ON c.idcliente = mc.id_cliente
-        JOIN cliente_proceso cp ON cp.idcliente = c.idcliente
-        JOIN cliente_proceso_hito cph ON cph.cliente_proceso_id = cp.id
-        WHERE cph.estado != 'Finalizado'
-          AND cph.fecha_limite < DATEADD(day, -30, GETDATE())
-          AND cph.fecha_limite >= DATEADD(day, -60, GETDATE())
-        """
-
-        result_actual_venc = self.db.execute(text(sql_actual_vencidos), {"email": email}).fetchone()
-        result_anterior_venc = self.db.execute(text(sql_anterior_vencidos), {"email": email}).fetchone()
-
-        vencidos_actual = result_actual_venc.vencidos_actual if result_actual_venc else 0
-        vencidos_anterior = result_anterior_venc.vencidos_anterior if result_anterior_venc else 0
-
-        tendencia_vencidos = self._calcular_tendencia(float(vencidos_actual), float(vencidos_anterior))
+        tendencia_vencidos = self._calcular_tendencia(float(totales["vencidos_actual"]), float(totales["vencidos_anterior"]))
 
         return {
-            "totalVencidos": len(result),
+            "totalVencidos": totales["vencidos"],
             "tendencia": tendencia_vencidos
         }
 
     def get_clientes_inactivos(self, email: str) -> Dict[str, Any]:
         """Obtiene clientes sin hitos activos"""
-        sql = MIS_CLIENTES_CTE + """
-        SELECT
-            mc.id_cliente AS cliente_id,
-            LTRIM(RTRIM(c.razsoc)) AS cliente_nombre,
-            FORMAT(MAX(cph.fecha_limite), 'yyyy-MM-dd') AS ultima_actividad,
-            DATEDIFF(day, MAX(cph.fecha_limite), GETDATE()) AS dias_inactivo
-        FROM mis_clientes mc
-        JOIN clientes c ON c.idcliente = mc.id_cliente
-        LEFT JOIN cliente_proceso cp ON cp.cliente_id = c.idcliente
-        LEFT JOIN cliente_proceso_hito cph ON cph.cliente_proceso_id = cp.id
-        GROUP BY mc.id_cliente, c.razsoc
-        HAVING MAX(cph.fecha_limite) IS NULL
-           OR MAX(cph.fecha_limite) < DATEADD(day, -30, GETDATE())
-        ORDER BY dias_inactivo DESC
-        """
+        agregados = self.motor.agregados(email)
 
-        result = self.db.execute(text(sql), {"email": email}).fetchall()
-
-        # Calcular tendencia para clientes inactivos
-        sql_actual_inactivos = MIS_CLIENTES_CTE + """
-        SELECT COUNT(DISTINCT mc.id_cliente) AS inactivos_actual
-        FROM mis_clientes mc
-        JOIN clientes c ON c.idcliente = mc.id_cliente
-        LEFT JOIN cliente_proceso cp ON cp.cliente_id = c.idcliente
-        LEFT JOIN cliente_proceso_hito cph ON cph.cliente_proceso_id = cp.id
-        WHERE (SELECT MAX(cph2.fecha_limite)
-               FROM cliente_proceso cp2
-               JOIN cliente_proceso_hito cph2 ON cph2.cliente_proceso_id = cp2.id
-               WHERE cp2.cliente_id = mc.id_cliente) < DATEADD(day, -30, GETDATE())
-           OR NOT EXISTS (SELECT 1 FROM cliente_proceso cp3 WHERE cp3.cliente_id = mc.id_cliente)
-        """
-
-        sql_anterior_inactivos = MIS_CLIENTES_CTE + """
-        SELECT COUNT(DISTINCT mc.id_cliente) AS inactivos_anterior
-        FROM mis_clientes mc
-        JOIN clientes c ON c.idcliente = mc.id_cliente
-        LEFT JOIN cliente_proceso cp ON cp.cliente_id = c.idcliente
-        LEFT JOIN cliente_proceso_hito cph ON cph.cliente_proceso_id = cp.id
-        WHERE (SELECT MAX(cph2.fecha_limite)
-               FROM cliente_proceso cp2
-               JOIN cliente_proceso_hito cph2 ON cph2.cliente_proceso_id = cp2.id
-               WHERE cp2.cliente_id = mc.id_cliente) < DATEADD(day, -60, GETDATE())
-           OR NOT EXISTS (SELECT 1 FROM cliente_proceso cp3 WHERE cp3.cliente_id = mc.id_cliente)
-        """
-
-        result_actual_inact = self.db.execute(text(sql_actual_inactivos), {"email": email}).fetchone()
-        result_anterior_inact = self.db.execute(text(sql_anterior_inactivos), {"email": email}).fetchone()
-
-        inactivos_actual = result_actual_inact.inactivos_actual if result_actual_inact else 0
-        inactivos_anterior = result_anterior_inact.inactivos_anterior if result_anterior_inact else 0
+        inactivos_actual = agregados.clientes_inactivos(agregados.limite_30)
+        inactivos_anterior = agregados.clientes_inactivos(agregados.limite_60)
 
         tendencia_inactivos = self._calcular_tendencia(float(inactivos_actual), float(inactivos_anterior))
 
         return {
-            "totalInactivos": len(result),
+            "totalInactivos": inactivos_actual,
             "tendencia": tendencia_inactivos
         }
 
     def get_volumen_mensual(self, email: str) -> Dict[str, Any]:
         """Obtiene volumen mensual de hitos"""
-        sql = MIS_CLIENTES_CTE + """
-        SELECT
-            FORMAT(cph.fecha_limite, 'yyyy-MM') AS mes,
-            COUNT(cph.id) AS hitos_creados,
-            COUNT(CASE WHEN cph.estado = 'Finalizado' THEN 1 END) AS hitos_completados
+        # Serie mensual leída del agregado diario (kpi_hito_diario), no de cliente_proceso_hito
+        sql = self._mis_clientes_cte(email) + self._select_periodo_kpi("mes") + """,
+            SUM(k.hitos) AS hitos_creados,
+            SUM(CASE WHEN k.estado = 'Finalizado' THEN k.hitos ELSE 0 END) AS hitos_completados
         FROM mis_clientes mc
-        JOIN clientes c ON c.idcliente = mc.id_cliente
-        JOIN cliente_proceso cp ON cp.idcliente = c.idcliente
-        JOIN cliente_proceso_hito cph ON cph.cliente_proceso_id = cp.id
-        WHERE cph.fecha_limite >= DATEADD(month, -6, GETDATE())
-        GROUP BY FORMAT(cph.fecha_limite, 'yyyy-MM')
-        ORDER BY FORMAT(cph.fecha_limite, 'yyyy-MM')
+        JOIN kpi_hito_diario k ON k.cliente_id = mc.id_cliente
+        WHERE k.dia >= CAST(DATEADD(month, -6, GETDATE()) AS DATE)
+        GROUP BY YEAR(k.dia), MONTH(k.dia)
+        ORDER BY YEAR(k.dia), MONTH(k.dia)
         """
 
         result = self.db.execute(text(sql), {"email": email}).fetchall()
@@ -400,33 +192,9 @@ class MetricasService:
                         "hitosCompletados": int(row.hitos_completados) if row.hitos_completados else 0
                     })
 
-        # Calcular tendencia para volumen mensual
-        sql_actual_volumen = MIS_CLIENTES_CTE + """
-        SELECT COUNT(cph.id) AS volumen_actual
-        FROM mis_clientes mc
-        JOIN clientes c ON c.idcliente = mc.id_cliente
-        JOIN cliente_proceso cp ON cp.idcliente = c.idcliente
-        JOIN cliente_proceso_hito cph ON cph.cliente_proceso_id = cp.id
-        WHERE cph.fecha_limite >= DATEADD(day, -30, GETDATE())
-        """
-
-        sql_anterior_volumen = MIS_CLIENTES_CTE + """
-        SELECT COUNT(cph.id) AS volumen_anterior
-        FROM mis_clientes mc
-        JOIN clientes c ON c.idcliente = mc.id_cliente
-        JOIN cliente_proceso cp ON cp.idcliente = c.idcliente
-        JOIN cliente_proceso_hito cph ON cph.cliente_proceso_id = cp.id
-        WHERE cph.fecha_limite >= DATEADD(day, -60, GETDATE())
-          AND cph.fecha_limite < DATEADD(day, -30, GETDATE())
-        """
-
-        result_actual_vol = self.db.execute(text(sql_actual_volumen), {"email": email}).fetchone()
-        result_anterior_vol = self.db.execute(text(sql_anterior_volumen), {"email": email}).fetchone()
-
-        volumen_actual = result_actual_vol.volumen_actual if result_actual_vol else 0
-        volumen_anterior = result_anterior_vol.volumen_anterior if result_anterior_vol else 0
-
-        tendencia_volumen = self._calcular_tendencia(float(volumen_actual), float(volumen_anterior))
+        # Tendencia: hitos con fecha límite en las dos ventanas de 30 días
+        totales = self.motor.agregados(email).totales
+        tendencia_volumen = self._calcular_tendencia(float(totales["total_actual"]), float(totales["total_anterior"]))
 
         return {
             "totalMesActual": total_mes_actual,
@@ -436,56 +204,19 @@ class MetricasService:
 
     def get_resumen_metricas(self, email: str) -> Dict[str, Any]:
         """Obtiene resumen de todas las métricas"""
-        # Obtener cantidad total de hitos completados
-        sql_hitos_completados = MIS_CLIENTES_CTE + """
-        SELECT COUNT(CASE WHEN cph.estado = 'Finalizado' THEN 1 END) AS hitos_completados
-        FROM mis_clientes mc
-        JOIN clientes c ON c.idcliente = mc.id_cliente
-        JOIN cliente_proceso cp ON cp.idcliente = c.idcliente
-        JOIN cliente_proceso_hito cph ON cph.cliente_proceso_id = cp.id
-        """
+        totales = self.motor.agregados(email).totales
 
-        result_completados = self.db.execute(text(sql_hitos_completados), {"email": email}).fetchone()
-        total_completados = result_completados.hitos_completados if result_completados else 0
+        # Tendencia para hitos completados (cantidad, no porcentaje) según fecha_estado
+        tendencia_completados = self._calcular_tendencia(float(totales["completados_actual"]), float(totales["completados_anterior"]))
 
-        # Calcular tendencia para hitos completados (cantidad, no porcentaje)
-        sql_actual_completados = MIS_CLIENTES_CTE + """
-        SELECT COUNT(CASE WHEN cph.estado = 'Finalizado' THEN 1 END) AS completados_actual
-        FROM mis_clientes mc
-        JOIN clientes c ON c.idcliente = mc.id_cliente
-        JOIN cliente_proceso cp ON cp.idcliente = c.idcliente
-        JOIN cliente_proceso_hito cph ON cph.cliente_proceso_id = cp.id
-        WHERE cph.estado = 'Finalizado'
-          AND CAST(cph.fecha_estado AS DATE) >= DATEADD(day, -30, GETDATE())
-        """
-
-        sql_anterior_completados = MIS_CLIENTES_CTE + """
-        SELECT COUNT(CASE WHEN cph.estado = 'Finalizado' THEN 1 END) AS completados_anterior
-        FROM mis_clientes mc
-        JOIN clientes c ON c.idcliente = mc.id_cliente
-        JOIN cliente_proceso cp ON cp.idcliente = c.idcliente
-        JOIN cliente_proceso_hito cph ON cph.cliente_proceso_id = cp.id
-        WHERE cph.estado = 'Finalizado'
-          AND CAST(cph.fecha_estado AS DATE) >= DATEADD(day, -60, GETDATE())
-          AND CAST(cph.fecha_estado AS DATE) < DATEADD(day, -30, GETDATE())
-        """
-
-        result_actual_comp = self.db.execute(text(sql_actual_completados), {"email": email}).fetchone()
-        result_anterior_comp = self.db.execute(text(sql_anterior_completados), {"email": email}).fetchone()
-
-        completados_actual = result_actual_comp.completados_actual if result_actual_comp else 0
-        completados_anterior = result_anterior_comp.completados_anterior if result_anterior_comp else 0
-
-        tendencia_completados = self._calcular_tendencia(float(completados_actual), float(completados_anterior))
-
-        # Obtener otras métricas
+        # Obtener otras métricas (comparten la misma consulta agregada)
         hitos_proceso = self.get_hitos_por_proceso(email)
         vencidos = self.get_hitos_vencidos(email)
         inactivos = self.get_clientes_inactivos(email)
 
         return {
             "hitosCompletados": {
-                "valor": total_completados,  # Número de hitos completados, no porcentaje
+                "valor": totales["completados"],  # Número de hitos completados, no porcentaje
                 "tendencia": tendencia_completados
             },
             "hitosPendientes": {
@@ -501,3 +232,13 @@ class MetricasService:
                 "tendencia": inactivos['tendencia']
             }
         }
+
+    def get_dashboard(self, email: str) -> Dict[str, Any]:
+        """Obtiene todas las métricas del dashboard reutilizando una única pasada agregada"""
+        return {
+            "resumen": self.get_resumen_metricas(email),
+            "cumplimientoHitos": self.get_cumplimiento_hitos(email),
+            "hitosPorProceso": self.get_hitos_por_proceso(email),
+            "tiempoResolucion": self.get_tiempo_resolucion(email),
+            "volumenMensual": self.get_volumen_mensual(email)
+        }
@@ -0,0 +1,45 @@
+from typing import Any, Dict
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.application.services.metricas_service import MetricasService
+
+
+class MetricasServiceAsync:
+    """
+    MetricasService sobre una AsyncSession. Cada método ejecuta el cálculo síncrono con
+    run_sync; el servicio interno es uno por petición, así que los KPIs siguen
+    compartiendo la consulta agregada del motor de métricas.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+        self.servicio = MetricasService(session.sync_session)
+
+    async def _calcular(self, metodo: str, email: str) -> Dict[str, Any]:
+        calculo = getattr(self.servicio, metodo)
+        return await self.session.run_sync(lambda _sesion: calculo(email))
+
+    async def get_cumplimiento_hitos(self, email: str) -> Dict[str, Any]:
+        return await self._calcular("get_cumplimiento_hitos", email)
+
+    async def get_hitos_por_proceso(self, email: str) -> Dict[str, Any]:
+        return await self._calcular("get_hitos_por_proceso", email)
+
+    async def get_tiempo_resolucion(self, email: str) -> Dict[str, Any]:
+        return await self._calcular("get_tiempo_resolucion", email)
+
+    async def get_hitos_vencidos(self, email: str) -> Dict[str, Any]:
+        return await self._calcular("get_hitos_vencidos", email)
+
+    async def get_clientes_inactivos(self, email: str) -> Dict[str, Any]:
+        return await self._calcular("get_clientes_inactivos", email)
+
+    async def get_volumen_mensual(self, email: str) -> Dict[str, Any]:
+        return await self._calcular("get_volumen_mensual", email)
+
+    async def get_resumen_metricas(self, email: str) -> Dict[str, Any]:
+        return await self._calcular("get_resumen_metricas", email)
+
+    async def get_dashboard(self, email: str) -> Dict[str, Any]:
+        return await self._calcular("get_dashboard", email)
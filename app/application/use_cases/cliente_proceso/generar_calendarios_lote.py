@@ -0,0 +1,87 @@
+from app.domain.repositories.cliente_proceso_repository import ClienteProcesoRepository
+from app.domain.repositories.proceso_repository import ProcesoRepository
+from app.domain.repositories.proceso_hito_maestro_repository import ProcesoHitoMaestroRepository
+from app.domain.repositories.cliente_proceso_hito_repository import ClienteProcesoHitoRepository
+from app.domain.repositories.cliente_repository import ClienteRepository
+from app.application.services.generadores_temporalidad.factory import obtener_generador
+from app.application.services.generadores_temporalidad.plan_calendario import PlanCalendario
+from app.application.services.calendario_laboral import CalendarioLaboral
+from datetime import datetime
+from typing import Optional
+
+def obtener_plan(
+    proceso_id: int,
+    planes: dict,
+    proceso_repo: ProcesoRepository,
+    repo_hito_maestro: ProcesoHitoMaestroRepository,
+    calendario: Optional[CalendarioLaboral] = None
+) -> PlanCalendario:
+    """
+    Devuelve el PlanCalendario del proceso usando la caché `planes` del trabajo.
+    Si el proceso no es generable se memoriza el error para no volver a consultarlo.
+    """
+    if proceso_id not in planes:
+        try:
+            proceso = proceso_repo.obtener_por_id(proceso_id)
+            if not proceso:
+                raise ValueError(f"Proceso {proceso_id} no encontrado")
+            obtener_generador(proceso.temporalidad)  # valida la temporalidad antes de generar nada
+            planes[proceso_id] = PlanCalendario.cargar(proceso, repo_hito_maestro, calendario)
+        except ValueError as e:
+            planes[proceso_id] = e
+    plan = planes[proceso_id]
+    if isinstance(plan, ValueError):
+        raise plan
+    return plan
+
+def generar_calendarios_lote(
+    solicitudes: list,
+    planes: dict,
+    repo: ClienteProcesoRepository,
+    proceso_repo: ProcesoRepository,
+    repo_hito_maestro: ProcesoHitoMaestroRepository,
+    repo_hito_cliente: ClienteProcesoHitoRepository,
+    repo_cliente: Optional[ClienteRepository] = None,
+    calendario: Optional[CalendarioLaboral] = None,
+    regiones: Optional[dict] = None
+) -> dict:
+    """
+    Genera el calendario de un bloque de solicitudes (cliente_id, proceso_id, fecha_inicio)
+    en una única transacción: los ClienteProceso se insertan por solicitud sin commit y
+    todos los hitos del bloque se escriben con un solo guardar_lote al final.
+
+    Las solicitudes cuyo proceso no es generable se devuelven en `errores` sin abortar el bloque.
+    `regiones` (cliente_id -> provincia) se rellena y reutiliza entre bloques como `planes`.
+    """
+    regiones = {} if regiones is None else regiones
+    nuevos_hitos = []
+    errores = []
+    cliente_procesos = 0
+    fecha_estado = datetime.utcnow()
+
+    for solicitud in solicitudes:
+        try:
+            plan = obtener_plan(solicitud.proceso_id, planes, proceso_repo, repo_hito_maestro, calendario)
+        except ValueError as e:
+            errores.append({"cliente_id": solicitud.cliente_id, "proceso_id": solicitud.proceso_id, "error": str(e)})
+            continue
+
+        if repo_cliente and solicitud.cliente_id not in regiones:
+            cliente = repo_cliente.obtener_por_id(solicitud.cliente_id)
+            regiones[solicitud.cliente_id] = cliente.provincia if cliente else None
+        region = regiones.get(solicitud.cliente_id)
+
+        generador = obtener_generador(plan.proceso.temporalidad)
+        resultado = generador.generar(solicitud, plan, repo)
+        cliente_procesos += resultado.get("cantidad", 0)
+        for cliente_proceso in resultado.get("procesos", []):
+            nuevos_hitos.extend(plan.hitos_para(cliente_proceso, fecha_estado, region))
+
+    repo_hito_cliente.guardar_lote(nuevos_hitos)
+
+    return {
+        "procesados": len(solicitudes),
+        "cliente_procesos": cliente_procesos,
+        "hitos": len(nuevos_hitos),
+        "errores": errores
+    }
@@ -4,6 +4,9 @@ from typing import Optional
 
 class Settings(BaseSettings):
     DATABASE_URL: str
+    ASYNC_DATABASE_URL: Optional[str] = None
+    REPLICA_DATABASE_URL: Optional[str] = None
+    ASYNC_REPLICA_DATABASE_URL: Optional[str] = None
     ADMIN_API_KEY: str
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
@@ -13,6 +16,34 @@ class Settings(BaseSettings):
     CLIENT_SECRET: Optional[str] = None
     TENANT_ID: Optional[str] = None
     REDIRECT_URI: Optional[str] = None
+    CLIENTES_SCOPE_TTL_SECONDS: int = 300
+    CLIENTES_SCOPE_MAX_ENTRIES: int = 1024
+    KPI_REFRESH_SECONDS: int = 300
+    CALENDARIO_LOTE_TAMANO: int = 200
+    CALENDARIO_LOTE_INTERRUMPIDO_SECONDS: int = 900
+    WS_BUS_MAX_EVENTOS: int = 10000
+    WS_BUS_TAM_LOTE: int = 200
+    WS_BUS_ESPERA_MS: int = 20
+    WS_CLIENT_QUEUE_SIZE: int = 256
+    WS_SEND_TIMEOUT_SECONDS: float = 5.0
+    WS_BROKER: str = "memory"
+    WS_BROKER_POLL_MS: int = 250
+    WS_BROKER_RETENTION_SECONDS: int = 300
+    WS_BROKER_LATE_COMMIT_SECONDS: float = 5.0
+    WS_ROUTING_TTL_SECONDS: int = 900
+    CONTEO_CACHE_TTL_SECONDS: int = 120
+    CONTEO_CACHE_MAX_ENTRIES: int = 2048
+    CATALOGO_CACHE_MAX_ENTRIES: int = 4096
+    CATALOGO_CACHE_CHECK_SECONDS: float = 5.0
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT_SECONDS: int = 30
+    DB_POOL_RECYCLE_SECONDS: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    REPLICA_READ_YOUR_WRITES_SECONDS: float = 15.0
+    REPLICA_MAX_LAG_SECONDS: float = 5.0
+    REPLICA_LAG_CHECK_SECONDS: float = 10.0
+    REPLICA_LAG_SQL: Optional[str] = None
 
     class Config:
         env_file = ".env"
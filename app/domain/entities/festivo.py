@@ -0,0 +1,7 @@
+class Festivo:
+    """Día no laborable. region None = festivo nacional; si no, aplica solo a esa provincia."""
+    def __init__(self, id=None, fecha=None, region=None, descripcion=None):
+        self.id = id
+        self.fecha = fecha
+        self.region = region
+        self.descripcion = descripcion
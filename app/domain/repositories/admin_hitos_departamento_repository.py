@@ -25,3 +25,8 @@ class AdminHitosDepartamentoRepository(ABC):
         Devuelve el registro actualizado o None si no existe.
         """
         pass
+
+    @abstractmethod
+    def obtener_region_hito(self, cliente_proceso_hito_id: int) -> Optional[str]:
+        """Provincia del cliente al que pertenece el cliente_proceso_hito (para sus festivos)."""
+        pass
@@ -1,6 +1,7 @@
 from abc import ABC, abstractmethod
 from typing import List, Optional
 from app.domain.entities.auditoria_calendarios import AuditoriaCalendarios
+from app.domain.repositories.consulta_listado import ConsultaListado, ResultadoCursor, ResultadoListado
 
 
 class AuditoriaCalendariosRepository(ABC):
@@ -19,3 +20,13 @@ class AuditoriaCalendariosRepository(ABC):
     @abstractmethod
     async def get_by_cliente(self, id_cliente: str) -> List[AuditoriaCalendarios]:
         pass
+
+    @abstractmethod
+    def listar_paginado(self, consulta: ConsultaListado) -> ResultadoListado:
+        """Página filtrada y ordenada en base de datos, junto con el total"""
+        pass
+
+    @abstractmethod
+    def listar_por_cursor(self, consulta: ConsultaListado) -> ResultadoCursor:
+        """Página por clave (keyset) tras consulta.despues_de, filtrada y ordenada en base de datos"""
+        pass
@@ -1,6 +1,7 @@
 from abc import ABC, abstractmethod
 from app.domain.entities.cliente_proceso_hito_cumplimiento import ClienteProcesoHitoCumplimiento
 from typing import Optional
+from app.domain.repositories.consulta_listado import ConsultaListado, ResultadoCursor, ResultadoListado
 
 class ClienteProcesoHitoCumplimientoRepository(ABC):
 
@@ -12,6 +13,16 @@ class ClienteProcesoHitoCumplimientoRepository(ABC):
     def listar(self):
         pass
 
+    @abstractmethod
+    def listar_paginado(self, consulta: ConsultaListado) -> ResultadoListado:
+        """Página filtrada y ordenada en base de datos, junto con el total"""
+        pass
+
+    @abstractmethod
+    def listar_por_cursor(self, consulta: ConsultaListado) -> ResultadoCursor:
+        """Página por clave (keyset) tras consulta.despues_de, filtrada y ordenada en base de datos"""
+        pass
+
     @abstractmethod
     def obtener_por_id(self, id: int):
         pass
@@ -1,5 +1,7 @@
 from abc import ABC, abstractmethod
+from typing import List
 from app.domain.entities.cliente_proceso_hito import ClienteProcesoHito
+from app.domain.repositories.consulta_listado import ConsultaListado, ResultadoCursor
 
 class ClienteProcesoHitoRepository(ABC):
 
@@ -7,10 +9,20 @@ class ClienteProcesoHitoRepository(ABC):
     def guardar(self, cliente_proceso_hito: ClienteProcesoHito):
         pass
 
+    @abstractmethod
+    def guardar_lote(self, cliente_proceso_hitos: List[ClienteProcesoHito], confirmar: bool = True) -> int:
+        """Inserta varios ClienteProcesoHito con un único executemany. Devuelve cuántos se insertaron."""
+        pass
+
     @abstractmethod
     def listar(self):
         pass
 
+    @abstractmethod
+    def listar_por_cursor(self, consulta: ConsultaListado) -> ResultadoCursor:
+        """Página por clave (keyset) tras consulta.despues_de, filtrada y ordenada en base de datos"""
+        pass
+
     @abstractmethod
     def obtener_por_id(self, id: int):
         pass
@@ -1,5 +1,7 @@
 from abc import ABC, abstractmethod
+from typing import List
 from app.domain.entities.cliente_proceso import ClienteProceso
+from app.domain.repositories.consulta_listado import ConsultaListado, ResultadoCursor
 
 class ClienteProcesoRepository(ABC):
 
@@ -7,10 +9,21 @@ class ClienteProcesoRepository(ABC):
     def guardar(self, cliente_proceso: ClienteProceso):
         pass
 
+    @abstractmethod
+    def guardar_lote(self, clientes_procesos: List[ClienteProceso], confirmar: bool = True) -> List[ClienteProceso]:
+        """Inserta varios ClienteProceso en un solo round trip y devuelve las entidades con su id.
+        Con confirmar=False no hace commit (lo hará quien cierre la transacción)."""
+        pass
+
     @abstractmethod
     def listar(self):
         pass
 
+    @abstractmethod
+    def listar_por_cursor(self, consulta: ConsultaListado) -> ResultadoCursor:
+        """Página por clave (keyset) tras consulta.despues_de, filtrada y ordenada en base de datos"""
+        pass
+
     @abstractmethod
     def listar_por_cliente(self, cliente_id: str):
         pass
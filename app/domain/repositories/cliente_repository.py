@@ -1,6 +1,7 @@
 from abc import ABC, abstractmethod
 from typing import List, Optional
 from app.domain.entities.cliente import Cliente
+from app.domain.repositories.consulta_listado import ConsultaListado, ResultadoListado
 
 class ClienteRepository(ABC):
 
@@ -8,6 +9,11 @@ class ClienteRepository(ABC):
     def listar(self) -> List[Cliente]:
         pass
 
+    @abstractmethod
+    def listar_paginado(self, consulta: ConsultaListado) -> ResultadoListado:
+        """Página filtrada y ordenada en base de datos, junto con el total"""
+        pass
+
     @abstractmethod
     def buscar_por_nombre(self, nombre: str) -> List[Cliente]:
         pass
@@ -0,0 +1,51 @@
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class ConsultaListado:
+    """
+    Filtro, orden y página de un listado, para resolverlos en la base de datos.
+
+    - filtros: igualdades campo -> valor; cada repositorio decide qué campos admite.
+    - sort_field / sort_direction: campo de ordenación ('asc' o 'desc').
+    - page / limit: página (desde 1) y tamaño; sin ambos se devuelve todo.
+    - por_cursor / despues_de: paginación por clave (keyset). Se devuelven `limit`
+      elementos posteriores a despues_de = (valor del campo de orden, id) del último
+      elemento ya entregado, o desde el principio si es None.
+    """
+
+    def __init__(
+        self,
+        page: Optional[int] = None,
+        limit: Optional[int] = None,
+        sort_field: Optional[str] = None,
+        sort_direction: Optional[str] = "asc",
+        filtros: Optional[Dict[str, Any]] = None,
+        por_cursor: bool = False,
+        despues_de: Optional[Tuple[Any, Any]] = None
+    ):
+        self.page = page
+        self.limit = limit
+        self.sort_field = sort_field
+        self.sort_direction = sort_direction or "asc"
+        self.filtros = filtros or {}
+        self.por_cursor = por_cursor
+        self.despues_de = despues_de
+
+    @property
+    def paginada(self) -> bool:
+        return self.page is not None and self.limit is not None
+
+    @property
+    def offset(self) -> int:
+        return (self.page - 1) * self.limit if self.paginada else 0
+
+    @property
+    def descendente(self) -> bool:
+        return self.sort_direction == "desc"
+
+
+# (elementos de la página, total de elementos que cumplen los filtros)
+ResultadoListado = Tuple[List[Any], int]
+
+# (elementos de la página, (valor del campo de orden, id) del último si hay más, o None)
+ResultadoCursor = Tuple[List[Any], Optional[Tuple[Any, Any]]]
@@ -1,6 +1,7 @@
 from abc import ABC, abstractmethod
 from typing import List
 from app.domain.entities.documental_categoria import DocumentalCategoria
+from app.domain.repositories.consulta_listado import ConsultaListado, ResultadoListado
 
 class DocumentalCategoriaRepository(ABC):
 
@@ -27,3 +28,8 @@ class DocumentalCategoriaRepository(ABC):
     @abstractmethod
     def listar(self) -> List[DocumentalCategoria]:
         pass
+
+    @abstractmethod
+    def listar_paginado(self, consulta: ConsultaListado) -> ResultadoListado:
+        """Página filtrada y ordenada en base de datos, junto con el total"""
+        pass
@@ -1,6 +1,7 @@
 from abc import ABC, abstractmethod
 from typing import List
 from app.domain.entities.documental_documentos import DocumentalDocumentos
+from app.domain.repositories.consulta_listado import ConsultaListado, ResultadoListado
 
 class DocumentalDocumentosRepository(ABC):
 
@@ -24,6 +25,11 @@ class DocumentalDocumentosRepository(ABC):
     def listar(self) -> List[DocumentalDocumentos]:
         pass
 
+    @abstractmethod
+    def listar_paginado(self, consulta: ConsultaListado) -> ResultadoListado:
+        """Página filtrada y ordenada en base de datos, junto con el total"""
+        pass
+
     @abstractmethod
     def obtener_por_cliente_categoria(self, cliente_id: str, categoria_id: int) -> List[DocumentalDocumentos]:
         pass
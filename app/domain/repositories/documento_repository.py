@@ -1,6 +1,7 @@
 from abc import ABC, abstractmethod
 from typing import List
 from app.domain.entities.documento import Documento
+from app.domain.repositories.consulta_listado import ConsultaListado, ResultadoCursor
 
 class DocumentoRepositoryPort(ABC):
     @abstractmethod
@@ -21,3 +22,8 @@ class DocumentoRepositoryPort(ABC):
 
     @abstractmethod
     def get_all(self) -> List[Documento]: pass
+
+    @abstractmethod
+    def listar_por_cursor(self, consulta: ConsultaListado) -> ResultadoCursor:
+        """Página por clave (keyset) tras consulta.despues_de, filtrada y ordenada en base de datos"""
+        pass
@@ -0,0 +1,23 @@
+from abc import ABC, abstractmethod
+from typing import Iterable, List, Optional
+from app.domain.entities.festivo import Festivo
+
+class FestivoRepository(ABC):
+
+    @abstractmethod
+    def guardar(self, festivo: Festivo) -> Festivo:
+        """Lanza ValueError si ya existe un festivo con la misma fecha y región"""
+        pass
+
+    @abstractmethod
+    def listar(self, anio: Optional[int] = None, region: Optional[str] = None) -> List[Festivo]:
+        pass
+
+    @abstractmethod
+    def listar_por_anios(self, anios: Iterable[int]) -> List[Festivo]:
+        """Festivos nacionales y regionales de los años indicados"""
+        pass
+
+    @abstractmethod
+    def eliminar(self, id: int) -> Optional[Festivo]:
+        pass
@@ -1,6 +1,7 @@
 from abc import ABC, abstractmethod
 from app.domain.entities.hito import Hito
 from typing import Optional
+from app.domain.repositories.consulta_listado import ConsultaListado, ResultadoListado
 
 class HitoRepository(ABC):
 
@@ -12,6 +13,11 @@ class HitoRepository(ABC):
     def listar(self):
         pass
 
+    @abstractmethod
+    def listar_paginado(self, consulta: ConsultaListado) -> ResultadoListado:
+        """Página filtrada y ordenada en base de datos, junto con el total"""
+        pass
+
     @abstractmethod
     def listar_habilitados(self):
         pass
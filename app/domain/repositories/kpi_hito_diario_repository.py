@@ -0,0 +1,13 @@
+from abc import ABC, abstractmethod
+
+
+class KpiHitoDiarioRepository(ABC):
+
+    @abstractmethod
+    def refrescar(self) -> int:
+        """
+        Recalcula las claves (cliente, proceso, día) encoladas en kpi_hito_pendiente y
+        las retira de la cola. Con el agregado vacío lo reconstruye todo.
+        Devuelve el número de claves recalculadas, o -1 si otro proceso está refrescando.
+        """
+        pass
@@ -1,5 +1,6 @@
 from abc import ABC, abstractmethod
 from app.domain.entities.hito import Hito
+from app.domain.repositories.consulta_listado import ConsultaListado, ResultadoListado
 
 class PlantillaRepository(ABC):
 
@@ -11,6 +12,11 @@ class PlantillaRepository(ABC):
     def listar(self):
         pass
 
+    @abstractmethod
+    def listar_paginado(self, consulta: ConsultaListado) -> ResultadoListado:
+        """Página filtrada y ordenada en base de datos, junto con el total"""
+        pass
+
     @abstractmethod
     def obtener_por_id(self, id: int):
         pass
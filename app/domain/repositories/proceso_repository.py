@@ -2,6 +2,7 @@
 from abc import ABC, abstractmethod
 from app.domain.entities.proceso import Proceso
 from typing import List, Any, Dict, Optional
+from app.domain.repositories.consulta_listado import ConsultaListado, ResultadoListado
 
 class ProcesoRepository(ABC):
 
@@ -13,6 +14,11 @@ class ProcesoRepository(ABC):
     def listar(self):
         pass
 
+    @abstractmethod
+    def listar_paginado(self, consulta: ConsultaListado) -> ResultadoListado:
+        """Página filtrada y ordenada en base de datos, junto con el total"""
+        pass
+
     @abstractmethod
     def listar_habilitados(self):
         pass
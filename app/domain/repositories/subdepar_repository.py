@@ -1,6 +1,7 @@
 from abc import ABC, abstractmethod
 from app.domain.entities.subdepar import Subdepar
 from typing import List, Any, Dict, Optional
+from app.domain.repositories.consulta_listado import ConsultaListado, ResultadoListado
 
 class SubdeparRepository(ABC):
 
@@ -8,6 +9,11 @@ class SubdeparRepository(ABC):
     def listar(self):
         pass
 
+    @abstractmethod
+    def listar_paginado(self, consulta: ConsultaListado) -> ResultadoListado:
+        """Página filtrada y ordenada en base de datos, junto con el total"""
+        pass
+
     @abstractmethod
     def obtener_por_id(self, id: int):
         pass
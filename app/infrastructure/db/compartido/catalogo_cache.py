@@ -0,0 +1,223 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional, Tuple
+
+from sqlalchemy import Engine, bindparam, event, inspect, text
+from sqlalchemy.orm import Session
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Catálogos con caché de lectura en memoria
+CATALOGOS = ("proceso", "hito", "proceso_hito_maestro")
+
+# Tablas con fila en catalogo_version: los catálogos cacheados, los que solo usan ETag y
+# festivo (su caché es el calendario laboral, ver al_invalidar). subdepar no se escribe
+# desde la aplicación; su fila queda para quien la mantenga.
+TABLAS_VERSIONADAS = CATALOGOS + ("plantilla", "metadato", "documental_categoria", "subdepar", "festivo")
+
+# Catálogos con escrituras pendientes de confirmar en la sesión
+_CLAVE_MODIFICADOS = "catalogos_modificados"
+
+_SQL_VERSIONES = "SELECT catalogo, version FROM [ATISA_Input].dbo.catalogo_version"
+
+_SQL_INCREMENTAR = text(
+    "UPDATE [ATISA_Input].dbo.catalogo_version SET version = version + 1 WHERE catalogo IN :catalogos"
+).bindparams(bindparam("catalogos", expanding=True))
+
+
+def columnas(modelo) -> Dict[str, Any]:
+    """Valores de columna de un modelo; es lo que se guarda, nunca la instancia de la sesión"""
+    return {attr.key: getattr(modelo, attr.key) for attr in inspect(modelo).mapper.column_attrs}
+
+
+class CacheCatalogo:
+    """
+    Caché LRU de lectura para un catálogo pequeño y que casi no cambia.
+
+    - obtener() devuelve el valor guardado o lo carga con cargar() y lo guarda.
+    - Con más de max_entradas se descarta la usada hace más tiempo.
+    - invalidar() la vacía; lo hacen el commit de las escrituras del propio worker y
+      VersionesCatalogo cuando otro worker ha incrementado la versión del catálogo.
+    """
+
+    def __init__(self, nombre: str, max_entradas: int):
+        self.nombre = nombre
+        self.max_entradas = max_entradas
+        self._entradas: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._generacion = 0
+        self.aciertos = 0
+        self.fallos = 0
+
+    def obtener(self, session: Session, clave: Hashable, cargar: Callable[[], Any]) -> Any:
+        if not versiones.vigente(session, self.nombre):
+            # Sin versión fiable, o con escrituras sin confirmar en esta sesión: a la base de datos
+            return cargar()
+        with self._lock:
+            if clave in self._entradas:
+                self._entradas.move_to_end(clave)
+                self.aciertos += 1
+                return self._entradas[clave]
+            self.fallos += 1
+            generacion = self._generacion
+        valor = cargar()
+        with self._lock:
+            if generacion != self._generacion:
+                # Invalidada mientras se cargaba: el valor puede ser anterior a la escritura
+                return valor
+            self._entradas[clave] = valor
+            while len(self._entradas) > self.max_entradas:
+                self._entradas.popitem(last=False)
+        return valor
+
+    def invalidar(self) -> int:
+        with self._lock:
+            eliminadas = len(self._entradas)
+            self._entradas.clear()
+            self._generacion += 1
+            return eliminadas
+
+    def stats(self) -> Dict[str, Any]:
+        return {"entradas": len(self._entradas), "aciertos": self.aciertos, "fallos": self.fallos}
+
+
+class VersionesCatalogo:
+    """
+    Versión conocida de cada tabla de catalogo_version, leída como mucho cada
+    intervalo_segundos (o en la siguiente consulta tras un commit propio que las
+    modifique, o en cada petición con ETag). Si la de la base de datos ha cambiado,
+    otro worker ha escrito y se vacía la caché de ese catálogo.
+    """
+
+    def __init__(self, intervalo_segundos: float):
+        self.intervalo_segundos = intervalo_segundos
+        self._versiones: Optional[Dict[str, int]] = None
+        self._comprobado = float("-inf")
+        self._lock = threading.Lock()
+        self._lock_lectura = threading.Lock()
+
+    def vigente(self, session: Session, catalogo: str) -> bool:
+        if catalogo in session.info.get(_CLAVE_MODIFICADOS, ()):
+            return False
+        self._comprobar_si_vencido(session.get_bind())
+        return self._versiones is not None
+
+    def actuales(
+        self, bind: Engine, tablas: Iterable[str], releer: bool = False
+    ) -> Optional[Tuple[Optional[int], ...]]:
+        """
+        Versiones de las tablas, o None si no se pueden leer. Con releer=True se leen
+        ahora de la base de datos (y se vacían las cachés de los catálogos que hayan
+        cambiado) en lugar de esperar a la siguiente comprobación periódica.
+        """
+        if releer:
+            # Cada llamada lee por su cuenta: no espera a la lectura de otro hilo
+            versiones = self._aplicar(self._leer(bind))
+        else:
+            self._comprobar_si_vencido(bind)
+            versiones = self._versiones
+        if versiones is None:
+            return None
+        return tuple(versiones.get(tabla) for tabla in tablas)
+
+    def comprobar(self, bind: Engine) -> None:
+        """Relee las versiones si ha pasado el intervalo; para cachés que no usan vigente()"""
+        self._comprobar_si_vencido(bind)
+
+    def caducar(self) -> None:
+        self._comprobado = float("-inf")
+
+    def _comprobar_si_vencido(self, bind: Engine) -> None:
+        if time.monotonic() - self._comprobado >= self.intervalo_segundos:
+            self._comprobar(bind)
+
+    def _comprobar(self, bind: Engine) -> None:
+        # Un solo hilo comprueba; el resto sigue con las versiones conocidas
+        if not self._lock_lectura.acquire(blocking=False):
+            return
+        try:
+            self._aplicar(self._leer(bind))
+        finally:
+            self._lock_lectura.release()
+
+    @staticmethod
+    def _leer(bind: Engine) -> Optional[Dict[str, int]]:
+        try:
+            # Conexión aparte: un fallo aquí no afecta a la transacción de la petición
+            with bind.connect() as conexion:
+                return dict(conexion.execute(text(_SQL_VERSIONES)).all())
+        except Exception as e:
+            logger.warning(f"No se pudo leer catalogo_version, caché de catálogos desactivada: {e}")
+            return None
+
+    def _aplicar(self, leidas: Optional[Dict[str, int]]) -> Optional[Dict[str, int]]:
+        with self._lock:
+            cacheados = CATALOGOS + tuple(_invalidadores)
+            if leidas is None:
+                invalidar_catalogos(cacheados)
+            else:
+                anteriores = self._versiones or {}
+                cambiados = [c for c in cacheados if anteriores.get(c) != leidas.get(c)]
+                invalidar_catalogos(cambiados)
+            self._versiones = leidas
+            self._comprobado = time.monotonic()
+        return leidas
+
+
+versiones = VersionesCatalogo(intervalo_segundos=settings.CATALOGO_CACHE_CHECK_SECONDS)
+
+caches: Dict[str, CacheCatalogo] = {
+    nombre: CacheCatalogo(nombre, max_entradas=settings.CATALOGO_CACHE_MAX_ENTRIES) for nombre in CATALOGOS
+}
+
+# Otras cachés en memoria que dependen de una tabla de catalogo_version
+_invalidadores: Dict[str, Callable[[], Any]] = {}
+
+
+def al_invalidar(catalogo: str, invalidar: Callable[[], Any]) -> None:
+    """
+    Registra una caché propia de un catálogo (p. ej. el calendario laboral para festivo):
+    invalidar() se llama tras el commit de una escritura marcada en este worker y cuando
+    otro worker ha incrementado la versión. Quien la use debe llamar a versiones.comprobar.
+    """
+    _invalidadores[catalogo] = invalidar
+
+
+def invalidar_catalogos(catalogos: Iterable[str]) -> None:
+    for catalogo in catalogos:
+        if catalogo in caches:
+            caches[catalogo].invalidar()
+        if catalogo in _invalidadores:
+            _invalidadores[catalogo]()
+
+
+def marcar_modificados(session: Session, *catalogos: str) -> None:
+    """
+    Llamar antes del commit de una escritura en estos catálogos. Incrementa su versión
+    en la misma transacción (el resto de workers la verá al confirmarse) y, hasta el
+    commit, la sesión lee esos catálogos de la base de datos sin pasar por la caché.
+    """
+    session.execute(_SQL_INCREMENTAR, {"catalogos": list(catalogos)})
+    session.info.setdefault(_CLAVE_MODIFICADOS, set()).update(catalogos)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidar_tras_commit(session: Session) -> None:
+    modificados = session.info.pop(_CLAVE_MODIFICADOS, ())
+    if modificados:
+        invalidar_catalogos(modificados)
+        # Los ETag de este worker deben cambiar ya, no en la siguiente comprobación
+        versiones.caducar()
+
+
+@event.listens_for(Session, "after_rollback")
+def _descartar_tras_rollback(session: Session) -> None:
+    session.info.pop(_CLAVE_MODIFICADOS, None)
+
+
+def stats() -> Dict[str, Any]:
+    return {nombre: cache.stats() for nombre, cache in caches.items()}
@@ -0,0 +1,124 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import FrozenSet, Optional
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.infrastructure.db.compartido.mis_clientes_cte import MIS_CLIENTES_CTE
+
+
+# Misma forma que MIS_CLIENTES_CTE (mis_clientes.id_cliente) pero leyendo de la
+# tabla temporal que carga preparar_mis_clientes, sin recalcular la UNION.
+MIS_CLIENTES_TEMP_CTE = """
+WITH mis_clientes AS (
+  SELECT id_cliente FROM #mis_clientes
+)
+"""
+
+_SQL_RESOLVER_CLIENTES = MIS_CLIENTES_CTE + """
+SELECT id_cliente FROM mis_clientes
+"""
+
+# Sin parámetros a propósito: pyodbc la ejecuta directamente (no vía sp_executesql)
+# y la tabla temporal queda visible para el resto de la conexión.
+_SQL_CREAR_TEMP = """
+IF OBJECT_ID('tempdb..#mis_clientes') IS NOT NULL DROP TABLE #mis_clientes;
+CREATE TABLE #mis_clientes (id_cliente VARCHAR(20) COLLATE DATABASE_DEFAULT NOT NULL);
+CREATE CLUSTERED INDEX ix_mis_clientes ON #mis_clientes (id_cliente);
+"""
+
+_SQL_INSERTAR_TEMP = "INSERT INTO #mis_clientes (id_cliente) VALUES (:id_cliente)"
+
+
+class ClientesScopeCache:
+    """
+    Caché en memoria email -> conjunto de id_cliente visibles para el empleado.
+
+    - Expira cada entrada a los ttl_segundos.
+    - Con más de max_entradas se descarta la usada hace más tiempo (LRU).
+    """
+
+    def __init__(self, ttl_segundos: int, max_entradas: int):
+        self.ttl_segundos = ttl_segundos
+        self.max_entradas = max_entradas
+        self._entradas: "OrderedDict[str, tuple[float, FrozenSet[str]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _clave(email: str) -> str:
+        return (email or "").strip().lower()
+
+    def obtener(self, email: str) -> Optional[FrozenSet[str]]:
+        clave = self._clave(email)
+        with self._lock:
+            entrada = self._entradas.get(clave)
+            if entrada is None:
+                return None
+            caduca, ids = entrada
+            if caduca < time.monotonic():
+                del self._entradas[clave]
+                return None
+            self._entradas.move_to_end(clave)
+            return ids
+
+    def guardar(self, email: str, ids: FrozenSet[str]) -> None:
+        clave = self._clave(email)
+        with self._lock:
+            self._entradas[clave] = (time.monotonic() + self.ttl_segundos, ids)
+            self._entradas.move_to_end(clave)
+            while len(self._entradas) > self.max_entradas:
+                self._entradas.popitem(last=False)
+
+    def invalidar(self, email: Optional[str] = None) -> int:
+        """Invalida un email concreto o, sin email, toda la caché. Devuelve las entradas eliminadas."""
+        with self._lock:
+            if email is None:
+                eliminadas = len(self._entradas)
+                self._entradas.clear()
+                return eliminadas
+            return 1 if self._entradas.pop(self._clave(email), None) is not None else 0
+
+
+clientes_scope_cache = ClientesScopeCache(
+    ttl_segundos=settings.CLIENTES_SCOPE_TTL_SECONDS,
+    max_entradas=settings.CLIENTES_SCOPE_MAX_ENTRIES,
+)
+
+
+def obtener_clientes_empleado(session: Session, email: str) -> FrozenSet[str]:
+    """Resuelve (con caché) el conjunto de id_cliente que gestiona el empleado."""
+    ids = clientes_scope_cache.obtener(email)
+    if ids is None:
+        rows = session.execute(text(_SQL_RESOLVER_CLIENTES), {"email": email}).fetchall()
+        ids = frozenset(
+            r.id_cliente.rstrip() if isinstance(r.id_cliente, str) else str(r.id_cliente)
+            for r in rows
+            if r.id_cliente is not None
+        )
+        clientes_scope_cache.guardar(email, ids)
+    return ids
+
+
+def preparar_mis_clientes(session: Session, email: str) -> str:
+    """
+    Carga #mis_clientes en la conexión de la sesión y devuelve el CTE que la lee.
+
+    La tabla temporal vive en la conexión de la transacción actual, así que solo se
+    recarga si cambia la transacción, el email o el contenido en caché.
+    """
+    ids = obtener_clientes_empleado(session, email)
+    conexion = session.connection()
+    cargado = session.info.get("mis_clientes")
+    if cargado is None or cargado[0] is not conexion or cargado[1] != ids:
+        session.execute(text(_SQL_CREAR_TEMP))
+        if ids:
+            session.execute(text(_SQL_INSERTAR_TEMP), [{"id_cliente": i} for i in ids])
+        session.info["mis_clientes"] = (conexion, ids)
+    return MIS_CLIENTES_TEMP_CTE
+
+
+def invalidar_clientes_empleado(email: Optional[str] = None) -> int:
+    return clientes_scope_cache.invalidar(email)
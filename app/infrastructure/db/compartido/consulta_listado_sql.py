@@ -0,0 +1,188 @@
+from datetime import date, datetime, time
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from sqlalchemy import Row, and_, func, inspect, or_, select
+from sqlalchemy.orm import Session
+
+from app.domain.repositories.consulta_listado import ConsultaListado, ResultadoCursor, ResultadoListado
+
+
+def columnas_modelo(modelo) -> Dict[str, Any]:
+    """Columnas mapeadas del modelo por nombre de atributo: los campos ordenables por defecto"""
+    return {attr.key: getattr(modelo, attr.key) for attr in inspect(modelo).column_attrs}
+
+
+def listar_filas(session: Session, modelo, *condiciones) -> List[Row]:
+    """
+    Listado de solo lectura sin instanciar el modelo ORM: una Row por fila con las
+    columnas del modelo, accesibles por atributo igual que en el modelo. Es lo que
+    esperan los response_model de los endpoints de colección (from_attributes).
+    """
+    return session.execute(select(*columnas_modelo(modelo).values()).where(*condiciones)).all()
+
+
+def _convertir(columna, valor: Any) -> Any:
+    """Convierte el valor de un query param al tipo Python de la columna"""
+    if not isinstance(valor, str):
+        return valor
+    try:
+        tipo = columna.type.python_type
+    except NotImplementedError:
+        return valor
+    if tipo is bool:
+        if valor.lower() in ("1", "true", "si", "sí"):
+            return True
+        if valor.lower() in ("0", "false", "no"):
+            return False
+        raise ValueError(valor)
+    if tipo is datetime:
+        return datetime.fromisoformat(valor)
+    if tipo is date:
+        return date.fromisoformat(valor)
+    if tipo is time:
+        return time.fromisoformat(valor)
+    if tipo in (int, float):
+        return tipo(valor)
+    return valor
+
+
+def _condiciones_filtro(columnas: Dict[str, Any], consulta: ConsultaListado, campos_filtro: Iterable[str]) -> list:
+    condiciones = []
+    for campo in campos_filtro:
+        if campo in consulta.filtros and consulta.filtros[campo] is not None:
+            columna = columnas[campo]
+            try:
+                valor = _convertir(columna, consulta.filtros[campo])
+            except ValueError:
+                raise ValueError(f"Valor no válido para el filtro '{campo}': {consulta.filtros[campo]}")
+            condiciones.append(columna == valor)
+    return condiciones
+
+
+def listar_paginado(
+    session: Session,
+    modelo,
+    consulta: ConsultaListado,
+    campos_filtro: Iterable[str] = (),
+    campos_orden: Optional[Dict[str, Any]] = None,
+    mapear: Optional[Callable[[Any], Any]] = None,
+    solo_columnas: bool = False
+) -> ResultadoListado:
+    """
+    Aplica la ConsultaListado en SQL: WHERE con los filtros admitidos, ORDER BY por el
+    campo pedido (y la clave primaria, para que las páginas sean estables) y
+    OFFSET/FETCH, con el total calculado en la misma consulta mediante COUNT(*) OVER().
+
+    - campos_filtro: campos del modelo que se pueden filtrar; el resto se ignora.
+    - campos_orden: expresiones ordenables por nombre (por defecto, todas las columnas);
+      un sort_field desconocido se ignora, igual que hacía la ordenación en memoria.
+    - solo_columnas: devuelve Row con las columnas (como listar_filas) en lugar de
+      instancias del modelo.
+
+    Lanza ValueError si un filtro admitido trae un valor que no encaja con su columna.
+    """
+    columnas = columnas_modelo(modelo)
+    orden = campos_orden if campos_orden is not None else columnas
+    clave = list(inspect(modelo).primary_key)
+    condiciones = _condiciones_filtro(columnas, consulta, campos_filtro)
+
+    entidad = columnas.values() if solo_columnas else [modelo]
+    stmt = select(*entidad, func.count().over().label("total_listado")).where(*condiciones)
+
+    criterios = []
+    if consulta.sort_field in orden:
+        expresion = orden[consulta.sort_field]
+        criterios.append(expresion.desc() if consulta.descendente else expresion.asc())
+    criterios.extend(clave)
+    stmt = stmt.order_by(*criterios)
+
+    if consulta.paginada:
+        stmt = stmt.offset(consulta.offset).limit(consulta.limit)
+
+    filas = session.execute(stmt).all()
+    if filas:
+        total = filas[0].total_listado
+    elif consulta.offset:
+        # Página fuera de rango: el total no viene en ninguna fila
+        total = session.execute(select(func.count()).select_from(modelo).where(*condiciones)).scalar() or 0
+    else:
+        total = 0
+
+    elementos = filas if solo_columnas else [fila[0] for fila in filas]
+    if mapear is not None:
+        elementos = [mapear(e) for e in elementos]
+    return elementos, total
+
+
+def _posteriores(expresion, id_columna, valor, ultimo_id, descendente: bool):
+    """
+    Condición keyset "después de (valor, ultimo_id)" para ORDER BY expresion, id.
+    Los NULL van primero en orden ascendente y al final en descendente (SQL Server).
+    """
+    if expresion is None:
+        return id_columna > ultimo_id
+    if valor is None:
+        nulos = and_(expresion.is_(None), id_columna > ultimo_id)
+        return nulos if descendente else or_(nulos, expresion.is_not(None))
+    posterior = expresion < valor if descendente else expresion > valor
+    condicion = or_(posterior, and_(expresion == valor, id_columna > ultimo_id))
+    return or_(condicion, expresion.is_(None)) if descendente else condicion
+
+
+def listar_por_cursor(
+    session: Session,
+    modelo,
+    consulta: ConsultaListado,
+    campos_filtro: Iterable[str] = (),
+    campos_orden: Optional[Dict[str, Any]] = None,
+    mapear: Optional[Callable[[Any], Any]] = None,
+    solo_columnas: bool = False
+) -> ResultadoCursor:
+    """
+    Paginación por clave: mismos filtros y orden que listar_paginado, pero la página
+    empieza tras consulta.despues_de en lugar de en un OFFSET, así que una página
+    profunda cuesta lo mismo que la primera. No calcula el total.
+
+    Devuelve la clave (valor de orden, id) del último elemento solo si hay más páginas.
+    solo_columnas funciona como en listar_paginado.
+    """
+    columnas = columnas_modelo(modelo)
+    orden = campos_orden if campos_orden is not None else columnas
+    clave = list(inspect(modelo).primary_key)
+    if len(clave) != 1:
+        raise ValueError(f"{modelo.__name__} no admite paginación por cursor (clave primaria compuesta)")
+    id_columna = clave[0]
+    condiciones = _condiciones_filtro(columnas, consulta, campos_filtro)
+
+    expresion = orden.get(consulta.sort_field) if consulta.sort_field else None
+    if consulta.despues_de is not None:
+        valor, ultimo_id = consulta.despues_de
+        if expresion is not None and valor is not None:
+            try:
+                valor = _convertir(expresion, valor)
+            except (ValueError, AttributeError):
+                raise ValueError("Cursor no válido")
+        condiciones.append(_posteriores(expresion, id_columna, valor, ultimo_id, consulta.descendente))
+
+    entidad = columnas.values() if solo_columnas else [modelo]
+    columnas_select = [*entidad, id_columna.label("id_cursor")]
+    criterios = [id_columna]
+    if expresion is not None:
+        columnas_select.append(expresion.label("valor_cursor"))
+        criterios.insert(0, expresion.desc() if consulta.descendente else expresion.asc())
+
+    limite = consulta.limit or 50
+    filas = session.execute(
+        select(*columnas_select).where(*condiciones).order_by(*criterios).limit(limite + 1)
+    ).all()
+
+    siguiente = None
+    if len(filas) > limite:
+        filas = filas[:limite]
+        ultima = filas[-1]
+        siguiente = (ultima.valor_cursor if expresion is not None else None, ultima.id_cursor)
+
+    elementos = filas if solo_columnas else [fila[0] for fila in filas]
+    if mapear is not None:
+        elementos = [mapear(e) for e in elementos]
+    return elementos, siguiente
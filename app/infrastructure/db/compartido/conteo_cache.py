@@ -0,0 +1,95 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Hashable, Optional
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.config import settings
+
+# Marca de sesión: hay escrituras en cliente_proceso_hito pendientes de confirmar
+_CLAVE_MODIFICADOS = "conteos_hitos_modificados"
+
+
+class ConteoCache:
+    """
+    Caché en memoria clave de consulta -> número de filas.
+
+    - Expira cada entrada a los ttl_segundos (cubre escrituras de otros workers).
+    - Con más de max_entradas se descarta la usada hace más tiempo (LRU).
+    - invalidar() la vacía entera; se llama tras el commit de cada escritura en las
+      tablas contadas (ver marcar_conteos_hitos).
+    - guardar() con la generacion() leída antes de contar descarta el valor si se ha
+      invalidado entretanto: el conteo puede ser anterior a la escritura.
+    """
+
+    def __init__(self, ttl_segundos: int, max_entradas: int):
+        self.ttl_segundos = ttl_segundos
+        self.max_entradas = max_entradas
+        self._entradas: "OrderedDict[Hashable, tuple[float, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._generacion = 0
+
+    def generacion(self) -> int:
+        return self._generacion
+
+    def obtener(self, clave: Hashable) -> Optional[int]:
+        with self._lock:
+            entrada = self._entradas.get(clave)
+            if entrada is None:
+                return None
+            caduca, filas = entrada
+            if caduca < time.monotonic():
+                del self._entradas[clave]
+                return None
+            self._entradas.move_to_end(clave)
+            return filas
+
+    def guardar(self, clave: Hashable, filas: int, generacion: Optional[int] = None) -> None:
+        with self._lock:
+            if generacion is not None and generacion != self._generacion:
+                return
+            self._entradas[clave] = (time.monotonic() + self.ttl_segundos, filas)
+            self._entradas.move_to_end(clave)
+            while len(self._entradas) > self.max_entradas:
+                self._entradas.popitem(last=False)
+
+    def invalidar(self) -> int:
+        with self._lock:
+            eliminadas = len(self._entradas)
+            self._entradas.clear()
+            self._generacion += 1
+            return eliminadas
+
+
+# Filas restantes del listado plano de hitos por departamento, por (filtros, cursor)
+conteo_hitos_departamento = ConteoCache(
+    ttl_segundos=settings.CONTEO_CACHE_TTL_SECONDS,
+    max_entradas=settings.CONTEO_CACHE_MAX_ENTRIES,
+)
+
+
+def invalidar_conteos_hitos() -> int:
+    """Descarta los conteos cacheados que dependen de cliente_proceso_hito."""
+    return conteo_hitos_departamento.invalidar()
+
+
+def marcar_conteos_hitos(session: Session) -> None:
+    """
+    Llamar en cada escritura en cliente_proceso_hito. Los conteos se descartan tras el
+    commit real de la sesión (dentro de una petición commit() solo hace flush), para
+    que una consulta concurrente no vuelva a cachear el conteo anterior a la escritura.
+    """
+    session.info[_CLAVE_MODIFICADOS] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidar_tras_commit(session: Session) -> None:
+    if session.info.pop(_CLAVE_MODIFICADOS, False):
+        invalidar_conteos_hitos()
+
+
+@event.listens_for(Session, "after_rollback")
+def _descartar_tras_rollback(session: Session) -> None:
+    session.info.pop(_CLAVE_MODIFICADOS, None)
@@ -0,0 +1,28 @@
+from datetime import date
+from typing import List, Optional, Tuple
+
+from app.application.services.calendario_laboral import CalendarioLaboral
+from app.infrastructure.db.compartido.catalogo_cache import al_invalidar, versiones
+from app.infrastructure.db.database import SessionLocal, engine
+from app.infrastructure.db.repositories.festivo_repository_sql import FestivoRepositorySQL
+
+
+def cargar_festivos(anio: int) -> List[Tuple[date, Optional[str]]]:
+    """Lee los festivos de un año con una sesión propia (se llama una vez por año y proceso)"""
+    session = SessionLocal()
+    try:
+        return [(f.fecha, f.region) for f in FestivoRepositorySQL(session).listar_por_anios([anio])]
+    finally:
+        session.close()
+
+
+def comprobar_festivos() -> None:
+    """Relee catalogo_version si ha vencido el intervalo: ve los festivos de otros workers"""
+    versiones.comprobar(engine)
+
+
+# Calendario laboral compartido por la generación de calendarios y la edición de hitos.
+# Se vacía tras el commit de una escritura en festivo (FestivoRepositorySQL la marca) o
+# cuando otro worker ha incrementado su versión.
+calendario_laboral = CalendarioLaboral(cargar_festivos, comprobar=comprobar_festivos)
+al_invalidar("festivo", calendario_laboral.invalidar)
@@ -0,0 +1,43 @@
+from datetime import date
+from typing import Any, Dict, List, Optional
+
+
+def rango_periodo(mes: Optional[int], anio: Optional[int]) -> Optional[tuple]:
+    """
+    Intervalo semiabierto [desde, hasta) de un año o de un mes de un año.
+    Sin año no hay intervalo (un mes de cualquier año no es un rango continuo).
+    """
+    if not anio:
+        return None
+    if not mes:
+        return date(anio, 1, 1), date(anio + 1, 1, 1)
+    if mes == 12:
+        return date(anio, 12, 1), date(anio + 1, 1, 1)
+    return date(anio, mes, 1), date(anio, mes + 1, 1)
+
+
+def condiciones_periodo(columna: str, filtrar_mes: bool, filtrar_anio: bool) -> List[str]:
+    """
+    Condiciones WHERE de mes/año sobre una columna de fecha, aplicables con índice.
+
+    Con año se filtra por rango (:periodo_desde, :periodo_hasta) en lugar de
+    YEAR()/MONTH(), que obligan a recorrer toda la tabla. Solo con mes se mantiene
+    MONTH(columna): SQL Server lo resuelve con la columna calculada persistida
+    mes_limite (y su índice) cuando la columna es cliente_proceso_hito.fecha_limite.
+    """
+    if filtrar_anio:
+        return [f"{columna} >= :periodo_desde", f"{columna} < :periodo_hasta"]
+    if filtrar_mes:
+        return [f"MONTH({columna}) = :mes"]
+    return []
+
+
+def parametros_periodo(mes: Optional[int], anio: Optional[int]) -> Dict[str, Any]:
+    """Parámetros que usan las condiciones de condiciones_periodo"""
+    rango = rango_periodo(mes, anio)
+    return {
+        "mes": mes,
+        "anio": anio,
+        "periodo_desde": rango[0] if rango else None,
+        "periodo_hasta": rango[1] if rango else None,
+    }
@@ -1,3 +1,5 @@
+from app.infrastructure.db.compartido.filtros_fecha import condiciones_periodo
+
 MIS_CLIENTES_CTE = """
 WITH mis_clientes AS (
   SELECT CS.id AS id_cliente
@@ -31,16 +33,12 @@ WITH mis_clientes AS (
 )
 """
 
-def construir_sql_procesos_cliente_por_empleado(filtrar_fecha=False, filtrar_mes=False, filtrar_anio=False):
-    filtros = []
-    if filtrar_mes:
-        filtros.append("MONTH(cp.fecha_inicio) = :mes")
-    if filtrar_anio:
-        filtros.append("YEAR(cp.fecha_inicio) = :anio")
+def construir_sql_procesos_cliente_por_empleado(filtrar_fecha=False, filtrar_mes=False, filtrar_anio=False, cte=MIS_CLIENTES_CTE):
+    filtros = condiciones_periodo("cp.fecha_inicio", filtrar_mes, filtrar_anio)
 
     where_extra = " AND " + " AND ".join(filtros) if filtros else ""
 
-    sql = MIS_CLIENTES_CTE + f"""
+    sql = cte + f"""
     SELECT
       mc.id_cliente AS cliente_id,
       c.razsoc AS cliente_nombre,
@@ -55,19 +53,16 @@ def construir_sql_procesos_cliente_por_empleado(filtrar_fecha=False, filtrar_mes
     """
     return sql
 
-def construir_sql_hitos_cliente_por_empleado(filtrar_fecha=False, filtrar_mes=False, filtrar_anio=False):
+def construir_sql_hitos_cliente_por_empleado(filtrar_fecha=False, filtrar_mes=False, filtrar_anio=False, cte=MIS_CLIENTES_CTE):
     filtros = []
     if filtrar_fecha:
         filtros.append("cph.fecha_limite >= :fecha_inicio")
         filtros.append("cph.fecha_limite <= :fecha_fin")
-    if filtrar_mes:
-        filtros.append("MONTH(cph.fecha_limite) = :mes")
-    if filtrar_anio:
-        filtros.append("YEAR(cph.fecha_limite) = :anio")
+    filtros.extend(condiciones_periodo("cph.fecha_limite", filtrar_mes, filtrar_anio))
 
     where_extra = " AND " + " AND ".join(filtros) if filtros else ""
 
-    sql = MIS_CLIENTES_CTE + f"""
+    sql = cte + f"""
     SELECT
       mc.id_cliente AS cliente_id,
       c.razsoc  AS cliente_nombre,
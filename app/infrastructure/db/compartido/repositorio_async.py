@@ -0,0 +1,21 @@
+from typing import Any, Callable
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+class RepositorioAsync:
+    """
+    Base de las variantes asíncronas de los repositorios de lectura.
+
+    No duplica el SQL: envuelve el repositorio síncrono construido sobre la sesión
+    síncrona de la AsyncSession y ejecuta sus métodos con run_sync. La E/S con la base
+    de datos la hace el driver asyncio (aioodbc/aiosqlite), de modo que la petición
+    espera en el bucle de eventos sin ocupar un hilo del threadpool.
+    """
+
+    def __init__(self, session: AsyncSession, sincrono: Any):
+        self.session = session
+        self.sincrono = sincrono
+
+    async def _ejecutar(self, metodo: Callable[..., Any], *args, **kwargs) -> Any:
+        return await self.session.run_sync(lambda _sesion: metodo(*args, **kwargs))
@@ -1,20 +1,118 @@
-from sqlalchemy import create_engine
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from sqlalchemy import Engine, create_engine, exc
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import QueuePool
 from app.config import settings
-import os
 
 DATABASE_URL = settings.DATABASE_URL
 
-engine = create_engine(DATABASE_URL)
-SessionLocal = sessionmaker(bind=engine)
+
+class PoolMedido(QueuePool):
+    """
+    QueuePool que mide cuánto espera cada checkout (incluye abrir una conexión nueva
+    cuando el pool aún no está lleno) y cuántos agotan DB_POOL_TIMEOUT_SECONDS.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._lock_metricas = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.espera_total = 0.0
+        self.espera_max = 0.0
+
+    def _do_get(self):
+        inicio = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            with self._lock_metricas:
+                self.timeouts += 1
+            raise
+        finally:
+            espera = time.perf_counter() - inicio
+            with self._lock_metricas:
+                self.checkouts += 1
+                self.espera_total += espera
+                self.espera_max = max(self.espera_max, espera)
+
+    def metricas(self) -> Dict[str, Any]:
+        return {
+            "tamano": self.size(),
+            "max_overflow": self._max_overflow,
+            "en_uso": self.checkedout(),
+            "libres": self.checkedin(),
+            "overflow": max(0, self.overflow()),
+            "checkouts": self.checkouts,
+            "timeouts": self.timeouts,
+            "espera_media_ms": round(self.espera_total * 1000.0 / self.checkouts, 3) if self.checkouts else 0.0,
+            "espera_max_ms": round(self.espera_max * 1000.0, 3),
+        }
+
+
+def opciones_pool(url: str, poolclass: type = PoolMedido) -> Dict[str, Any]:
+    if url.startswith("sqlite"):
+        # SQLite usa su propio pool (sin tamaño ni overflow)
+        return {}
+    return {
+        "poolclass": poolclass,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT_SECONDS,
+        "pool_recycle": settings.DB_POOL_RECYCLE_SECONDS,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
+
+def _opciones_engine(url: str) -> Dict[str, Any]:
+    opciones = opciones_pool(url)
+    if url.startswith("mssql+pyodbc"):
+        # fast_executemany: pyodbc envía los executemany (inserciones por lotes) como un array de parámetros
+        opciones["fast_executemany"] = True
+    return opciones
+
+
+class SesionUnidadTrabajo(Session):
+    """
+    Sesión cuyo commit() se difiere mientras la controla una UnidadDeTrabajo.
+
+    Los repositorios siguen llamando a commit() tras cada escritura, que es lo que
+    necesitan los jobs y scripts con su propia SessionLocal(). Dentro de una petición
+    ese commit() solo vuelca los cambios (flush) y la unidad de trabajo confirma la
+    transacción una vez, al terminar el endpoint.
+    """
+
+    def commit(self) -> None:
+        if self.info.get("unidad_trabajo"):
+            self.flush()
+            # Los repositorios solo hacen commit tras escribir
+            self.info["escrituras"] = True
+            return
+        super().commit()
+
+    def confirmar(self) -> None:
+        """Commit real, también dentro de una unidad de trabajo"""
+        super().commit()
+
+
+engine = create_engine(DATABASE_URL, **_opciones_engine(DATABASE_URL))
+SessionLocal = sessionmaker(bind=engine, class_=SesionUnidadTrabajo)
+
+# Réplica de lectura opcional para informes y listados (ver enrutado_lectura)
+engine_replica = (
+    create_engine(settings.REPLICA_DATABASE_URL, **_opciones_engine(settings.REPLICA_DATABASE_URL))
+    if settings.REPLICA_DATABASE_URL else None
+)
 
 Base = declarative_base()
 
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
\ No newline at end of file
+def metricas_pool(motor: Optional[Engine] = None) -> Dict[str, Any]:
+    pool = (motor or engine).pool
+    if isinstance(pool, PoolMedido):
+        return pool.metricas()
+    return {"pool": type(pool).__name__, "estado": pool.status()}
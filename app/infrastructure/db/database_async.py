@@ -0,0 +1,101 @@
+from typing import Any, AsyncIterator, Dict, Optional
+
+from fastapi.requests import HTTPConnection
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from starlette.concurrency import run_in_threadpool
+
+from app.config import settings
+from app.infrastructure.db.database import PoolMedido, opciones_pool
+from app.infrastructure.db.enrutado_lectura import hay_replica, leer_de_replica, monitor_replica
+from app.infrastructure.db.unidad_trabajo import usuario_peticion
+
+# Driver síncrono -> equivalente asyncio que usa el mismo dialecto
+_DRIVERS_ASYNC = {
+    "mssql+pyodbc": "mssql+aioodbc",
+    "sqlite": "sqlite+aiosqlite",
+    "sqlite+pysqlite": "sqlite+aiosqlite",
+}
+
+
+class PoolMedidoAsync(PoolMedido, AsyncAdaptedQueuePool):
+    """PoolMedido sobre la cola compatible con asyncio"""
+
+
+def url_async(url_sincrona: str, url_configurada: Optional[str] = None) -> str:
+    if url_configurada:
+        return url_configurada
+    esquema, separador, resto = url_sincrona.partition("://")
+    if esquema not in _DRIVERS_ASYNC:
+        raise RuntimeError(
+            f"No hay driver asíncrono conocido para '{esquema}'; define ASYNC_DATABASE_URL"
+        )
+    return f"{_DRIVERS_ASYNC[esquema]}{separador}{resto}"
+
+
+def _crear_engine_async(url_sincrona: str, url_configurada: Optional[str]) -> AsyncEngine:
+    url = url_async(url_sincrona, url_configurada)
+    return create_async_engine(url, **opciones_pool(url, PoolMedidoAsync))
+
+
+_engine_async: Optional[AsyncEngine] = None
+_engine_async_replica: Optional[AsyncEngine] = None
+
+AsyncSessionLocal = async_sessionmaker(expire_on_commit=False)
+
+
+def obtener_engine_async() -> AsyncEngine:
+    """
+    Crea el engine asíncrono la primera vez que se usa: así el driver (aioodbc,
+    aiosqlite) solo hace falta en los procesos que sirven endpoints asíncronos.
+    """
+    global _engine_async
+    if _engine_async is None:
+        _engine_async = _crear_engine_async(settings.DATABASE_URL, settings.ASYNC_DATABASE_URL)
+        AsyncSessionLocal.configure(bind=_engine_async)
+    return _engine_async
+
+
+def obtener_engine_async_replica() -> AsyncEngine:
+    global _engine_async_replica
+    if _engine_async_replica is None:
+        _engine_async_replica = _crear_engine_async(
+            settings.REPLICA_DATABASE_URL, settings.ASYNC_REPLICA_DATABASE_URL
+        )
+    return _engine_async_replica
+
+
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+    """
+    Sesión asíncrona por petición para endpoints de solo lectura: no confirma nada,
+    al cerrarse revierte la transacción.
+    """
+    obtener_engine_async()
+    async with AsyncSessionLocal() as session:
+        yield session
+
+
+async def get_async_db_lectura(conexion: HTTPConnection) -> AsyncIterator[AsyncSession]:
+    """
+    Como get_async_db, pero enruta a la réplica cuando se puede (ver enrutado_lectura).
+    La medición del retraso es síncrona y se hace fuera del bucle de eventos.
+    """
+    obtener_engine_async()
+    if hay_replica() and monitor_replica.vencido():
+        await run_in_threadpool(monitor_replica.medir)
+    if leer_de_replica(usuario_peticion(conexion)):
+        session = AsyncSessionLocal(bind=obtener_engine_async_replica())
+    else:
+        session = AsyncSessionLocal()
+    async with session:
+        yield session
+
+
+def metricas_pool_async(motor: Optional[AsyncEngine] = None) -> Optional[Dict[str, Any]]:
+    motor = motor or _engine_async
+    if motor is None:
+        return None
+    pool = motor.pool
+    if isinstance(pool, PoolMedido):
+        return pool.metricas()
+    return {"pool": type(pool).__name__, "estado": pool.status()}
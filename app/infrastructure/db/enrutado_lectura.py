@@ -0,0 +1,127 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from sqlalchemy import text
+
+from app.config import settings
+from app.infrastructure.db.database import engine, engine_replica
+
+logger = logging.getLogger(__name__)
+
+# Retraso de la réplica medido desde el primario, por dialecto (REPLICA_LAG_SQL lo sustituye).
+# En SQL Server: segundos que va por detrás la réplica secundaria del grupo de disponibilidad.
+_SQL_RETRASO = {
+    "mssql": (
+        "SELECT MAX(secondary_lag_seconds) FROM sys.dm_hadr_database_replica_states "
+        "WHERE is_local = 0 AND database_id = DB_ID()"
+    ),
+}
+
+
+class RegistroEscrituras:
+    """
+    Último commit con escrituras de cada usuario, para leer sus propios cambios.
+
+    Mientras no pasen ventana_segundos desde su última escritura, las lecturas del
+    usuario van al primario. Es por proceso: una escritura atendida por otro worker
+    solo queda cubierta por el límite de retraso de MonitorReplica.
+    """
+
+    def __init__(self, ventana_segundos: float, max_entradas: int = 10000):
+        self.ventana_segundos = ventana_segundos
+        self.max_entradas = max_entradas
+        self._escrituras: "OrderedDict[str, float]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def anotar(self, usuario: str) -> None:
+        with self._lock:
+            self._escrituras[usuario] = time.monotonic()
+            self._escrituras.move_to_end(usuario)
+            while len(self._escrituras) > self.max_entradas:
+                self._escrituras.popitem(last=False)
+
+    def reciente(self, usuario: Optional[str]) -> bool:
+        if usuario is None:
+            return False
+        with self._lock:
+            escrita = self._escrituras.get(usuario)
+        return escrita is not None and time.monotonic() - escrita < self.ventana_segundos
+
+
+class MonitorReplica:
+    """
+    Retraso de la réplica, medido como mucho cada intervalo_segundos.
+
+    Si supera max_retraso_segundos, o no se puede medir, las lecturas vuelven al primario
+    hasta la siguiente medición.
+    """
+
+    def __init__(self, intervalo_segundos: float, max_retraso_segundos: float):
+        self.intervalo_segundos = intervalo_segundos
+        self.max_retraso_segundos = max_retraso_segundos
+        self.retraso: Optional[float] = None
+        self._medido = float("-inf")
+        self._lock = threading.Lock()
+
+    def vencido(self) -> bool:
+        return time.monotonic() - self._medido >= self.intervalo_segundos
+
+    def medir(self) -> None:
+        # Un solo hilo mide; el resto sigue con el último valor
+        if not self._lock.acquire(blocking=False):
+            return
+        try:
+            if self.vencido():
+                self.retraso = _medir_retraso()
+                self._medido = time.monotonic()
+        finally:
+            self._lock.release()
+
+    def utilizable(self) -> bool:
+        return self.retraso is not None and self.retraso <= self.max_retraso_segundos
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "retraso_segundos": self.retraso,
+            "max_retraso_segundos": self.max_retraso_segundos,
+            "utilizable": self.utilizable(),
+        }
+
+
+def _medir_retraso() -> Optional[float]:
+    sql = settings.REPLICA_LAG_SQL or _SQL_RETRASO.get(engine.dialect.name)
+    if sql is None:
+        # Sin forma de medirlo: se confía en la réplica
+        return 0.0
+    try:
+        with engine.connect() as conexion:
+            valor = conexion.execute(text(sql)).scalar()
+    except Exception as e:
+        logger.warning(f"No se pudo medir el retraso de la réplica: {e}")
+        return None
+    return float(valor or 0)
+
+
+registro_escrituras = RegistroEscrituras(ventana_segundos=settings.REPLICA_READ_YOUR_WRITES_SECONDS)
+
+monitor_replica = MonitorReplica(
+    intervalo_segundos=settings.REPLICA_LAG_CHECK_SECONDS,
+    max_retraso_segundos=settings.REPLICA_MAX_LAG_SECONDS,
+)
+
+
+def hay_replica() -> bool:
+    return engine_replica is not None
+
+
+def leer_de_replica(usuario: Optional[str]) -> bool:
+    """
+    Decide el destino de una sesión de solo lectura. Llamar a monitor_replica.medir()
+    antes si monitor_replica.vencido() (mide con una consulta síncrona al primario).
+    """
+    if not hay_replica() or registro_escrituras.reciente(usuario):
+        return False
+    return monitor_replica.utilizable()
@@ -0,0 +1,135 @@
+from typing import Iterable, List, Optional, Tuple
+
+
+class IndiceRequerido:
+    """
+    Índice del que depende el rendimiento de alguna consulta del repositorio.
+
+    - columnas: clave del índice, en orden.
+    - incluidas: columnas INCLUDE (SQL Server) para que la consulta no vuelva a la tabla.
+    - solo_mssql: índices sobre columnas calculadas que solo existen en SQL Server.
+    """
+
+    __slots__ = ("nombre", "tabla", "columnas", "incluidas", "solo_mssql", "uso")
+
+    def __init__(self, nombre: str, tabla: str, columnas: Iterable[str], incluidas: Iterable[str] = (),
+                 uso: str = "", solo_mssql: bool = False):
+        self.nombre = nombre
+        self.tabla = tabla
+        self.columnas: Tuple[str, ...] = tuple(columnas)
+        self.incluidas: Tuple[str, ...] = tuple(incluidas)
+        self.uso = uso
+        self.solo_mssql = solo_mssql
+
+
+# Conjunto esperado en la base de datos. Cada índice nuevo se añade aquí y en una
+# migración de migrations/versions (las migraciones no importan esta lista para que
+# su contenido no cambie al editarla).
+INDICES_REQUERIDOS: List[IndiceRequerido] = [
+    # cliente_proceso_hito
+    IndiceRequerido(
+        "ix_cph_cliente_proceso_id", "cliente_proceso_hito", ["cliente_proceso_id"],
+        ["hito_id", "estado", "habilitado", "fecha_limite"],
+        uso="cph -> cliente_proceso en listados, métricas y sincronización de habilitado",
+    ),
+    IndiceRequerido(
+        "ix_cph_hito_id", "cliente_proceso_hito", ["hito_id"],
+        ["cliente_proceso_id", "habilitado", "fecha_limite"],
+        uso="deshabilitar/eliminar por hito y join con proceso_hito_maestro",
+    ),
+    IndiceRequerido(
+        "ix_cph_fecha_limite_habilitado", "cliente_proceso_hito", ["fecha_limite", "habilitado"],
+        ["estado", "cliente_proceso_id", "hito_id"],
+        uso="filtros por periodo (mes/año como rango de fechas)",
+    ),
+    IndiceRequerido(
+        "ix_cph_mes_anio_limite", "cliente_proceso_hito", ["mes_limite", "anio_limite"],
+        ["habilitado", "estado", "cliente_proceso_id", "hito_id"],
+        uso="MONTH(fecha_limite) = :mes sin año", solo_mssql=True,
+    ),
+    # cliente_proceso
+    IndiceRequerido(
+        "ix_cliente_proceso_cliente_id", "cliente_proceso", ["cliente_id"],
+        ["proceso_id", "fecha_inicio", "habilitado"],
+        uso="procesos/hitos por cliente y alcance por empleado",
+    ),
+    IndiceRequerido(
+        "ix_cliente_proceso_proceso_id", "cliente_proceso", ["proceso_id"], ["cliente_id"],
+        uso="destinatarios websocket por proceso",
+    ),
+    IndiceRequerido(
+        "ix_cliente_proceso_fecha_inicio", "cliente_proceso", ["fecha_inicio"], ["cliente_id", "proceso_id"],
+        uso="procesos por empleado filtrados por periodo",
+    ),
+    # proceso_hito_maestro
+    IndiceRequerido(
+        "ix_phm_proceso_id_hito_id", "proceso_hito_maestro", ["proceso_id", "hito_id"],
+        uso="join cph/cp -> phm en listados por departamento y plan de calendario",
+    ),
+    IndiceRequerido(
+        "ix_phm_hito_id", "proceso_hito_maestro", ["hito_id"], ["proceso_id"],
+        uso="procesos de un hito (enrutado websocket)",
+    ),
+    # clienteSubDepar
+    IndiceRequerido(
+        "ix_clientesubdepar_cif", "clienteSubDepar", ["cif"], ["codSubDePar"],
+        uso="clientes -> subdepartamento en listados por departamento",
+    ),
+    IndiceRequerido(
+        "ix_clientesubdepar_codsubdepar", "clienteSubDepar", ["codSubDePar"], ["id"],
+        uso="clientes de un subdepartamento y alcance por empleado",
+    ),
+    # Tablas hijas de cliente_proceso_hito y auditoría
+    IndiceRequerido(
+        "ix_cphc_cliente_proceso_hito_id", "cliente_proceso_hito_cumplimiento", ["cliente_proceso_hito_id"],
+        uso="cumplimientos de un hito",
+    ),
+    IndiceRequerido(
+        "ix_documentos_cliente_proceso_hito_id", "documentos", ["cliente_proceso_hito_id"],
+        uso="documentos de un hito",
+    ),
+    IndiceRequerido(
+        "ix_auditoria_calendarios_cliente_id", "auditoria_calendarios", ["cliente_id", "fecha_modificacion"],
+        uso="auditoría de un cliente ordenada por fecha",
+    ),
+    IndiceRequerido(
+        "ix_auditoria_calendarios_hito_id", "auditoria_calendarios", ["hito_id"],
+        uso="auditoría de un hito",
+    ),
+]
+
+
+def comprobar_indices(inspector, dialecto: str,
+                      indices: Optional[Iterable[IndiceRequerido]] = None) -> List[str]:
+    """
+    Compara los índices reflejados por el inspector con los requeridos.
+    Devuelve la lista de problemas (vacía si todo está en orden).
+    """
+    problemas: List[str] = []
+    reflejados: dict = {}
+    for indice in indices if indices is not None else INDICES_REQUERIDOS:
+        if indice.solo_mssql and dialecto != "mssql":
+            continue
+        if indice.tabla not in reflejados:
+            if not inspector.has_table(indice.tabla):
+                reflejados[indice.tabla] = None
+            else:
+                reflejados[indice.tabla] = {i["name"]: i for i in inspector.get_indexes(indice.tabla)}
+        existentes = reflejados[indice.tabla]
+        if existentes is None:
+            problemas.append(f"{indice.tabla}: la tabla no existe (necesaria para {indice.nombre})")
+            continue
+        actual = existentes.get(indice.nombre)
+        if actual is None:
+            problemas.append(f"{indice.tabla}.{indice.nombre}: falta ({indice.uso})")
+            continue
+        columnas = tuple(actual.get("column_names") or ())
+        if columnas != indice.columnas:
+            problemas.append(
+                f"{indice.tabla}.{indice.nombre}: columnas {list(columnas)}, se esperaban {list(indice.columnas)}"
+            )
+        incluidas = set((actual.get("dialect_options") or {}).get("mssql_include") or ())
+        if dialecto == "mssql" and not set(indice.incluidas) <= incluidas:
+            faltan = sorted(set(indice.incluidas) - incluidas)
+            problemas.append(f"{indice.tabla}.{indice.nombre}: faltan columnas INCLUDE {faltan}")
+    return problemas
@@ -0,0 +1,35 @@
+from typing import Iterable
+
+import sqlalchemy as sa
+from alembic import op
+
+
+def es_mssql() -> bool:
+    return op.get_bind().dialect.name == "mssql"
+
+
+def existe_tabla(tabla: str) -> bool:
+    return sa.inspect(op.get_bind()).has_table(tabla)
+
+
+def existe_columna(tabla: str, columna: str) -> bool:
+    return any(c["name"] == columna for c in sa.inspect(op.get_bind()).get_columns(tabla))
+
+
+def existe_indice(tabla: str, nombre: str) -> bool:
+    return any(i["name"] == nombre for i in sa.inspect(op.get_bind()).get_indexes(tabla))
+
+
+def crear_indice(nombre: str, tabla: str, columnas: Iterable[str], incluidas: Iterable[str] = ()) -> None:
+    """
+    Crea el índice si no existe. Las bases de datos ya en uso pueden tener índices
+    creados a mano con el mismo nombre; así la migración se puede aplicar sobre ellas.
+    """
+    if not existe_tabla(tabla) or existe_indice(tabla, nombre):
+        return
+    op.create_index(nombre, tabla, list(columnas), mssql_include=list(incluidas))
+
+
+def eliminar_indice(nombre: str, tabla: str) -> None:
+    if existe_tabla(tabla) and existe_indice(tabla, nombre):
+        op.drop_index(nombre, table_name=tabla)
@@ -8,3 +8,9 @@ from .cliente_proceso_hito_model import ClienteProcesoHitoModel
 from .cliente_proceso_hito_cumplimiento_model import ClienteProcesoHitoCumplimientoModel
 from .documental_categoria_model import DocumentalCategoriaModel
 from .documental_documentos_model import DocumentalDocumentosModel
+from .kpi_hito_diario_model import KpiHitoDiarioModel
+from .kpi_hito_pendiente_model import KpiHitoPendienteModel
+from .festivo_model import FestivoModel
+from .ws_evento_model import WsEventoModel
+from .catalogo_version_model import CatalogoVersionModel
+from .trabajo_calendario_lote_model import TrabajoCalendarioLoteModel
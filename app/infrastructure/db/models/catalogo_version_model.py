@@ -0,0 +1,9 @@
+from sqlalchemy import Column, BigInteger, String
+from app.infrastructure.db.database import Base
+
+class CatalogoVersionModel(Base):
+    """Versión de cada catálogo cacheado en memoria; cada escritura la incrementa (ver catalogo_cache)"""
+    __tablename__ = "catalogo_version"
+
+    catalogo = Column(String(50), primary_key=True)
+    version = Column(BigInteger, nullable=False, default=0)
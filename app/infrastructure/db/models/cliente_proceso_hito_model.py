@@ -6,6 +6,9 @@ from app.infrastructure.db.database import Base
 
 class ClienteProcesoHitoModel(Base):
     __tablename__ = "cliente_proceso_hito"
+    # Tiene triggers (kpi_hito_pendiente): SQL Server no admite INSERT ... OUTPUT sin INTO
+    # en tablas con triggers, así que el id se obtiene con SCOPE_IDENTITY()
+    __table_args__ = {"implicit_returning": False}
 
     id = Column(Integer, primary_key=True, index=True)
     cliente_proceso_id = Column(Integer, ForeignKey("cliente_proceso.id"), nullable=False)
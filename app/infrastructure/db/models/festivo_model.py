@@ -0,0 +1,12 @@
+from sqlalchemy import Column, Integer, String, Date, UniqueConstraint
+from app.infrastructure.db.database import Base
+
+class FestivoModel(Base):
+    """Festivos nacionales (region NULL) y regionales (region = clientes.provincia)"""
+    __tablename__ = "festivo"
+    __table_args__ = (UniqueConstraint("fecha", "region", name="uq_festivo_fecha_region"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    fecha = Column(Date, nullable=False, index=True)
+    region = Column(String(50), nullable=True)
+    descripcion = Column(String(255), nullable=True)
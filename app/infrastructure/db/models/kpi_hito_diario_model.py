@@ -0,0 +1,15 @@
+from sqlalchemy import Column, Integer, String, Date, DateTime
+from app.infrastructure.db.database import Base
+
+class KpiHitoDiarioModel(Base):
+    """Agregado diario de cliente_proceso_hito por (cliente, proceso, día de fecha_limite, estado)"""
+    __tablename__ = "kpi_hito_diario"
+
+    cliente_id = Column(String(9), primary_key=True)
+    proceso_id = Column(Integer, primary_key=True)
+    dia = Column(Date, primary_key=True)
+    estado = Column(String(50), primary_key=True)
+    hitos = Column(Integer, nullable=False, default=0)
+    dias_resolucion = Column(Integer, nullable=True)
+    resueltos = Column(Integer, nullable=False, default=0)
+    ultima_fecha_estado = Column(DateTime, nullable=True)
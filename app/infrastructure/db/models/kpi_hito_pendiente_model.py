@@ -0,0 +1,15 @@
+from sqlalchemy import BigInteger, Column, Integer, String, Date
+from app.infrastructure.db.database import Base
+
+class KpiHitoPendienteModel(Base):
+    """
+    Claves (cliente, proceso, día) de kpi_hito_diario pendientes de recalcular. Las
+    escriben los triggers de cliente_proceso_hito y cliente_proceso (clave nueva y
+    anterior) y las consume el refresco del agregado.
+    """
+    __tablename__ = "kpi_hito_pendiente"
+
+    id = Column(BigInteger, primary_key=True)
+    cliente_id = Column(String(9), nullable=False)
+    proceso_id = Column(Integer, nullable=False)
+    dia = Column(Date, nullable=False)
@@ -0,0 +1,24 @@
+from sqlalchemy import Column, Integer, String, DateTime, Text
+from app.infrastructure.db.database import Base
+
+class TrabajoCalendarioLoteModel(Base):
+    """
+    Estado de las generaciones de calendarios por lotes, para que cualquier worker
+    responda al GET de progreso. Lo escribe el worker que ejecuta el trabajo al crearlo
+    y tras cada bloque (actualizado hace de latido).
+    """
+    __tablename__ = "trabajo_calendario_lote"
+
+    id = Column(String(32), primary_key=True)
+    estado = Column(String(20), nullable=False)
+    origen = Column(Text, nullable=False)  # JSON
+    total = Column(Integer, nullable=False)
+    procesados = Column(Integer, nullable=False)
+    cliente_procesos = Column(Integer, nullable=False)
+    hitos = Column(Integer, nullable=False)
+    num_errores = Column(Integer, nullable=False)
+    errores = Column(Text, nullable=False)  # JSON, como mucho _MAX_ERRORES_DETALLE
+    creado = Column(DateTime, nullable=False, index=True)
+    iniciado = Column(DateTime, nullable=True)
+    finalizado = Column(DateTime, nullable=True)
+    actualizado = Column(DateTime, nullable=False)
@@ -0,0 +1,12 @@
+from sqlalchemy import Column, Integer, String, DateTime, Text
+from app.infrastructure.db.database import Base
+
+class WsEventoModel(Base):
+    """Mensajes websocket por subdepartamento, para repartirlos entre workers (broker 'sql')"""
+    __tablename__ = "ws_evento"
+
+    id = Column(Integer, primary_key=True, index=True)
+    cod_subdepar = Column(String(6), nullable=False, index=True)
+    payload = Column(Text, nullable=False)
+    origen = Column(String(32), nullable=False)
+    creado = Column(DateTime, nullable=False, index=True)
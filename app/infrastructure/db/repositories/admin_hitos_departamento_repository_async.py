@@ -0,0 +1,37 @@
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.infrastructure.db.compartido.repositorio_async import RepositorioAsync
+from app.infrastructure.db.repositories.admin_hitos_departamento_repository_sql import (
+    AdminHitosDepartamentoRepositorySQL,
+)
+
+
+class AdminHitosDepartamentoRepositoryAsync(RepositorioAsync):
+    def __init__(self, session: AsyncSession):
+        super().__init__(session, AdminHitosDepartamentoRepositorySQL(session.sync_session))
+
+    async def listar_hitos_departamentos(
+        self,
+        mes: Optional[int] = None,
+        anio: Optional[int] = None,
+        cod_subdepar: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        return await self._ejecutar(
+            self.sincrono.listar_hitos_departamentos, mes=mes, anio=anio, cod_subdepar=cod_subdepar
+        )
+
+    async def listar_hitos_departamentos_flat(
+        self,
+        mes: Optional[int] = None,
+        anio: Optional[int] = None,
+        cod_subdepar: Optional[str] = None,
+        limit: int = 1000,
+        cursor: Optional[int] = None,
+        conteo: str = "exacto",
+    ) -> Dict[str, Any]:
+        return await self._ejecutar(
+            self.sincrono.listar_hitos_departamentos_flat,
+            mes=mes, anio=anio, cod_subdepar=cod_subdepar, limit=limit, cursor=cursor, conteo=conteo,
+        )
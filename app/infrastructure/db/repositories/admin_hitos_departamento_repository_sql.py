@@ -1,10 +1,60 @@
-from typing import List, Dict, Any, Optional
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 from sqlalchemy import text
 from sqlalchemy.orm import Session
 
 from app.domain.repositories.admin_hitos_departamento_repository import (
     AdminHitosDepartamentoRepository,
 )
+from app.infrastructure.db.compartido.catalogo_cache import marcar_modificados
+from app.infrastructure.db.compartido.conteo_cache import conteo_hitos_departamento, marcar_conteos_hitos
+from app.infrastructure.db.compartido.filtros_fecha import condiciones_periodo, parametros_periodo
+
+# Modos de cálculo de 'quedan' en el listado plano
+MODOS_CONTEO = ("exacto", "cache", "estimado", "ninguno")
+
+# Columnas de una fila plana (listado flat y exportación)
+_COLUMNAS_PLANAS = """
+                cph.id                  AS cliente_proceso_hito_id,
+                cph.cliente_proceso_id  AS cliente_proceso_id,
+                cph.estado              AS estado,
+                COALESCE(cph.fecha_limite, h.fecha_limite) AS fecha_limite,
+                COALESCE(cph.hora_limite, h.hora_limite)   AS hora_limite,
+                cph.habilitado          AS habilitado,
+                cph.tipo                AS tipo,
+                h.id                    AS hito_id,
+                h.nombre                AS hito_nombre,
+                p.id                    AS proceso_id,
+                p.nombre                AS proceso_nombre,
+                c.idcliente             AS cliente_id,
+                c.razsoc                AS cliente_nombre,
+                c.cif                   AS cliente_cif,
+                sd.codSubDePar          AS codigo_subdepar,
+                sd.nombre               AS nombre_subdepar
+"""
+
+# Mantiene nombres físicos de tablas según el esquema existente
+_FROM_HITOS_DEPARTAMENTO = """
+            FROM [ATISA_Input].dbo.cliente_proceso_hito cph
+            JOIN [ATISA_Input].dbo.cliente_proceso cp ON cp.id = cph.cliente_proceso_id
+            JOIN [ATISA_Input].dbo.proceso p ON p.id = cp.proceso_id
+            JOIN [ATISA_Input].dbo.proceso_hito_maestro phm ON phm.hito_id = cph.hito_id AND phm.proceso_id = p.id
+            JOIN [ATISA_Input].dbo.hito h ON h.id = phm.hito_id
+            JOIN [ATISA_Input].dbo.clientes c ON c.idcliente = cp.cliente_id
+            JOIN [ATISA_Input].dbo.clienteSubDepar csd ON csd.cif = c.cif
+            JOIN [ATISA_Input].dbo.SubDePar sd ON sd.codSubDePar = csd.codSubDePar
+"""
+
+
+def _filtros_hitos(
+    mes: Optional[int], anio: Optional[int], cod_subdepar: Optional[str]
+) -> Tuple[List[str], Dict[str, Any]]:
+    """Condiciones WHERE y parámetros comunes a los listados de hitos por departamento"""
+    filtros = condiciones_periodo("cph.fecha_limite", mes is not None, anio is not None)
+    params: Dict[str, Any] = parametros_periodo(mes, anio)
+    if cod_subdepar:
+        filtros.append("sd.codSubDePar = :cod_subdepar")
+        params["cod_subdepar"] = cod_subdepar
+    return filtros, params
 
 
 class AdminHitosDepartamentoRepositorySQL(AdminHitosDepartamentoRepository):
@@ -17,18 +67,7 @@ class AdminHitosDepartamentoRepositorySQL(AdminHitosDepartamentoRepository):
         anio: Optional[int] = None,
         cod_subdepar: Optional[str] = None,
     ) -> List[Dict[str, Any]]:
-        filtros = []
-        params: Dict[str, Any] = {}
-
-        if mes is not None:
-            filtros.append("MONTH(cph.fecha_limite) = :mes")
-            params["mes"] = mes
-        if anio is not None:
-            filtros.append("YEAR(cph.fecha_limite) = :anio")
-            params["anio"] = anio
-        if cod_subdepar:
-            filtros.append("sd.codSubDePar = :cod_subdepar")
-            params["cod_subdepar"] = cod_subdepar
+        filtros, params = _filtros_hitos(mes, anio, cod_subdepar)
 
         where_extra = (" AND " + " AND ".join(filtros)) if filtros else ""
 
@@ -51,14 +90,7 @@ class AdminHitosDepartamentoRepositorySQL(AdminHitosDepartamentoRepository):
                 COALESCE(cph.fecha_limite, h.fecha_limite) AS fecha_limite,
                 COALESCE(cph.hora_limite, h.hora_limite)   AS hora_limite,
                 cph.tipo            AS tipo
-            FROM [ATISA_Input].dbo.cliente_proceso_hito cph
-            JOIN [ATISA_Input].dbo.cliente_proceso cp ON cp.id = cph.cliente_proceso_id
-            JOIN [ATISA_Input].dbo.proceso p ON p.id = cp.proceso_id
-            JOIN [ATISA_Input].dbo.proceso_hito_maestro phm ON phm.hito_id = cph.hito_id AND phm.proceso_id = p.id
-            JOIN [ATISA_Input].dbo.hito h ON h.id = phm.hito_id
-            JOIN [ATISA_Input].dbo.clientes c ON c.idcliente = cp.cliente_id
-            JOIN [ATISA_Input].dbo.clienteSubDepar csd ON csd.cif = c.cif
-            JOIN [ATISA_Input].dbo.SubDePar sd ON sd.codSubDePar = csd.codSubDePar
+{_FROM_HITOS_DEPARTAMENTO}
             WHERE 1=1 AND cph.habilitado = 1 {where_extra}
             ORDER BY sd.codSubDePar, p.id, h.id
         """
@@ -122,67 +154,59 @@ class AdminHitosDepartamentoRepositorySQL(AdminHitosDepartamentoRepository):
         cod_subdepar: Optional[str] = None,
         limit: int = 1000,
         cursor: Optional[int] = None,
+        conteo: str = "exacto",
     ) -> Dict[str, Any]:
         """
         Lista los hitos en formato plano con paginación por cursor (keyset pagination).
 
         - cursor: cliente_proceso_hito.id a partir del cual continuar (exclusivo)
         - limit: número máximo de elementos a devolver
+        - conteo: cómo se calcula 'quedan', siempre sin una segunda consulta:
+            - exacto: COUNT(*) OVER() en la misma consulta de la página
+            - cache: como exacto en la primera página (o si caducó) y después restando
+              las filas ya servidas; se invalida con cada escritura en cliente_proceso_hito
+            - estimado: densidad de ids de la página extrapolada hasta el último id de la tabla
+            - ninguno: no se calcula (quedan = None); next_cursor indica si hay más
 
         Devuelve un dict con:
           - items: lista de filas planas
           - quedan: número de elementos restantes después de esta página
           - next_cursor: id del último elemento de la página (para la siguiente llamada)
+          - conteo: modo con el que se calculó 'quedan'
         """
+        if conteo not in MODOS_CONTEO:
+            raise ValueError(f"Modo de conteo no válido: {conteo}")
+
         # Sanitizar y acotar límite
         lim = max(1, min(int(limit or 1000), 5000))
         lim_plus = lim + 1  # para detectar si hay más elementos
 
-        filtros = ["cph.habilitado = 1"]
-        params: Dict[str, Any] = {}
-
-        if mes is not None:
-            filtros.append("MONTH(cph.fecha_limite) = :mes")
-            params["mes"] = mes
-        if anio is not None:
-            filtros.append("YEAR(cph.fecha_limite) = :anio")
-            params["anio"] = anio
-        if cod_subdepar:
-            filtros.append("sd.codSubDePar = :cod_subdepar")
-            params["cod_subdepar"] = cod_subdepar
+        filtros, params = _filtros_hitos(mes, anio, cod_subdepar)
+        filtros.insert(0, "cph.habilitado = 1")
         if cursor is not None:
             filtros.append("cph.id > :cursor")
             params["cursor"] = cursor
 
         where_clause = " AND ".join(["1=1"] + filtros)
 
+        # Filas que quedaban tras el cursor según la página anterior (modo cache)
+        clave_filtros = (mes, anio, cod_subdepar)
+        restantes = conteo_hitos_departamento.obtener((clave_filtros, cursor)) if conteo == "cache" else None
+        generacion = conteo_hitos_departamento.generacion()
+        contar = conteo == "exacto" or (conteo == "cache" and restantes is None)
+
+        columnas_conteo = ""
+        if contar:
+            # La ventana se evalúa antes del TOP: total de filas tras el cursor en la misma pasada
+            columnas_conteo = ",\n                COUNT(*) OVER() AS total_conteo"
+        elif conteo == "estimado":
+            columnas_conteo = ",\n                (SELECT MAX(id) FROM [ATISA_Input].dbo.cliente_proceso_hito) AS max_id_conteo"
+
         # Selección plana. Nota: mantenemos 'tipo' desde cph para ser consistentes con el listado actual.
         sql = f"""
             SELECT TOP ({lim_plus})
-                cph.id                  AS cliente_proceso_hito_id,
-                cph.cliente_proceso_id  AS cliente_proceso_id,
-                cph.estado              AS estado,
-                COALESCE(cph.fecha_limite, h.fecha_limite) AS fecha_limite,
-                COALESCE(cph.hora_limite, h.hora_limite)   AS hora_limite,
-                cph.habilitado          AS habilitado,
-                cph.tipo                AS tipo,
-                h.id                    AS hito_id,
-                h.nombre                AS hito_nombre,
-                p.id                    AS proceso_id,
-                p.nombre                AS proceso_nombre,
-                c.idcliente             AS cliente_id,
-                c.razsoc                AS cliente_nombre,
-                c.cif                   AS cliente_cif,
-                sd.codSubDePar          AS codigo_subdepar,
-                sd.nombre               AS nombre_subdepar
-            FROM [ATISA_Input].dbo.cliente_proceso_hito cph
-            JOIN [ATISA_Input].dbo.cliente_proceso cp ON cp.id = cph.cliente_proceso_id
-            JOIN [ATISA_Input].dbo.proceso p ON p.id = cp.proceso_id
-            JOIN [ATISA_Input].dbo.proceso_hito_maestro phm ON phm.hito_id = cph.hito_id AND phm.proceso_id = p.id
-            JOIN [ATISA_Input].dbo.hito h ON h.id = phm.hito_id
-            JOIN [ATISA_Input].dbo.clientes c ON c.idcliente = cp.cliente_id
-            JOIN [ATISA_Input].dbo.clienteSubDepar csd ON csd.cif = c.cif
-            JOIN [ATISA_Input].dbo.SubDePar sd ON sd.codSubDePar = csd.codSubDePar
+{_COLUMNAS_PLANAS}{columnas_conteo}
+{_FROM_HITOS_DEPARTAMENTO}
             WHERE {where_clause}
             ORDER BY cph.id ASC
         """
@@ -193,44 +217,80 @@ class AdminHitosDepartamentoRepositorySQL(AdminHitosDepartamentoRepository):
         items_rows = rows[:lim]
 
         items = [dict(r) for r in items_rows]
+        total = None
+        max_id = None
+        for item in items:
+            total = item.pop("total_conteo", None)
+            max_id = item.pop("max_id_conteo", None)
 
         next_cursor: Optional[int] = None
-        quedan = 0
+        quedan: Optional[int] = None if conteo == "ninguno" else 0
         if items:
             last_id = items[-1]["cliente_proceso_hito_id"]
             next_cursor = last_id if has_more else None
 
-            if has_more:
-                # Calcular cuántos quedarían tras el último id de esta página
-                filtros_restantes = filtros.copy()
-                # Reemplazamos/añadimos condición por last_id (no por cursor inicial)
-                filtros_restantes = [f for f in filtros_restantes if not f.startswith("cph.id > ")]
-                filtros_restantes.append("cph.id > :last_id")
-                where_rest = " AND ".join(["1=1"] + filtros_restantes)
-                params_rest = params.copy()
-                params_rest["last_id"] = last_id
-
-                sql_count = f"""
-                    SELECT COUNT(*) AS cnt
-                    FROM [ATISA_Input].dbo.cliente_proceso_hito cph
-                    JOIN [ATISA_Input].dbo.cliente_proceso cp ON cp.id = cph.cliente_proceso_id
-                    JOIN [ATISA_Input].dbo.proceso p ON p.id = cp.proceso_id
-                    JOIN [ATISA_Input].dbo.proceso_hito_maestro phm ON phm.hito_id = cph.hito_id AND phm.proceso_id = p.id
-                    JOIN [ATISA_Input].dbo.hito h ON h.id = phm.hito_id
-                    JOIN [ATISA_Input].dbo.clientes c ON c.idcliente = cp.cliente_id
-                    JOIN [ATISA_Input].dbo.clienteSubDepar csd ON csd.cif = c.cif
-                    JOIN [ATISA_Input].dbo.SubDePar sd ON sd.codSubDePar = csd.codSubDePar
-                    WHERE {where_rest}
-                """
-                row_cnt = self.session.execute(text(sql_count), params_rest).mappings().first()
-                quedan = int(row_cnt["cnt"]) if row_cnt and row_cnt["cnt"] is not None else 0
+            if conteo == "estimado":
+                quedan = self._estimar_restantes(items, cursor, max_id) if has_more else 0
+            elif conteo != "ninguno":
+                if contar:
+                    restantes = int(total or 0)
+                    if conteo == "cache":
+                        conteo_hitos_departamento.guardar((clave_filtros, cursor), restantes, generacion)
+                quedan = max(0, restantes - len(items)) if has_more else 0
+                if conteo == "cache" and has_more:
+                    conteo_hitos_departamento.guardar((clave_filtros, next_cursor), quedan, generacion)
 
         return {
             "items": items,
             "quedan": quedan,
             "next_cursor": next_cursor,
+            "conteo": conteo,
         }
 
+    @staticmethod
+    def _estimar_restantes(items: List[Dict[str, Any]], cursor: Optional[int], max_id: Optional[int]) -> int:
+        """
+        Extrapola la proporción de ids que cumplen los filtros en esta página al rango
+        de ids que queda hasta el último de la tabla. Es aproximado: asume que las filas
+        del departamento/mes están repartidas de forma uniforme por los ids.
+        """
+        primero = items[0]["cliente_proceso_hito_id"]
+        ultimo = items[-1]["cliente_proceso_hito_id"]
+        desde = cursor if cursor is not None else primero - 1
+        densidad = len(items) / max(1, ultimo - desde)
+        return max(1, round(densidad * max(0, (max_id or ultimo) - ultimo)))
+
+    def iterar_hitos_departamentos(
+        self,
+        mes: Optional[int] = None,
+        anio: Optional[int] = None,
+        cod_subdepar: Optional[str] = None,
+        tam_lote: int = 1000,
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Recorre los hitos habilitados en formato plano, en lotes de tam_lote filas, con
+        un cursor de servidor (stream_results): la memoria no depende del volumen total.
+
+        Ordena por cph.id para que el motor pueda devolver filas siguiendo la clave
+        primaria sin ordenar antes todo el resultado.
+        """
+        filtros, params = _filtros_hitos(mes, anio, cod_subdepar)
+        where_extra = (" AND " + " AND ".join(filtros)) if filtros else ""
+        sql = f"""
+            SELECT
+{_COLUMNAS_PLANAS}
+{_FROM_HITOS_DEPARTAMENTO}
+            WHERE cph.habilitado = 1 {where_extra}
+            ORDER BY cph.id ASC
+        """
+        stmt = text(sql).execution_options(stream_results=True, yield_per=max(1, tam_lote))
+        result = self.session.execute(stmt, params).mappings()
+        try:
+            for lote in result.partitions():
+                yield [dict(r) for r in lote]
+        finally:
+            result.close()
+
     def actualizar_hito_departamento(self, cliente_proceso_hito_id: int, data: Dict[str, Any]) -> Dict[str, Any] | None:
         """
         Actualiza un registro de cliente_proceso_hito por ID.
@@ -286,7 +346,9 @@ class AdminHitosDepartamentoRepositorySQL(AdminHitosDepartamentoRepository):
                     # No existe CPH o HITO relacionado
                     self.session.rollback()
                     return None
+                marcar_modificados(self.session, "hito", "proceso_hito_maestro")
 
+            marcar_conteos_hitos(self.session)
             self.session.commit()
         except Exception:
             self.session.rollback()
@@ -310,3 +372,13 @@ class AdminHitosDepartamentoRepositorySQL(AdminHitosDepartamentoRepository):
         """
         row = self.session.execute(text(sql_select), {"id": cliente_proceso_hito_id}).mappings().first()
         return dict(row) if row else None
+
+    def obtener_region_hito(self, cliente_proceso_hito_id: int) -> Optional[str]:
+        sql = """
+            SELECT c.provincia
+            FROM [ATISA_Input].dbo.cliente_proceso_hito cph
+            JOIN [ATISA_Input].dbo.cliente_proceso cp ON cp.id = cph.cliente_proceso_id
+            JOIN [ATISA_Input].dbo.clientes c ON c.idcliente = cp.cliente_id
+            WHERE cph.id = :id
+        """
+        return self.session.execute(text(sql), {"id": cliente_proceso_hito_id}).scalar()
@@ -5,9 +5,14 @@ from app.infrastructure.db.models.auditoria_calendarios_model import AuditoriaCa
 from app.infrastructure.db.models.hito_model import HitoModel
 from app.infrastructure.db.models.cliente_proceso_hito_model import ClienteProcesoHitoModel
 from app.infrastructure.db.models.proceso_hito_maestro_model import ProcesoHitoMaestroModel
+from app.domain.repositories.consulta_listado import ConsultaListado, ResultadoCursor, ResultadoListado
+from app.infrastructure.db.compartido.consulta_listado_sql import listar_paginado, listar_por_cursor
 
 
 class AuditoriaCalendariosRepositorySQL(AuditoriaCalendariosRepository):
+    # Campos admitidos como filtro de igualdad en listar_paginado
+    CAMPOS_FILTRO = ("cliente_id", "hito_id", "campo_modificado", "usuario_modificacion")
+
     def __init__(self, session):
         self.session = session
 
@@ -34,6 +39,12 @@ class AuditoriaCalendariosRepositorySQL(AuditoriaCalendariosRepository):
     def listar(self):
         return self.session.query(AuditoriaCalendariosModel).all()
 
+    def listar_paginado(self, consulta: ConsultaListado) -> ResultadoListado:
+        return listar_paginado(self.session, AuditoriaCalendariosModel, consulta, self.CAMPOS_FILTRO, solo_columnas=True)
+
+    def listar_por_cursor(self, consulta: ConsultaListado) -> ResultadoCursor:
+        return listar_por_cursor(self.session, AuditoriaCalendariosModel, consulta, self.CAMPOS_FILTRO, solo_columnas=True)
+
     def obtener_por_id(self, id: int):
         return self.session.query(AuditoriaCalendariosModel).filter_by(id=id).first()
 
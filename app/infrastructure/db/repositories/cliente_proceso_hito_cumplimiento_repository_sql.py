@@ -3,8 +3,13 @@
 from app.domain.entities.cliente_proceso_hito_cumplimiento import ClienteProcesoHitoCumplimiento
 from app.domain.repositories.cliente_proceso_hito_cumplimiento_repository import ClienteProcesoHitoCumplimientoRepository
 from app.infrastructure.db.models.cliente_proceso_hito_cumplimiento_model import ClienteProcesoHitoCumplimientoModel
+from app.domain.repositories.consulta_listado import ConsultaListado, ResultadoCursor, ResultadoListado
+from app.infrastructure.db.compartido.consulta_listado_sql import listar_paginado, listar_por_cursor
 
 class ClienteProcesoHitoCumplimientoRepositorySQL(ClienteProcesoHitoCumplimientoRepository):
+    # Campos admitidos como filtro de igualdad en listar_paginado
+    CAMPOS_FILTRO = ("cliente_proceso_hito_id", "usuario", "fecha")
+
     def __init__(self, session):
         self.session = session
 
@@ -32,6 +37,16 @@ class ClienteProcesoHitoCumplimientoRepositorySQL(ClienteProcesoHitoCumplimiento
         modelos = self.session.query(ClienteProcesoHitoCumplimientoModel).all()
         return modelos
 
+    def listar_paginado(self, consulta: ConsultaListado) -> ResultadoListado:
+        return listar_paginado(
+            self.session, ClienteProcesoHitoCumplimientoModel, consulta, self.CAMPOS_FILTRO, solo_columnas=True
+        )
+
+    def listar_por_cursor(self, consulta: ConsultaListado) -> ResultadoCursor:
+        return listar_por_cursor(
+            self.session, ClienteProcesoHitoCumplimientoModel, consulta, self.CAMPOS_FILTRO, solo_columnas=True
+        )
+
     def obtener_por_id(self, id: int):
         modelo = self.session.query(ClienteProcesoHitoCumplimientoModel).filter(
             ClienteProcesoHitoCumplimientoModel.id == id
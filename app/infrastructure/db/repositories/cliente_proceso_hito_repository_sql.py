@@ -4,20 +4,42 @@ from app.domain.entities.cliente_proceso_hito import ClienteProcesoHito
 from app.domain.repositories.cliente_proceso_hito_repository import ClienteProcesoHitoRepository
 from app.infrastructure.db.models.cliente_proceso_hito_model import ClienteProcesoHitoModel
 from datetime import date, datetime
+from typing import List
+from sqlalchemy import insert
+from app.domain.repositories.consulta_listado import ConsultaListado, ResultadoCursor
+from app.infrastructure.db.compartido.consulta_listado_sql import listar_filas, listar_por_cursor
+from app.infrastructure.db.compartido.conteo_cache import marcar_conteos_hitos
 
 class ClienteProcesoHitoRepositorySQL(ClienteProcesoHitoRepository):
+    # Campos admitidos como filtro de igualdad en listar_por_cursor
+    CAMPOS_FILTRO = ("cliente_proceso_id", "hito_id", "estado", "tipo", "habilitado")
+
     def __init__(self, session):
         self.session = session
 
     def guardar(self, relacion: ClienteProcesoHito):
         modelo = ClienteProcesoHitoModel(**vars(relacion))
         self.session.add(modelo)
+        marcar_conteos_hitos(self.session)
         self.session.commit()
         self.session.refresh(modelo)
         return modelo
 
+    def guardar_lote(self, cliente_proceso_hitos: List[ClienteProcesoHito], confirmar: bool = True) -> int:
+        if cliente_proceso_hitos:
+            filas = [{k: v for k, v in vars(h).items() if k != "id"} for h in cliente_proceso_hitos]
+            # executemany sin RETURNING (fast_executemany en mssql+pyodbc)
+            self.session.execute(insert(ClienteProcesoHitoModel), filas)
+            marcar_conteos_hitos(self.session)
+        if confirmar:
+            self.session.commit()
+        return len(cliente_proceso_hitos)
+
     def listar(self):
-        return self.session.query(ClienteProcesoHitoModel).all()
+        return listar_filas(self.session, ClienteProcesoHitoModel)
+
+    def listar_por_cursor(self, consulta: ConsultaListado) -> ResultadoCursor:
+        return listar_por_cursor(self.session, ClienteProcesoHitoModel, consulta, self.CAMPOS_FILTRO, solo_columnas=True)
 
     def obtener_por_id(self, id: int):
         return self.session.query(ClienteProcesoHitoModel).filter_by(id=id).first()
@@ -27,22 +49,26 @@ class ClienteProcesoHitoRepositorySQL(ClienteProcesoHitoRepository):
         if not relacion:
             return False
         self.session.delete(relacion)
+        marcar_conteos_hitos(self.session)
         self.session.commit()
         return True
 
     def obtener_por_cliente_proceso_id(self, cliente_proceso_id: int):
-        return self.session.query(ClienteProcesoHitoModel).filter_by(cliente_proceso_id=cliente_proceso_id).all()
+        return listar_filas(
+            self.session, ClienteProcesoHitoModel, ClienteProcesoHitoModel.cliente_proceso_id == cliente_proceso_id
+        )
 
     def listar_habilitados(self):
         """Lista solo los hitos habilitados (habilitado=True)"""
-        return self.session.query(ClienteProcesoHitoModel).filter_by(habilitado=True).all()
+        return listar_filas(self.session, ClienteProcesoHitoModel, ClienteProcesoHitoModel.habilitado == True)
 
     def obtener_habilitados_por_cliente_proceso_id(self, cliente_proceso_id: int):
         """Obtiene solo los hitos habilitados de un proceso de cliente específico"""
-        return self.session.query(ClienteProcesoHitoModel).filter_by(
-            cliente_proceso_id=cliente_proceso_id,
-            habilitado=True
-        ).all()
+        return listar_filas(
+            self.session, ClienteProcesoHitoModel,
+            ClienteProcesoHitoModel.cliente_proceso_id == cliente_proceso_id,
+            ClienteProcesoHitoModel.habilitado == True
+        )
 
     def deshabilitar_desde_fecha_por_hito(self, hito_id: int, fecha_desde):
         """Deshabilita todos los ClienteProcesoHito para un hito_id con fecha_limite >= fecha_desde"""
@@ -98,6 +124,7 @@ class ClienteProcesoHitoRepositorySQL(ClienteProcesoHitoRepository):
                         'proceso_id': cliente_proceso.proceso_id
                     })
 
+        marcar_conteos_hitos(self.session)
         self.session.commit()
         return {
             'hitos_afectados': afectados,
@@ -193,6 +220,7 @@ class ClienteProcesoHitoRepositorySQL(ClienteProcesoHitoRepository):
                 if cliente_proceso.habilitado != nuevo_estado:
                     cliente_proceso.habilitado = nuevo_estado
 
+        marcar_conteos_hitos(self.session)
         self.session.commit()
         self.session.refresh(hito)
         return hito
@@ -229,6 +257,7 @@ class ClienteProcesoHitoRepositorySQL(ClienteProcesoHitoRepository):
                 ClienteProcesoHitoModel.hito_id.in_(ids_list)
             ).delete(synchronize_session=False)
 
+            marcar_conteos_hitos(self.session)
             self.session.commit()
             return eliminados
 
@@ -1,9 +1,16 @@
+from typing import List
+from sqlalchemy import insert
 from app.domain.entities.cliente_proceso import ClienteProceso
 from app.domain.repositories.cliente_proceso_repository import ClienteProcesoRepository
 from app.infrastructure.db.models.cliente_proceso_model import ClienteProcesoModel
 from app.infrastructure.mappers.cliente_proceso_mapper import mapear_modelo_a_entidad
+from app.domain.repositories.consulta_listado import ConsultaListado, ResultadoCursor
+from app.infrastructure.db.compartido.consulta_listado_sql import listar_filas, listar_por_cursor
 
 class ClienteProcesoRepositorySQL(ClienteProcesoRepository):
+    # Campos admitidos como filtro de igualdad en listar_por_cursor
+    CAMPOS_FILTRO = ("cliente_id", "proceso_id", "anio", "mes", "habilitado")
+
     def __init__(self, session):
         self.session = session
 
@@ -14,8 +21,25 @@ class ClienteProcesoRepositorySQL(ClienteProcesoRepository):
         self.session.refresh(modelo)
         return mapear_modelo_a_entidad(modelo)
 
+    def guardar_lote(self, clientes_procesos: List[ClienteProceso], confirmar: bool = True) -> List[ClienteProceso]:
+        if clientes_procesos:
+            filas = [{k: v for k, v in vars(cp).items() if k != "id"} for cp in clientes_procesos]
+            # insert().returning con varias filas: SQLAlchemy lo agrupa en INSERT ... OUTPUT por lotes
+            ids = self.session.execute(
+                insert(ClienteProcesoModel).returning(ClienteProcesoModel.id, sort_by_parameter_order=True),
+                filas
+            ).scalars().all()
+            for cp, nuevo_id in zip(clientes_procesos, ids):
+                cp.id = nuevo_id
+        if confirmar:
+            self.session.commit()
+        return clientes_procesos
+
     def listar(self):
-        return self.session.query(ClienteProcesoModel).all()
+        return listar_filas(self.session, ClienteProcesoModel)
+
+    def listar_por_cursor(self, consulta: ConsultaListado) -> ResultadoCursor:
+        return listar_por_cursor(self.session, ClienteProcesoModel, consulta, self.CAMPOS_FILTRO, solo_columnas=True)
 
     def obtener_por_id(self, id: int):
         return self.session.query(ClienteProcesoModel).filter_by(id=id).first()
@@ -29,15 +53,16 @@ class ClienteProcesoRepositorySQL(ClienteProcesoRepository):
         return True
 
     def listar_por_cliente(self, cliente_id: str):
-        return self.session.query(ClienteProcesoModel).filter_by(cliente_id=cliente_id).all()
+        return listar_filas(self.session, ClienteProcesoModel, ClienteProcesoModel.cliente_id == cliente_id)
 
     def listar_habilitados(self):
         """Lista solo los procesos de cliente habilitados (habilitado=True)"""
-        return self.session.query(ClienteProcesoModel).filter_by(habilitado=True).all()
+        return listar_filas(self.session, ClienteProcesoModel, ClienteProcesoModel.habilitado == True)
 
     def listar_habilitados_por_cliente(self, cliente_id: str):
         """Lista solo los procesos de cliente habilitados de un cliente específico"""
-        return self.session.query(ClienteProcesoModel).filter_by(
-            cliente_id=cliente_id,
-            habilitado=True
-        ).all()
+        return listar_filas(
+            self.session, ClienteProcesoModel,
+            ClienteProcesoModel.cliente_id == cliente_id,
+            ClienteProcesoModel.habilitado == True
+        )
@@ -1,10 +1,16 @@
 from typing import List, Optional
+from sqlalchemy import Integer, try_cast
 from sqlalchemy.orm import Session
 from app.domain.repositories.cliente_repository import ClienteRepository
 from app.domain.entities.cliente import Cliente
 from app.infrastructure.db.models.cliente_model import ClienteModel
+from app.domain.repositories.consulta_listado import ConsultaListado, ResultadoListado
+from app.infrastructure.db.compartido.consulta_listado_sql import listar_paginado, columnas_modelo
 
 class ClienteRepositorySQL(ClienteRepository):
+    # Campos admitidos como filtro de igualdad en listar_paginado
+    CAMPOS_FILTRO = ("provincia", "localidad", "pais", "cif")
+
     def __init__(self, session: Session):
         self.session = session
 
@@ -12,6 +18,12 @@ class ClienteRepositorySQL(ClienteRepository):
         registros = self.session.query(ClienteModel).all()
         return [self._mapear_modelo_a_entidad(r) for r in registros]
 
+    def listar_paginado(self, consulta: ConsultaListado) -> ResultadoListado:
+        # idcliente es texto, pero se ordena como número
+        orden = {**columnas_modelo(ClienteModel), "idcliente": try_cast(ClienteModel.idcliente, Integer)}
+        return listar_paginado(self.session, ClienteModel, consulta, self.CAMPOS_FILTRO, orden,
+                               mapear=self._mapear_modelo_a_entidad, solo_columnas=True)
+
     def buscar_por_nombre(self, nombre: str) -> List[Cliente]:
         registros = self.session.query(ClienteModel).filter(
             ClienteModel.razsoc.ilike(f"%{nombre}%")
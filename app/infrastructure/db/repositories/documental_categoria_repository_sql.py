@@ -3,14 +3,21 @@ from sqlalchemy.orm import Session
 from app.domain.repositories.documental_categoria_repository import DocumentalCategoriaRepository
 from app.domain.entities.documental_categoria import DocumentalCategoria
 from app.infrastructure.db.models.documental_categoria_model import DocumentalCategoriaModel
+from app.domain.repositories.consulta_listado import ConsultaListado, ResultadoListado
+from app.infrastructure.db.compartido.consulta_listado_sql import listar_paginado
+from app.infrastructure.db.compartido.catalogo_cache import marcar_modificados
 
 class SqlDocumentalCategoriaRepository(DocumentalCategoriaRepository):
+    # Campos admitidos como filtro de igualdad en listar_paginado
+    CAMPOS_FILTRO = ("cliente_id",)
+
     def __init__(self, session: Session):
         self.session = session
 
     def guardar(self, documento_categoria: DocumentalCategoria):
         modelo = DocumentalCategoriaModel(**documento_categoria.__dict__)
         self.session.add(modelo)
+        marcar_modificados(self.session, "documental_categoria")
         self.session.commit()
         self.session.refresh(modelo)
         return modelo
@@ -23,6 +30,7 @@ class SqlDocumentalCategoriaRepository(DocumentalCategoriaRepository):
         for key, value in data.items():
             setattr(documental_categoria, key, value)
 
+        marcar_modificados(self.session, "documental_categoria")
         self.session.commit()
         self.session.refresh(documental_categoria)
         return documental_categoria
@@ -30,6 +38,9 @@ class SqlDocumentalCategoriaRepository(DocumentalCategoriaRepository):
     def listar(self):
         return self.session.query(DocumentalCategoriaModel).all()
 
+    def listar_paginado(self, consulta: ConsultaListado) -> ResultadoListado:
+        return listar_paginado(self.session, DocumentalCategoriaModel, consulta, self.CAMPOS_FILTRO, solo_columnas=True)
+
     def obtener_por_id(self, id: int):
         return self.session.query(DocumentalCategoriaModel).filter_by(id=id).first()
 
@@ -41,5 +52,6 @@ class SqlDocumentalCategoriaRepository(DocumentalCategoriaRepository):
         if not documento_categoria:
             return None
         self.session.delete(documento_categoria)
+        marcar_modificados(self.session, "documental_categoria")
         self.session.commit()
         return True
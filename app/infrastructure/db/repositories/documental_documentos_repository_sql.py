@@ -3,8 +3,13 @@ from sqlalchemy.orm import Session
 from app.domain.repositories.documental_documentos_repository import DocumentalDocumentosRepository
 from app.domain.entities.documental_documentos import DocumentalDocumentos
 from app.infrastructure.db.models.documental_documentos_model import DocumentalDocumentosModel
+from app.domain.repositories.consulta_listado import ConsultaListado, ResultadoListado
+from app.infrastructure.db.compartido.consulta_listado_sql import listar_paginado
 
 class SqlDocumentalDocumentosRepository(DocumentalDocumentosRepository):
+    # Campos admitidos como filtro de igualdad en listar_paginado
+    CAMPOS_FILTRO = ("cliente_id", "categoria_id")
+
     def __init__(self, session: Session):
         self.session = session
 
@@ -44,6 +49,10 @@ class SqlDocumentalDocumentosRepository(DocumentalDocumentosRepository):
         modelos = self.session.query(DocumentalDocumentosModel).all()
         return [self._mapear_modelo_a_entidad(modelo) for modelo in modelos]
 
+    def listar_paginado(self, consulta: ConsultaListado) -> ResultadoListado:
+        return listar_paginado(self.session, DocumentalDocumentosModel, consulta, self.CAMPOS_FILTRO,
+                               mapear=self._mapear_modelo_a_entidad, solo_columnas=True)
+
     def obtener_por_id(self, id: int) -> DocumentalDocumentos | None:
         modelo = self.session.query(DocumentalDocumentosModel).filter_by(id=id).first()
         if not modelo:
@@ -6,8 +6,13 @@ from typing import List
 from app.domain.entities.documento import Documento
 from app.domain.repositories.documento_repository import DocumentoRepositoryPort
 from app.infrastructure.db.models.documento_model import DocumentoModel
+from app.domain.repositories.consulta_listado import ConsultaListado, ResultadoCursor
+from app.infrastructure.db.compartido.consulta_listado_sql import listar_por_cursor
 
 class SQLDocumentoRepository(DocumentoRepositoryPort):
+    # Campos admitidos como filtro de igualdad en listar_por_cursor
+    CAMPOS_FILTRO = ("cliente_proceso_hito_id",)
+
     def __init__(self, session: Session):
         self.session = session
 
@@ -15,6 +20,9 @@ class SQLDocumentoRepository(DocumentoRepositoryPort):
         modelos = self.session.query(DocumentoModel).all()
         return [self._to_entity(m) for m in modelos]
 
+    def listar_por_cursor(self, consulta: ConsultaListado) -> ResultadoCursor:
+        return listar_por_cursor(self.session, DocumentoModel, consulta, self.CAMPOS_FILTRO, mapear=self._to_entity)
+
     def get_by_id(self, doc_id: int) -> Documento | None:
         m = (
             self.session
@@ -0,0 +1,61 @@
+from datetime import date
+from typing import Iterable, List, Optional
+from sqlalchemy import or_
+from sqlalchemy.exc import IntegrityError
+from app.domain.entities.festivo import Festivo
+from app.domain.repositories.festivo_repository import FestivoRepository
+from app.infrastructure.db.models.festivo_model import FestivoModel
+from app.infrastructure.db.compartido.catalogo_cache import marcar_modificados
+
+class FestivoRepositorySQL(FestivoRepository):
+    def __init__(self, session):
+        self.session = session
+
+    def guardar(self, festivo: Festivo) -> Festivo:
+        modelo = FestivoModel(**vars(festivo))
+        self.session.add(modelo)
+        try:
+            marcar_modificados(self.session, "festivo")
+            self.session.commit()
+        except IntegrityError:
+            self.session.rollback()
+            raise ValueError(f"Ya existe un festivo el {festivo.fecha} para la región {festivo.region or 'nacional'}")
+        self.session.refresh(modelo)
+        return self._mapear_modelo_a_entidad(modelo)
+
+    def listar(self, anio: Optional[int] = None, region: Optional[str] = None) -> List[Festivo]:
+        query = self.session.query(FestivoModel)
+        if anio is not None:
+            query = query.filter(FestivoModel.fecha >= date(anio, 1, 1), FestivoModel.fecha < date(anio + 1, 1, 1))
+        if region is not None:
+            # Los nacionales aplican a cualquier región
+            query = query.filter(or_(FestivoModel.region == region, FestivoModel.region.is_(None)))
+        return [self._mapear_modelo_a_entidad(m) for m in query.order_by(FestivoModel.fecha).all()]
+
+    def listar_por_anios(self, anios: Iterable[int]) -> List[Festivo]:
+        anios = sorted(set(anios))
+        if not anios:
+            return []
+        modelos = self.session.query(FestivoModel).filter(
+            FestivoModel.fecha >= date(anios[0], 1, 1),
+            FestivoModel.fecha < date(anios[-1] + 1, 1, 1)
+        ).all()
+        return [self._mapear_modelo_a_entidad(m) for m in modelos if m.fecha.year in anios]
+
+    def eliminar(self, id: int) -> Optional[Festivo]:
+        modelo = self.session.query(FestivoModel).filter_by(id=id).first()
+        if not modelo:
+            return None
+        festivo = self._mapear_modelo_a_entidad(modelo)
+        self.session.delete(modelo)
+        marcar_modificados(self.session, "festivo")
+        self.session.commit()
+        return festivo
+
+    def _mapear_modelo_a_entidad(self, modelo: FestivoModel) -> Festivo:
+        return Festivo(
+            id=modelo.id,
+            fecha=modelo.fecha,
+            region=modelo.region,
+            descripcion=modelo.descripcion
+        )
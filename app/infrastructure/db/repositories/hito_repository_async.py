@@ -0,0 +1,15 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.infrastructure.db.compartido.repositorio_async import RepositorioAsync
+from app.infrastructure.db.repositories.hito_repository_sql import HitoRepositorySQL
+
+
+class HitoRepositoryAsync(RepositorioAsync):
+    def __init__(self, session: AsyncSession):
+        super().__init__(session, HitoRepositorySQL(session.sync_session))
+
+    async def listar_hitos_cliente_por_empleado(self, email, fecha_inicio=None, fecha_fin=None, mes=None, anio=None):
+        return await self._ejecutar(
+            self.sincrono.listar_hitos_cliente_por_empleado,
+            email, fecha_inicio=fecha_inicio, fecha_fin=fecha_fin, mes=mes, anio=anio,
+        )
@@ -5,14 +5,23 @@ from sqlalchemy import text
 from collections import OrderedDict
 from app.infrastructure.db.compartido.mis_clientes_cte import MIS_CLIENTES_CTE
 from app.infrastructure.db.compartido.mis_clientes_cte import construir_sql_hitos_cliente_por_empleado
+from app.infrastructure.db.compartido.filtros_fecha import parametros_periodo
+from app.infrastructure.db.compartido.clientes_scope import preparar_mis_clientes
+from app.domain.repositories.consulta_listado import ConsultaListado, ResultadoListado
+from app.infrastructure.db.compartido.consulta_listado_sql import listar_paginado
+from app.infrastructure.db.compartido.catalogo_cache import caches, columnas, marcar_modificados
 
 class HitoRepositorySQL(HitoRepository):
+    # Campos admitidos como filtro de igualdad en listar_paginado
+    CAMPOS_FILTRO = ("tipo", "obligatorio", "habilitado")
+
     def __init__(self, session):
         self.session = session
 
     def guardar(self, hito: Hito):
         modelo = HitoModel(**vars(hito))
         self.session.add(modelo)
+        marcar_modificados(self.session, "hito")
         self.session.commit()
         self.session.refresh(modelo)
         return modelo
@@ -20,28 +29,43 @@ class HitoRepositorySQL(HitoRepository):
     def listar(self):
         return self.session.query(HitoModel).all()
 
+    def listar_paginado(self, consulta: ConsultaListado) -> ResultadoListado:
+        return listar_paginado(self.session, HitoModel, consulta, self.CAMPOS_FILTRO, solo_columnas=True)
+
     def listar_habilitados(self):
         """Lista solo los hitos habilitados (habilitado=True)"""
         return self.session.query(HitoModel).filter_by(habilitado=True).all()
 
     def obtener_por_id(self, id: int):
+        # Copia de la caché de catálogo: modificarla no cambia nada en la base de datos
+        valores = caches["hito"].obtener(self.session, id, lambda: self._columnas_por_id(id))
+        return HitoModel(**valores) if valores else None
+
+    def _modelo_por_id(self, id: int):
         return self.session.query(HitoModel).filter_by(id=id).first()
 
+    def _columnas_por_id(self, id: int):
+        hito = self._modelo_por_id(id)
+        return columnas(hito) if hito else None
+
     def actualizar(self, id: int, data: dict):
-        hito = self.obtener_por_id(id)
+        hito = self._modelo_por_id(id)
         if not hito:
             return None
         for key, value in data.items():
             setattr(hito, key, value)
+        # proceso_hito_maestro.listar_por_proceso también devuelve los datos del hito
+        marcar_modificados(self.session, "hito", "proceso_hito_maestro")
         self.session.commit()
         self.session.refresh(hito)
         return hito
 
     def eliminar(self, id: int):
-        hito = self.obtener_por_id(id)
+        hito = self._modelo_por_id(id)
         if not hito:
             return None
         self.session.delete(hito)
+        marcar_modificados(self.session, "hito", "proceso_hito_maestro")
         self.session.commit()
         return True
 
@@ -49,15 +73,15 @@ class HitoRepositorySQL(HitoRepository):
         sql = construir_sql_hitos_cliente_por_empleado(
             filtrar_fecha=bool(fecha_inicio and fecha_fin),
             filtrar_mes=bool(mes),
-            filtrar_anio=bool(anio)
+            filtrar_anio=bool(anio),
+            cte=preparar_mis_clientes(self.session, email)
         )
 
         params = {
             "email": email,
             "fecha_inicio": fecha_inicio,
             "fecha_fin": fecha_fin,
-            "mes": mes,
-            "anio": anio
+            **parametros_periodo(mes, anio)
         }
 
         result = self.session.execute(text(sql), params)
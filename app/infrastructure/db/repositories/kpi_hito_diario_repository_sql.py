@@ -0,0 +1,87 @@
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.domain.repositories.kpi_hito_diario_repository import KpiHitoDiarioRepository
+
+
+class KpiHitoDiarioRepositorySQL(KpiHitoDiarioRepository):
+    def __init__(self, session: Session):
+        self.session = session
+
+    def refrescar(self) -> int:
+        # sp_getapplock evita que varios workers refresquen a la vez; el lock se
+        # libera con la transacción. Las claves afectadas se borran y se vuelven a
+        # agregar completas (todos sus estados), ya que un cambio de estado mueve
+        # hitos de una fila a otra.
+        #
+        # Las claves llegan por kpi_hito_pendiente, que llenan los triggers de
+        # cliente_proceso_hito y cliente_proceso con la clave nueva y la anterior de
+        # cada fila escrita o borrada. La cola se consume con READPAST: lo encolado por
+        # transacciones aún sin confirmar se salta y se recoge en el siguiente ciclo, ya
+        # con sus datos visibles. Si el refresco falla, el rollback devuelve las claves
+        # a la cola.
+        sql = """
+            SET NOCOUNT ON;
+            DECLARE @lock INT;
+            EXEC @lock = sp_getapplock @Resource = 'kpi_hito_diario', @LockMode = 'Exclusive',
+                                       @LockOwner = 'Transaction', @LockTimeout = 0;
+            IF @lock < 0
+            BEGIN
+                SELECT CAST(-1 AS INT) AS claves;
+                RETURN;
+            END
+
+            SELECT TOP 0 cliente_id, proceso_id, dia INTO #kpi_cola FROM [ATISA_Input].dbo.kpi_hito_pendiente;
+            SELECT TOP 0 cliente_id, proceso_id, dia INTO #kpi_claves FROM #kpi_cola;
+
+            DELETE FROM [ATISA_Input].dbo.kpi_hito_pendiente WITH (READPAST)
+            OUTPUT deleted.cliente_id, deleted.proceso_id, deleted.dia INTO #kpi_cola;
+
+            IF NOT EXISTS (SELECT 1 FROM [ATISA_Input].dbo.kpi_hito_diario)
+                -- Agregado vacío: reconstrucción completa, que ya cubre lo encolado
+                INSERT INTO #kpi_claves (cliente_id, proceso_id, dia)
+                SELECT DISTINCT cp.cliente_id, cp.proceso_id, cph.fecha_limite
+                FROM [ATISA_Input].dbo.cliente_proceso_hito cph
+                JOIN [ATISA_Input].dbo.cliente_proceso cp ON cp.id = cph.cliente_proceso_id
+                WHERE cp.cliente_id IS NOT NULL
+                  AND cph.fecha_limite IS NOT NULL;
+            ELSE
+            BEGIN
+                INSERT INTO #kpi_claves (cliente_id, proceso_id, dia)
+                SELECT DISTINCT cliente_id, proceso_id, dia FROM #kpi_cola;
+
+                -- También las claves que ya no tienen hitos (borrados, fechas movidas)
+                DELETE k
+                FROM [ATISA_Input].dbo.kpi_hito_diario k
+                JOIN #kpi_claves kc
+                  ON kc.cliente_id = k.cliente_id AND kc.proceso_id = k.proceso_id AND kc.dia = k.dia;
+            END
+
+            INSERT INTO [ATISA_Input].dbo.kpi_hito_diario
+                (cliente_id, proceso_id, dia, estado, hitos, dias_resolucion, resueltos, ultima_fecha_estado)
+            SELECT
+                cp.cliente_id,
+                cp.proceso_id,
+                cph.fecha_limite,
+                cph.estado,
+                COUNT(*),
+                SUM(CASE WHEN cph.estado = 'Finalizado' AND cph.fecha_estado IS NOT NULL
+                         THEN DATEDIFF(day, cph.fecha_limite, CAST(cph.fecha_estado AS DATE)) END),
+                COUNT(CASE WHEN cph.estado = 'Finalizado' AND cph.fecha_estado IS NOT NULL THEN 1 END),
+                MAX(cph.fecha_estado)
+            FROM [ATISA_Input].dbo.cliente_proceso_hito cph
+            JOIN [ATISA_Input].dbo.cliente_proceso cp ON cp.id = cph.cliente_proceso_id
+            JOIN #kpi_claves kc
+              ON kc.cliente_id = cp.cliente_id AND kc.proceso_id = cp.proceso_id AND kc.dia = cph.fecha_limite
+            GROUP BY cp.cliente_id, cp.proceso_id, cph.fecha_limite, cph.estado;
+
+            SELECT COUNT(*) AS claves FROM #kpi_claves;
+        """
+
+        try:
+            row = self.session.execute(text(sql)).first()
+            self.session.commit()
+        except Exception:
+            self.session.rollback()
+            raise
+        return int(row.claves) if row else 0
@@ -3,6 +3,7 @@ from sqlalchemy.orm import Session
 from app.domain.entities.metadato import Metadato
 from app.domain.repositories.metadato_repository import MetadatoRepository
 from app.infrastructure.db.models.metadato_model import MetadatoModel
+from app.infrastructure.db.compartido.catalogo_cache import marcar_modificados
 
 class SQLMetadatoRepository(MetadatoRepository):
     def __init__(self, session: Session):
@@ -26,6 +27,7 @@ class SQLMetadatoRepository(MetadatoRepository):
         )
         self.session.add(modelo)
 
+        marcar_modificados(self.session, "metadato")
         self.session.commit()
         return self._to_entity(modelo)
 
@@ -40,12 +42,14 @@ class SQLMetadatoRepository(MetadatoRepository):
         modelo.global_ = metadato.global_
         modelo.activo = metadato.activo
 
+        marcar_modificados(self.session, "metadato")
         self.session.commit()
         return self._to_entity(modelo)
 
 
     def delete(self, metadato_id: int) -> None:
         self.session.query(MetadatoModel).filter_by(id=metadato_id).delete()
+        marcar_modificados(self.session, "metadato")
         self.session.commit()
 
     def _to_entity(self, modelo: MetadatoModel) -> Metadato:
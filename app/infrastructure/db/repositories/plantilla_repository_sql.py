@@ -1,14 +1,21 @@
 from app.domain.repositories.plantilla_repository import PlantillaRepository
 from app.domain.entities.plantilla import Plantilla
 from app.infrastructure.db.models import PlantillaModel
+from app.domain.repositories.consulta_listado import ConsultaListado, ResultadoListado
+from app.infrastructure.db.compartido.consulta_listado_sql import listar_paginado
+from app.infrastructure.db.compartido.catalogo_cache import marcar_modificados
 
 class PlantillaRepositorySQL(PlantillaRepository):
+    # Campos admitidos como filtro de igualdad en listar_paginado
+    CAMPOS_FILTRO = ("nombre",)
+
     def __init__(self, session):
         self.session = session
 
     def guardar(self, plantilla: Plantilla):
         modelo = PlantillaModel(**vars(plantilla))
         self.session.add(modelo)
+        marcar_modificados(self.session, "plantilla")
         self.session.commit()
         self.session.refresh(modelo)
         return modelo
@@ -21,12 +28,16 @@ class PlantillaRepositorySQL(PlantillaRepository):
         for key, value in data.items():
             setattr(plantilla, key, value)
 
+        marcar_modificados(self.session, "plantilla")
         self.session.commit()
         self.session.refresh(plantilla)
         return plantilla
 
     def listar(self):
         return self.session.query(PlantillaModel).all()
+
+    def listar_paginado(self, consulta: ConsultaListado) -> ResultadoListado:
+        return listar_paginado(self.session, PlantillaModel, consulta, self.CAMPOS_FILTRO, solo_columnas=True)
     
     def obtener_por_id(self, id: int):
         return self.session.query(PlantillaModel).filter_by(id=id).first()
@@ -36,5 +47,6 @@ class PlantillaRepositorySQL(PlantillaRepository):
         if not plantilla:
             return None
         self.session.delete(plantilla)
+        marcar_modificados(self.session, "plantilla")
         self.session.commit()
         return True
\ No newline at end of file
@@ -2,6 +2,7 @@ from app.domain.entities.proceso_hito_maestro import ProcesoHitoMaestro
 from app.domain.repositories.proceso_hito_maestro_repository import ProcesoHitoMaestroRepository
 from app.infrastructure.db.models import ProcesoHitoMaestroModel
 from app.infrastructure.db.models import HitoModel
+from app.infrastructure.db.compartido.catalogo_cache import caches, columnas, marcar_modificados
 
 class ProcesoHitoMaestroRepositorySQL(ProcesoHitoMaestroRepository):
     def __init__(self, session):
@@ -10,6 +11,7 @@ class ProcesoHitoMaestroRepositorySQL(ProcesoHitoMaestroRepository):
     def guardar(self, relacion: ProcesoHitoMaestro):
         modelo = ProcesoHitoMaestroModel(**relacion.__dict__)
         self.session.add(modelo)
+        marcar_modificados(self.session, "proceso_hito_maestro")
         self.session.commit()
         self.session.refresh(modelo)
         return modelo
@@ -25,14 +27,23 @@ class ProcesoHitoMaestroRepositorySQL(ProcesoHitoMaestroRepository):
         if not relacion:
             return None
         self.session.delete(relacion)
+        marcar_modificados(self.session, "proceso_hito_maestro")
         self.session.commit()
         return True
 
     def listar_por_proceso(self, id_proceso: int):
+        # Copias de la caché de catálogo: (ProcesoHitoMaestroModel, HitoModel) por hito del proceso
+        filas = caches["proceso_hito_maestro"].obtener(
+            self.session, id_proceso, lambda: self._columnas_por_proceso(id_proceso)
+        )
+        return [(ProcesoHitoMaestroModel(**relacion), HitoModel(**hito)) for relacion, hito in filas]
+
+    def _columnas_por_proceso(self, id_proceso: int):
         # Hacer JOIN para obtener los datos completos del hito
-        return self.session.query(ProcesoHitoMaestroModel, HitoModel).join(
+        filas = self.session.query(ProcesoHitoMaestroModel, HitoModel).join(
             HitoModel, ProcesoHitoMaestroModel.hito_id == HitoModel.id
         ).filter(ProcesoHitoMaestroModel.proceso_id == id_proceso).all()
+        return [(columnas(relacion), columnas(hito)) for relacion, hito in filas]
 
     def eliminar_por_hito_id(self, hito_id: int):
         """Elimina todos los registros de proceso_hito_maestro asociados a un hito específico"""
@@ -40,5 +51,6 @@ class ProcesoHitoMaestroRepositorySQL(ProcesoHitoMaestroRepository):
             ProcesoHitoMaestroModel.hito_id == hito_id
         ).delete(synchronize_session=False)
 
+        marcar_modificados(self.session, "proceso_hito_maestro")
         self.session.commit()
         return eliminados
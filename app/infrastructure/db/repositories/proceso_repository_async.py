@@ -0,0 +1,14 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.infrastructure.db.compartido.repositorio_async import RepositorioAsync
+from app.infrastructure.db.repositories.proceso_repository_sql import ProcesoRepositorySQL
+
+
+class ProcesoRepositoryAsync(RepositorioAsync):
+    def __init__(self, session: AsyncSession):
+        super().__init__(session, ProcesoRepositorySQL(session.sync_session))
+
+    async def listar_procesos_cliente_por_empleado(self, email: str, mes=None, anio=None):
+        return await self._ejecutar(
+            self.sincrono.listar_procesos_cliente_por_empleado, email, mes=mes, anio=anio
+        )
@@ -5,15 +5,24 @@ from collections import OrderedDict
 from app.infrastructure.db.models import ProcesoModel
 from app.infrastructure.db.compartido.mis_clientes_cte import MIS_CLIENTES_CTE
 from app.infrastructure.db.compartido.mis_clientes_cte import construir_sql_procesos_cliente_por_empleado
+from app.infrastructure.db.compartido.filtros_fecha import parametros_periodo
+from app.infrastructure.db.compartido.clientes_scope import preparar_mis_clientes
+from app.domain.repositories.consulta_listado import ConsultaListado, ResultadoListado
+from app.infrastructure.db.compartido.consulta_listado_sql import listar_paginado
+from app.infrastructure.db.compartido.catalogo_cache import caches, columnas, marcar_modificados
 
 
 class ProcesoRepositorySQL(ProcesoRepository):
+    # Campos admitidos como filtro de igualdad en listar_paginado
+    CAMPOS_FILTRO = ("temporalidad", "frecuencia", "habilitado")
+
     def __init__(self, session):
         self.session = session
 
     def guardar(self, proceso: Proceso):
         modelo = ProcesoModel(**vars(proceso))
         self.session.add(modelo)
+        marcar_modificados(self.session, "proceso")
         self.session.commit()
         self.session.refresh(modelo)
         return modelo
@@ -26,6 +35,7 @@ class ProcesoRepositorySQL(ProcesoRepository):
         for key, value in data.items():
             setattr(proceso, key, value)
 
+        marcar_modificados(self.session, "proceso")
         self.session.commit()
         self.session.refresh(proceso)
         return proceso
@@ -33,18 +43,29 @@ class ProcesoRepositorySQL(ProcesoRepository):
     def listar(self):
         return self.session.query(ProcesoModel).all()
 
+    def listar_paginado(self, consulta: ConsultaListado) -> ResultadoListado:
+        return listar_paginado(self.session, ProcesoModel, consulta, self.CAMPOS_FILTRO, solo_columnas=True)
+
     def listar_habilitados(self):
         """Lista solo los procesos habilitados (habilitado=True)"""
         return self.session.query(ProcesoModel).filter_by(habilitado=True).all()
 
     def obtener_por_id(self, id: int):
-        return self.session.query(ProcesoModel).filter_by(id=id).first()
+        # Copia de la caché de catálogo: modificarla no cambia nada en la base de datos
+        valores = caches["proceso"].obtener(self.session, id, lambda: self._columnas_por_id(id))
+        return ProcesoModel(**valores) if valores else None
+
+    def _columnas_por_id(self, id: int):
+        proceso = self.session.query(ProcesoModel).filter_by(id=id).first()
+        return columnas(proceso) if proceso else None
 
     def eliminar(self, id: int):
         proceso = self.session.query(ProcesoModel).filter_by(id=id).first()
         if not proceso:
             return None
         self.session.delete(proceso)
+        # Borra en cascada sus filas de proceso_hito_maestro
+        marcar_modificados(self.session, "proceso", "proceso_hito_maestro")
         self.session.commit()
         return True
 
@@ -52,13 +73,13 @@ class ProcesoRepositorySQL(ProcesoRepository):
         sql = construir_sql_procesos_cliente_por_empleado(
             filtrar_fecha=False,
             filtrar_mes=bool(mes),
-            filtrar_anio=bool(anio)
+            filtrar_anio=bool(anio),
+            cte=preparar_mis_clientes(self.session, email)
         )
 
         params = {
             "email": email,
-            "mes": mes,
-            "anio": anio
+            **parametros_periodo(mes, anio)
         }
 
         result = self.session.execute(text(sql), params)
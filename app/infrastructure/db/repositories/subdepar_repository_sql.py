@@ -3,8 +3,13 @@ from sqlalchemy.orm import Session
 from app.domain.repositories.subdepar_repository import SubdeparRepository
 from app.domain.entities.subdepar import Subdepar
 from app.infrastructure.db.models.subdepar_model import SubdeparModel
+from app.domain.repositories.consulta_listado import ConsultaListado, ResultadoListado
+from app.infrastructure.db.compartido.consulta_listado_sql import listar_paginado
 
 class SubdeparRepositorySQL(SubdeparRepository):
+    # Campos admitidos como filtro de igualdad en listar_paginado
+    CAMPOS_FILTRO = ("codidepar", "ceco", "codSubDepar")
+
     def __init__(self, session: Session):
         self.session = session
 
@@ -12,6 +17,10 @@ class SubdeparRepositorySQL(SubdeparRepository):
         registros = self.session.query(SubdeparModel).all()
         return [self._mapear_modelo_a_entidad(r) for r in registros]
 
+    def listar_paginado(self, consulta: ConsultaListado) -> ResultadoListado:
+        return listar_paginado(self.session, SubdeparModel, consulta, self.CAMPOS_FILTRO,
+                               mapear=self._mapear_modelo_a_entidad, solo_columnas=True)
+
     def obtener_por_id(self, id: int) -> Optional[Subdepar]:
         registro = self.session.query(SubdeparModel).filter_by(id=id).first()
         return self._mapear_modelo_a_entidad(registro) if registro else None
@@ -0,0 +1,83 @@
+from typing import Callable, Iterator, Optional
+
+from fastapi.requests import HTTPConnection
+from sqlalchemy.orm import Session
+
+from app.infrastructure.db.database import SessionLocal, engine, engine_replica
+from app.infrastructure.db.enrutado_lectura import (
+    hay_replica,
+    leer_de_replica,
+    monitor_replica,
+    registro_escrituras,
+)
+
+
+class UnidadDeTrabajo:
+    """
+    Una sesión y una transacción para todo lo que hace una petición.
+
+    Todos los repositorios de la petición comparten la sesión; sus commit() solo
+    vuelcan los cambios (ver SesionUnidadTrabajo) y la transacción se confirma una
+    vez al salir sin errores. Si hay una excepción se revierte entera.
+    """
+
+    def __init__(self, session_factory: Callable[[], Session] = SessionLocal, usuario: Optional[str] = None):
+        self._session_factory = session_factory
+        self.usuario = usuario
+        self.session: Optional[Session] = None
+
+    def __enter__(self) -> "UnidadDeTrabajo":
+        self.session = self._session_factory()
+        self.session.info["unidad_trabajo"] = True
+        return self
+
+    def __exit__(self, tipo_exc, exc, tb) -> None:
+        try:
+            if exc is None:
+                self.confirmar()
+            else:
+                self.session.rollback()
+        finally:
+            self.session.close()
+
+    def confirmar(self) -> None:
+        if not self.session.in_transaction():
+            return
+        confirmar = getattr(self.session, "confirmar", None)
+        if confirmar is not None:
+            confirmar()
+        else:
+            self.session.commit()
+        if self.usuario and self.session.info.pop("escrituras", False):
+            # Sus siguientes lecturas van al primario (read-your-writes)
+            registro_escrituras.anotar(self.usuario)
+
+
+def usuario_peticion(conexion: HTTPConnection) -> Optional[str]:
+    """Usuario que get_current_user dejó en request.state (None con API key o sin token)"""
+    return getattr(conexion.state, "usuario", None)
+
+
+def get_db(conexion: HTTPConnection) -> Iterator[Session]:
+    """
+    Dependencia de sesión por petición. Se declara con Depends(get_db, scope="function")
+    para que la transacción se confirme al terminar el endpoint, antes de enviar la
+    respuesta (un error al confirmar llega al cliente como error, no como un 200).
+    """
+    with UnidadDeTrabajo(usuario=usuario_peticion(conexion)) as unidad:
+        yield unidad.session
+
+
+def get_db_lectura(conexion: HTTPConnection) -> Iterator[Session]:
+    """
+    Sesión de solo lectura para informes y listados: usa la réplica si está configurada,
+    al día y el usuario no acaba de escribir; si no, el primario. No confirma nada.
+    """
+    if hay_replica() and monitor_replica.vencido():
+        monitor_replica.medir()
+    destino = engine_replica if leer_de_replica(usuario_peticion(conexion)) else engine
+    session = SessionLocal(bind=destino)
+    try:
+        yield session
+    finally:
+        session.close()
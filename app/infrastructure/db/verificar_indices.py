@@ -0,0 +1,51 @@
+"""
+Comprueba que la base de datos configurada (DATABASE_URL) está al día:
+
+- la revisión aplicada de Alembic es la última de migrations/versions;
+- existen los índices de INDICES_REQUERIDOS con sus columnas.
+
+Uso: python -m app.infrastructure.db.verificar_indices
+Devuelve código de salida 1 si encuentra diferencias.
+"""
+import os
+import sys
+from typing import List, Optional
+
+from sqlalchemy import inspect
+
+from app.infrastructure.db.database import engine
+from app.infrastructure.db.indices import INDICES_REQUERIDOS, comprobar_indices
+
+_RAIZ = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+
+def comprobar_revision(conexion) -> List[str]:
+    from alembic.config import Config
+    from alembic.runtime.migration import MigrationContext
+    from alembic.script import ScriptDirectory
+
+    config = Config(os.path.join(_RAIZ, "alembic.ini"))
+    config.set_main_option("script_location", os.path.join(_RAIZ, "migrations"))
+    cabeza: Optional[str] = ScriptDirectory.from_config(config).get_current_head()
+    actual = MigrationContext.configure(conexion).get_current_revision()
+    if actual != cabeza:
+        return [f"alembic: revisión aplicada {actual or 'ninguna'}, la última es {cabeza} (alembic upgrade head)"]
+    return []
+
+
+def main() -> int:
+    with engine.connect() as conexion:
+        problemas = comprobar_revision(conexion)
+        problemas += comprobar_indices(inspect(conexion), conexion.dialect.name)
+
+    if problemas:
+        print(f"{len(problemas)} diferencias con el esquema esperado:")
+        for problema in problemas:
+            print(f"  - {problema}")
+        return 1
+    print(f"Esquema al día: revisión de Alembic actual y {len(INDICES_REQUERIDOS)} índices comprobados")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,221 @@
+import json
+import logging
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.application.use_cases.cliente_proceso.generar_calendarios_lote import generar_calendarios_lote
+from app.infrastructure.db.compartido.festivos import calendario_laboral
+from app.infrastructure.db.database import SessionLocal
+from app.infrastructure.db.models.trabajo_calendario_lote_model import TrabajoCalendarioLoteModel
+from app.infrastructure.db.repositories.cliente_proceso_repository_sql import ClienteProcesoRepositorySQL
+from app.infrastructure.db.repositories.proceso_repository_sql import ProcesoRepositorySQL
+from app.infrastructure.db.repositories.proceso_hito_maestro_repository_sql import ProcesoHitoMaestroRepositorySQL
+from app.infrastructure.db.repositories.cliente_proceso_hito_repository_sql import ClienteProcesoHitoRepositorySQL
+from app.infrastructure.db.repositories.cliente_repository_sql import ClienteRepositorySQL
+
+logger = logging.getLogger(__name__)
+
+# Errores que se conservan por trabajo (el resto solo se cuenta)
+_MAX_ERRORES_DETALLE = 200
+
+# Estados de un trabajo que no ha terminado
+_ESTADOS_ACTIVOS = ("pendiente", "en_curso")
+
+
+class TrabajoGeneracionCalendario:
+    """Estado y progreso de una generación de calendarios por lotes"""
+
+    def __init__(self, total: int, origen: Dict[str, Any], id: Optional[str] = None):
+        self.id = id or uuid.uuid4().hex
+        self.estado = "pendiente"
+        self.origen = origen
+        self.total = total
+        self.procesados = 0
+        self.cliente_procesos = 0
+        self.hitos = 0
+        self.num_errores = 0
+        self.errores: List[Dict[str, Any]] = []
+        self.creado = datetime.utcnow()
+        self.iniciado: Optional[datetime] = None
+        self.finalizado: Optional[datetime] = None
+
+    def registrar_errores(self, errores: List[Dict[str, Any]]):
+        self.num_errores += len(errores)
+        hueco = _MAX_ERRORES_DETALLE - len(self.errores)
+        if hueco > 0:
+            self.errores.extend(errores[:hueco])
+
+    def columnas(self) -> Dict[str, Any]:
+        """Valores de la fila de trabajo_calendario_lote (sin actualizado)"""
+        return {
+            "id": self.id,
+            "estado": self.estado,
+            "origen": json.dumps(self.origen),
+            "total": self.total,
+            "procesados": self.procesados,
+            "cliente_procesos": self.cliente_procesos,
+            "hitos": self.hitos,
+            "num_errores": self.num_errores,
+            "errores": json.dumps(self.errores),
+            "creado": self.creado,
+            "iniciado": self.iniciado,
+            "finalizado": self.finalizado,
+        }
+
+    @classmethod
+    def desde_fila(cls, fila) -> "TrabajoGeneracionCalendario":
+        trabajo = cls(fila.total, json.loads(fila.origen), id=fila.id)
+        trabajo.estado = fila.estado
+        trabajo.procesados = fila.procesados
+        trabajo.cliente_procesos = fila.cliente_procesos
+        trabajo.hitos = fila.hitos
+        trabajo.num_errores = fila.num_errores
+        trabajo.errores = json.loads(fila.errores)
+        trabajo.creado = fila.creado
+        trabajo.iniciado = fila.iniciado
+        trabajo.finalizado = fila.finalizado
+        return trabajo
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "estado": self.estado,
+            "origen": self.origen,
+            "total": self.total,
+            "procesados": self.procesados,
+            "porcentaje": round(self.procesados * 100.0 / self.total, 2) if self.total else 100.0,
+            "cliente_procesos": self.cliente_procesos,
+            "hitos": self.hitos,
+            "num_errores": self.num_errores,
+            "errores": self.errores,
+            "creado": self.creado.isoformat(),
+            "iniciado": self.iniciado.isoformat() if self.iniciado else None,
+            "finalizado": self.finalizado.isoformat() if self.finalizado else None,
+        }
+
+
+class RegistroTrabajos:
+    """
+    Registro de los trabajos en la tabla trabajo_calendario_lote, para consultar su
+    progreso desde cualquier worker.
+
+    - El worker que ejecuta el trabajo lo guarda al crearlo y tras cada bloque, con su
+      propia sesión (independiente de la transacción del bloque).
+    - Un trabajo pendiente o en curso sin guardar en interrumpido_segundos se devuelve
+      como "interrumpido": el worker que lo ejecutaba se ha parado o reiniciado.
+    - Al crear uno se borran los creados hace más de retencion_dias.
+    """
+
+    def __init__(self, session_factory: Callable[[], Session] = SessionLocal,
+                 interrumpido_segundos: int = settings.CALENDARIO_LOTE_INTERRUMPIDO_SECONDS,
+                 retencion_dias: int = 7):
+        self._session_factory = session_factory
+        self.interrumpido_segundos = interrumpido_segundos
+        self.retencion_dias = retencion_dias
+
+    def crear(self, total: int, origen: Dict[str, Any]) -> TrabajoGeneracionCalendario:
+        trabajo = TrabajoGeneracionCalendario(total, origen)
+        session = self._session_factory()
+        try:
+            session.execute(delete(TrabajoCalendarioLoteModel).where(
+                TrabajoCalendarioLoteModel.creado < trabajo.creado - timedelta(days=self.retencion_dias)
+            ))
+            session.execute(insert(TrabajoCalendarioLoteModel).values(
+                **trabajo.columnas(), actualizado=datetime.utcnow()
+            ))
+            session.commit()
+        finally:
+            session.close()
+        return trabajo
+
+    def guardar(self, trabajo: TrabajoGeneracionCalendario):
+        """Guarda el progreso; un fallo aquí se registra pero no detiene el trabajo"""
+        session = self._session_factory()
+        try:
+            session.execute(
+                update(TrabajoCalendarioLoteModel)
+                .where(TrabajoCalendarioLoteModel.id == trabajo.id)
+                .values(**trabajo.columnas(), actualizado=datetime.utcnow())
+            )
+            session.commit()
+        except Exception as e:
+            logger.warning(f"Trabajo {trabajo.id}: no se pudo guardar el progreso: {e}")
+        finally:
+            session.close()
+
+    def obtener(self, trabajo_id: str) -> Optional[TrabajoGeneracionCalendario]:
+        session = self._session_factory()
+        try:
+            fila = session.execute(
+                select(TrabajoCalendarioLoteModel).where(TrabajoCalendarioLoteModel.id == trabajo_id)
+            ).scalar_one_or_none()
+            if fila is None:
+                return None
+            trabajo = TrabajoGeneracionCalendario.desde_fila(fila)
+            limite = datetime.utcnow() - timedelta(seconds=self.interrumpido_segundos)
+            if trabajo.estado in _ESTADOS_ACTIVOS and fila.actualizado < limite:
+                trabajo.estado = "interrumpido"
+            return trabajo
+        finally:
+            session.close()
+
+
+registro_trabajos = RegistroTrabajos()
+
+
+def ejecutar_generacion_lote(trabajo: TrabajoGeneracionCalendario, solicitudes: list):
+    """
+    Ejecuta el trabajo en bloques de CALENDARIO_LOTE_TAMANO solicitudes, un commit por bloque.
+
+    Usa su propia sesión (la de la petición ya está cerrada). Si un bloque falla en base de
+    datos se revierte solo ese bloque, se anotan sus solicitudes como error y se continúa.
+    """
+    tamano = max(1, settings.CALENDARIO_LOTE_TAMANO)
+    trabajo.estado = "en_curso"
+    trabajo.iniciado = datetime.utcnow()
+    registro_trabajos.guardar(trabajo)
+
+    session = SessionLocal()
+    try:
+        repo = ClienteProcesoRepositorySQL(session)
+        proceso_repo = ProcesoRepositorySQL(session)
+        repo_hito_maestro = ProcesoHitoMaestroRepositorySQL(session)
+        repo_hito_cliente = ClienteProcesoHitoRepositorySQL(session)
+        repo_cliente = ClienteRepositorySQL(session)
+        planes: dict = {}  # proceso_id -> PlanCalendario, compartido entre bloques
+        regiones: dict = {}  # cliente_id -> provincia
+
+        for inicio in range(0, len(solicitudes), tamano):
+            bloque = solicitudes[inicio:inicio + tamano]
+            try:
+                resultado = generar_calendarios_lote(
+                    bloque, planes, repo, proceso_repo, repo_hito_maestro, repo_hito_cliente,
+                    repo_cliente, calendario_laboral, regiones
+                )
+                trabajo.cliente_procesos += resultado["cliente_procesos"]
+                trabajo.hitos += resultado["hitos"]
+                trabajo.registrar_errores(resultado["errores"])
+            except Exception as e:
+                session.rollback()
+                logger.error(f"Trabajo {trabajo.id}: error en el bloque {inicio}-{inicio + len(bloque)}: {e}")
+                trabajo.registrar_errores([
+                    {"cliente_id": s.cliente_id, "proceso_id": s.proceso_id, "error": str(e)}
+                    for s in bloque
+                ])
+            trabajo.procesados += len(bloque)
+            registro_trabajos.guardar(trabajo)
+
+        trabajo.estado = "completado"
+    except Exception as e:
+        logger.error(f"Trabajo {trabajo.id} interrumpido: {e}")
+        trabajo.estado = "error"
+        trabajo.registrar_errores([{"cliente_id": None, "proceso_id": None, "error": str(e)}])
+    finally:
+        trabajo.finalizado = datetime.utcnow()
+        session.close()
+        registro_trabajos.guardar(trabajo)
@@ -0,0 +1,49 @@
+import asyncio
+import logging
+
+from fastapi import FastAPI
+from starlette.concurrency import run_in_threadpool
+
+from app.config import settings
+from app.infrastructure.db.database import SessionLocal
+from app.infrastructure.db.repositories.kpi_hito_diario_repository_sql import KpiHitoDiarioRepositorySQL
+
+logger = logging.getLogger(__name__)
+
+
+def refrescar_kpi_hitos() -> int:
+    """Ejecuta un ciclo de refresco incremental de kpi_hito_diario"""
+    session = SessionLocal()
+    try:
+        return KpiHitoDiarioRepositorySQL(session).refrescar()
+    finally:
+        session.close()
+
+
+def configurar_refresco_kpi(app: FastAPI):
+    """Lanza en segundo plano el refresco periódico del agregado diario de hitos"""
+    intervalo = settings.KPI_REFRESH_SECONDS
+    if intervalo <= 0:
+        logger.info("Refresco de kpi_hito_diario desactivado (KPI_REFRESH_SECONDS <= 0)")
+        return
+
+    async def _bucle():
+        while True:
+            try:
+                claves = await run_in_threadpool(refrescar_kpi_hitos)
+                if claves >= 0:
+                    logger.info(f"kpi_hito_diario refrescado: {claves} claves recalculadas")
+            except Exception as e:
+                logger.error(f"Error refrescando kpi_hito_diario: {e}")
+            await asyncio.sleep(intervalo)
+
+    async def _iniciar():
+        app.state.refresco_kpi_task = asyncio.create_task(_bucle())
+
+    async def _detener():
+        tarea = getattr(app.state, "refresco_kpi_task", None)
+        if tarea:
+            tarea.cancel()
+
+    app.router.add_event_handler("startup", _iniciar)
+    app.router.add_event_handler("shutdown", _detener)
@@ -2,11 +2,11 @@ import os
 from fastapi import Header, HTTPException, Depends, Request
 from typing import Optional
 from sqlalchemy.orm import Session
-from app.infrastructure.db.database import get_db
+from app.infrastructure.db.unidad_trabajo import get_db
 from app.infrastructure.services.cliente_api_service_impl import ClienteAPIServiceImpl
 from app.config import settings
 
-def verificar_api_key(request: Request, db: Session = Depends(get_db)):
+def verificar_api_key(request: Request, db: Session = Depends(get_db, scope="function")):
     if request.method == "OPTIONS":        
         return
 
@@ -4,7 +4,7 @@ from sqlalchemy.orm import Session
 from datetime import timedelta
 from jose import JWTError, jwt
 
-from app.infrastructure.db.database import SessionLocal
+from app.infrastructure.db.unidad_trabajo import get_db
 from app.infrastructure.db.repositories.sql_api_cliente_repository import SqlApiClienteRepository
 from app.interfaces.api.security.auth import create_access_token, verify_password,create_refresh_token
 from app.config import settings
@@ -16,17 +16,10 @@ from app.infrastructure.services.user_mapping_service_impl import UserMappingSer
 router = APIRouter()
 
 # Dependency para obtener sesión de base de datos
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
 @router.post("/token", summary="Login de cliente API y emisión de JWT")
 def login_for_access_token(
     form_data: OAuth2PasswordRequestForm = Depends(),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db, scope="function")
 ):
     repo = SqlApiClienteRepository(db)
     cliente = repo.get_by_nombre(form_data.username)
@@ -93,7 +86,7 @@ def sso_login():
 @router.get("/sso/callback", summary="Callback del SSO que devuelve el JWT")
 def sso_callback(
     code: str = Query(..., description="Código de autorización de Azure AD"),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db, scope="function")
 ):
     """
     Endpoint de callback para completar la autenticación SSO.
@@ -0,0 +1,149 @@
+import base64
+import hashlib
+import hmac
+import json
+from datetime import date, datetime, time
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Tuple
+
+from fastapi import HTTPException, Query, Request
+from app.config import settings
+from app.domain.repositories.consulta_listado import ConsultaListado
+
+# Query params de paginación y orden; el resto se interpreta como filtros
+_PARAMETROS_LISTADO = {"page", "limit", "sort_field", "sort_direction", "cursor"}
+
+# Tamaño de página por defecto en paginación por cursor
+LIMITE_CURSOR_DEFECTO = 50
+
+
+def _b64(datos: bytes) -> str:
+    return base64.urlsafe_b64encode(datos).rstrip(b"=").decode("ascii")
+
+
+def _b64_decode(texto: str) -> bytes:
+    return base64.urlsafe_b64decode(texto + "=" * (-len(texto) % 4))
+
+
+def _firma(datos: bytes) -> bytes:
+    return hmac.new(settings.SECRET_KEY.encode(), datos, hashlib.sha256).digest()[:16]
+
+
+def _serializable(valor: Any) -> Any:
+    if isinstance(valor, (date, datetime, time)):
+        return valor.isoformat()
+    if isinstance(valor, Decimal):
+        return str(valor)
+    return valor
+
+
+def codificar_cursor(consulta: ConsultaListado, clave: Optional[Tuple[Any, Any]]) -> Optional[str]:
+    """
+    Cursor opaco para la página siguiente: campo y dirección de orden más la clave
+    (valor de orden, id) del último elemento, firmado con HMAC (SECRET_KEY) para que
+    el cliente no pueda fabricarlo ni alterarlo.
+    """
+    if clave is None:
+        return None
+    datos = json.dumps(
+        {"f": consulta.sort_field, "d": consulta.sort_direction, "v": _serializable(clave[0]), "id": clave[1]},
+        separators=(",", ":")
+    ).encode()
+    return f"{_b64(datos)}.{_b64(_firma(datos))}"
+
+
+def decodificar_cursor(cursor: str) -> Dict[str, Any]:
+    """Lanza ValueError si el cursor está mal formado o la firma no coincide"""
+    try:
+        cuerpo, firma = cursor.split(".", 1)
+        datos = _b64_decode(cuerpo)
+        if not hmac.compare_digest(_b64_decode(firma), _firma(datos)):
+            raise ValueError("firma")
+        return json.loads(datos)
+    except Exception:
+        raise ValueError("Cursor no válido")
+
+
+def _construir_consulta(request: Request, page, limit, sort_field, sort_direction, valor_cursor) -> ConsultaListado:
+    filtros = {k: v for k, v in request.query_params.items() if k not in _PARAMETROS_LISTADO}
+    if valor_cursor is None:
+        return ConsultaListado(page, limit, sort_field, sort_direction, filtros)
+
+    despues_de = None
+    if valor_cursor:
+        try:
+            datos = decodificar_cursor(valor_cursor)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        campo_pedido = request.query_params.get("sort_field")
+        direccion_pedida = request.query_params.get("sort_direction")
+        if (campo_pedido is not None and campo_pedido != datos["f"]) or \
+                (direccion_pedida is not None and direccion_pedida != datos["d"]):
+            raise HTTPException(status_code=400, detail="El cursor no corresponde a la ordenación pedida")
+        sort_field, sort_direction = datos["f"], datos["d"]
+        despues_de = (datos["v"], datos["id"])
+
+    return ConsultaListado(None, limit or LIMITE_CURSOR_DEFECTO, sort_field, sort_direction, filtros,
+                           por_cursor=True, despues_de=despues_de)
+
+
+def parametros_listado(direccion_defecto: str = "asc", cursor: bool = False):
+    """
+    Dependencia que construye la ConsultaListado de un endpoint de listado.
+
+    Mantiene los parámetros page/limit/sort_field/sort_direction de siempre y pasa los
+    demás query params como filtros (?provincia=MADRID); cada repositorio ignora los
+    campos que no admite.
+
+    Con cursor=True el endpoint admite además paginación por cursor: se pide la primera
+    página con `cursor` vacío y las siguientes con el next_cursor recibido. El cursor
+    fija el orden, así que sort_field/sort_direction deben coincidir o omitirse.
+    """
+    if not cursor:
+        def dependencia(
+            request: Request,
+            page: Optional[int] = Query(None, ge=1, description="Página actual"),
+            limit: Optional[int] = Query(None, ge=1, le=100, description="Cantidad de resultados por página"),
+            sort_field: Optional[str] = Query(None, description="Campo por el cual ordenar"),
+            sort_direction: Optional[str] = Query(direccion_defecto, pattern="^(asc|desc)$", description="Dirección de ordenación: asc o desc"),
+        ) -> ConsultaListado:
+            return _construir_consulta(request, page, limit, sort_field, sort_direction, None)
+        return dependencia
+
+    def dependencia_cursor(
+        request: Request,
+        page: Optional[int] = Query(None, ge=1, description="Página actual"),
+        limit: Optional[int] = Query(None, ge=1, le=100, description="Cantidad de resultados por página"),
+        sort_field: Optional[str] = Query(None, description="Campo por el cual ordenar"),
+        sort_direction: Optional[str] = Query(direccion_defecto, pattern="^(asc|desc)$", description="Dirección de ordenación: asc o desc"),
+        cursor: Optional[str] = Query(None, description="Paginación por cursor: vacío para la primera página, después el next_cursor recibido"),
+    ) -> ConsultaListado:
+        return _construir_consulta(request, page, limit, sort_field, sort_direction, cursor)
+    return dependencia_cursor
+
+
+def parametros_cursor(direccion_defecto: str = "asc"):
+    """
+    Como parametros_listado(cursor=True) para colecciones sin paginación por offset:
+    sin `cursor` la ConsultaListado no es por_cursor y el endpoint mantiene su respuesta
+    de siempre.
+    """
+    def dependencia(
+        request: Request,
+        limit: Optional[int] = Query(None, ge=1, le=100, description="Cantidad de resultados por página (paginación por cursor)"),
+        sort_field: Optional[str] = Query(None, description="Campo por el cual ordenar (paginación por cursor)"),
+        sort_direction: Optional[str] = Query(direccion_defecto, pattern="^(asc|desc)$", description="Dirección de ordenación: asc o desc"),
+        cursor: Optional[str] = Query(None, description="Paginación por cursor: vacío para la primera página, después el next_cursor recibido"),
+    ) -> ConsultaListado:
+        return _construir_consulta(request, None, limit, sort_field, sort_direction, cursor)
+    return dependencia
+
+
+def respuesta_cursor(clave: str, elementos: List[Any], consulta: ConsultaListado,
+                     siguiente: Optional[Tuple[Any, Any]]) -> Dict[str, Any]:
+    """Cuerpo común de una página por cursor: elementos, next_cursor (None en la última) y limit"""
+    return {
+        clave: elementos,
+        "next_cursor": codificar_cursor(consulta, siguiente),
+        "limit": consulta.limit,
+    }
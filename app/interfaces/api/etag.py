@@ -0,0 +1,57 @@
+import hashlib
+import time
+from typing import Callable, Optional
+
+from fastapi import HTTPException, Request, Response
+
+from app.infrastructure.db.compartido.catalogo_cache import versiones
+from app.infrastructure.db.database import engine
+
+# Políticas de Cache-Control para los endpoints de catálogo
+REVALIDAR = "private, no-cache"
+
+
+def _coincide(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # Comparación débil (RFC 9110 13.1.2): W/"x" y "x" son la misma representación
+    etiquetas = (parte.strip() for parte in if_none_match.split(","))
+    return any(etiqueta.removeprefix("W/") == etag for etiqueta in etiquetas)
+
+
+def etag_catalogo(
+    *tablas: str,
+    cache_control: str = REVALIDAR,
+    caducidad_segundos: Optional[int] = None,
+) -> Callable[[Request, Response], None]:
+    """
+    Dependencia de GET condicional para endpoints que solo leen las tablas indicadas.
+
+    El ETag combina la ruta con su query string y la versión de cada tabla en
+    catalogo_version, leída en cada petición (una consulta a una tabla de una fila por
+    catálogo): un 304 nunca confirma datos que otro worker ya ha modificado. Si la
+    versión ha cambiado se vacía también la caché de catálogo del worker antes de que
+    el endpoint lea. Si coincide con If-None-Match responde 304 sin ejecutar el
+    endpoint. Con caducidad_segundos el ETag cambia además cada ese tiempo, para tablas
+    que se modifican fuera de la aplicación.
+
+    Declararla en dependencies=[...] del decorador, para que se resuelva antes que el
+    repositorio.
+    """
+
+    def dependencia(request: Request, response: Response) -> None:
+        actuales = versiones.actuales(engine, tablas, releer=True)
+        if actuales is None:
+            # Sin versiones no hay ETag fiable: respuesta normal, sin caché
+            return
+        periodo = int(time.time() // caducidad_segundos) if caducidad_segundos else None
+        clave = f"{request.url.path}?{request.url.query}|{actuales}|{periodo}"
+        etag = '"' + hashlib.sha256(clave.encode()).hexdigest()[:32] + '"'
+        cabeceras = {"ETag": etag, "Cache-Control": cache_control}
+        if _coincide(request.headers.get("if-none-match"), etag):
+            raise HTTPException(status_code=304, headers=cabeceras)
+        response.headers.update(cabeceras)
+
+    return dependencia
@@ -4,7 +4,7 @@ import re
 
 from jose import JWTError, jwt
 from passlib.context import CryptContext
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
 from app.config import settings
 
@@ -39,7 +39,7 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
 
 
 # Dependencia para obtener usuario autenticado (desde el token)
-def get_current_user(token: str = Depends(oauth2_scheme)) -> dict:
+def get_current_user(request: Request, token: str = Depends(oauth2_scheme)) -> dict:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Token inválido o expirado",
@@ -50,6 +50,8 @@ def get_current_user(token: str = Depends(oauth2_scheme)) -> dict:
         username: str = payload.get("sub")
         if username is None:
             raise credentials_exception
+        # Clave de read-your-writes para las sesiones de la petición (ver unidad_trabajo)
+        request.state.usuario = username
         return {
                 "username": payload.get("username", username),  # Prioriza el username explícito del SSO
                 "email": payload.get("email"),
@@ -1,29 +1,21 @@
 import secrets
 from fastapi import APIRouter, Depends, HTTPException, Body, Path
 from sqlalchemy.orm import Session
-from app.infrastructure.db.database import SessionLocal
+from app.infrastructure.db.unidad_trabajo import get_db
 from app.infrastructure.db.models.api_cliente_model import ApiClienteModel
 from app.interfaces.api.api_key_guard import verificar_admin_key
 from app.interfaces.api.security.auth import hash_password, validar_password_criterios
 from app.interfaces.schemas.cliente_api import CrearClienteAPIRequest, CambiarEstadoClienteRequest, AsociarClientesRequest, ValidarPasswordRequest
 from app.application.use_cases.api_clientes.asociar_clientes_api_cliente import AsociarClientesApiCliente
 from app.infrastructure.db.repositories.api_cliente_cliente_repository_sql import SqlApiClienteClienteRepository
-from app.infrastructure.db.database import get_db
 
 
 router = APIRouter()
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
 @router.get("/admin/api-clientes", tags=["Admin API"], dependencies=[Depends(verificar_admin_key)],
     summary="Listar todos los clientes API",
     description="Devuelve todos los registros de clientes API y sus claves.")
-def listar_clientes(db: Session = Depends(get_db)):
+def listar_clientes(db: Session = Depends(get_db, scope="function")):
     return db.query(ApiClienteModel).all()
 
 
@@ -33,7 +25,7 @@ def listar_clientes(db: Session = Depends(get_db)):
     description="Crea un nuevo cliente API con una clave secreta autogenerada o proporcionada.")
 def crear_cliente(
     data: CrearClienteAPIRequest,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db, scope="function")
 ):
     # Si se proporciona una contraseña, la usamos directamente (sin validar)
     if data.password:
@@ -68,7 +60,7 @@ def crear_cliente(
 def cambiar_estado(
     data: CambiarEstadoClienteRequest,
     id: int = Path(..., description="ID del cliente API"),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db, scope="function")
 
 ):
     cliente = db.query(ApiClienteModel).filter_by(id=id).first()
@@ -87,7 +79,7 @@ def cambiar_estado(
 def asociar_clientes_api_cliente(
     api_cliente_id: int,
     payload: AsociarClientesRequest,
-    db=Depends(get_db)
+    db=Depends(get_db, scope="function")
 ):
     repo = SqlApiClienteClienteRepository(db)
     use_case = AsociarClientesApiCliente(repo)
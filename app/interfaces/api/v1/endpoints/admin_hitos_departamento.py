@@ -1,57 +1,129 @@
-from typing import Optional
-from fastapi import APIRouter, Depends, Query, Body, HTTPException, Path
+import csv
+import io
+import json
+from datetime import date
+from typing import Any, Dict, Iterator, List, Optional
+from fastapi import APIRouter, Depends, Query, Body, HTTPException, Path, Request
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.infrastructure.db.database import SessionLocal
+from app.infrastructure.db.database import SessionLocal, engine, engine_replica
+from app.infrastructure.db.unidad_trabajo import get_db, usuario_peticion
+from app.infrastructure.db.enrutado_lectura import leer_de_replica
+from app.infrastructure.db.database_async import get_async_db_lectura
+from app.infrastructure.db.compartido.festivos import calendario_laboral
 from app.infrastructure.db.repositories.admin_hitos_departamento_repository_sql import (
     AdminHitosDepartamentoRepositorySQL,
 )
+from app.infrastructure.db.repositories.admin_hitos_departamento_repository_async import (
+    AdminHitosDepartamentoRepositoryAsync,
+)
 
 
 router = APIRouter(prefix="/admin-hitos", tags=["AdminHitosDepartamento"])
 
 
-def get_db():
-    db = SessionLocal()
+def get_repo(db: Session = Depends(get_db, scope="function")):
+    return AdminHitosDepartamentoRepositorySQL(db)
+
+
+def get_repo_async(db: AsyncSession = Depends(get_async_db_lectura)):
+    return AdminHitosDepartamentoRepositoryAsync(db)
+
+
+# Filas leídas de BD por cada trozo enviado en la exportación
+TAM_LOTE_EXPORTACION = 1000
+
+
+def _valor_exportable(valor: Any) -> Any:
+    if hasattr(valor, "isoformat"):
+        return valor.isoformat()
+    return valor
+
+
+def _lineas_ndjson(lote: List[Dict[str, Any]]) -> str:
+    return "".join(
+        json.dumps({k: _valor_exportable(v) for k, v in fila.items()}, ensure_ascii=False) + "\n"
+        for fila in lote
+    )
+
+
+def _lineas_csv(lote: List[Dict[str, Any]], cabecera: bool) -> str:
+    salida = io.StringIO()
+    writer = csv.writer(salida)
+    if cabecera:
+        writer.writerow(lote[0].keys())
+    writer.writerows([_valor_exportable(v) for v in fila.values()] for fila in lote)
+    return salida.getvalue()
+
+
+def exportar_hitos_departamentos(
+    formato: str, mes: Optional[int], anio: Optional[int], cod_subdepar: Optional[str], replica: bool = False
+) -> Iterator[str]:
+    """
+    Genera la exportación por trozos. Abre su propia sesión porque se consume mientras
+    se envía la respuesta; StreamingResponse la itera en el threadpool.
+    """
+    db = SessionLocal(bind=engine_replica if replica else engine)
     try:
-        yield db
+        repo = AdminHitosDepartamentoRepositorySQL(db)
+        primero = True
+        for lote in repo.iterar_hitos_departamentos(mes, anio, cod_subdepar, TAM_LOTE_EXPORTACION):
+            if not lote:
+                continue
+            yield _lineas_csv(lote, primero) if formato == "csv" else _lineas_ndjson(lote)
+            primero = False
     finally:
         db.close()
 
 
-def get_repo(db: Session = Depends(get_db)):
-    return AdminHitosDepartamentoRepositorySQL(db)
-
-
 @router.get(
     "/departamentos-hitos",
     summary="Listar hitos por departamentos",
     description=(
         "Dos modos: (1) Anidado por departamento/proceso (por defecto). "
         "(2) Plano y paginado cuando flat=1, devolviendo items + quedan + next_cursor. "
+        "(3) Exportación completa en streaming cuando formato=ndjson o formato=csv (filas planas, "
+        "ordenadas por cliente_proceso_hito_id). "
+        "En modo plano, 'conteo' elige cómo se calcula quedan: exacto (en la misma consulta), "
+        "cache (exacto en la primera página y restando en las siguientes), estimado o ninguno. "
         "Incluye proceso, cliente (id, nombre, cif), estado, fecha_limite, hora_limite, tipo y habilitado (0/1)."
     ),
 )
-def listar_hitos_departamentos(
+async def listar_hitos_departamentos(
+    request: Request,
     mes: Optional[int] = Query(None, ge=1, le=12, description="Mes (1-12) de fecha límite"),
     anio: Optional[int] = Query(None, ge=2000, le=2100, description="Año de fecha límite"),
     cod_subdepar: Optional[str] = Query(None, description="Filtrar por código de subdepartamento"),
     flat: bool = Query(False, description="Si es 1/true devuelve resultado plano y paginado"),
     limit: Optional[int] = Query(1000, ge=1, le=5000, description="Tamaño de página en modo flat"),
     cursor: Optional[int] = Query(None, ge=0, description="Cursor (cliente_proceso_hito_id) para paginación flat"),
-    repo = Depends(get_repo),
+    conteo: str = Query("exacto", pattern="^(exacto|cache|estimado|ninguno)$", description="Cálculo de 'quedan' en modo flat"),
+    formato: Optional[str] = Query(None, pattern="^(ndjson|csv)$", description="Exportar en streaming como ndjson o csv"),
+    repo = Depends(get_repo_async),
 ):
+    if formato:
+        media_type = "text/csv; charset=utf-8" if formato == "csv" else "application/x-ndjson"
+        # get_repo_async ya ha medido el retraso de la réplica para esta petición
+        replica = leer_de_replica(usuario_peticion(request))
+        return StreamingResponse(
+            exportar_hitos_departamentos(formato, mes, anio, cod_subdepar, replica),
+            media_type=media_type,
+            headers={"Content-Disposition": f'attachment; filename="hitos_departamentos.{formato}"'},
+        )
     if flat:
         # Modo plano y paginado (keyset pagination por cph.id)
-        return repo.listar_hitos_departamentos_flat(
+        return await repo.listar_hitos_departamentos_flat(
             mes=mes,
             anio=anio,
             cod_subdepar=cod_subdepar,
             limit=limit or 1000,
             cursor=cursor,
+            conteo=conteo,
         )
     # Modo anidado original (sin paginación)
-    return repo.listar_hitos_departamentos(mes=mes, anio=anio, cod_subdepar=cod_subdepar)
+    return await repo.listar_hitos_departamentos(mes=mes, anio=anio, cod_subdepar=cod_subdepar)
 
 
 @router.post(
@@ -60,7 +132,9 @@ def listar_hitos_departamentos(
     description=(
         "Actualiza campos del hito a nivel de cliente_proceso_hito. "
         "Permite modificar: estado, fecha_limite, hora_limite y tipo. "
-        "IMPORTANTE: 'tipo' SIEMPRE se obtiene y se modifica en la tabla 'hito' (nunca en cliente_proceso_hito)."
+        "IMPORTANTE: 'tipo' SIEMPRE se obtiene y se modifica en la tabla 'hito' (nunca en cliente_proceso_hito). "
+        "Con ajustar_dia_habil=true, una fecha_limite no laborable (fin de semana o festivo nacional/provincial "
+        "del cliente) se mueve al día laborable anterior."
     ),
 )
 def actualizar_hito_departamento(
@@ -71,6 +145,7 @@ def actualizar_hito_departamento(
         "hora_limite": "13:30:00",
         "tipo": "Atisa"
     }),
+    ajustar_dia_habil: bool = Query(False, description="Mover fecha_limite al día laborable anterior si no lo es"),
     repo = Depends(get_repo),
 ):
     # Filtrar solo campos permitidos
@@ -86,6 +161,14 @@ def actualizar_hito_departamento(
     if not payload:
         raise HTTPException(status_code=400, detail="No hay campos válidos para actualizar")
 
+    if ajustar_dia_habil and payload.get("fecha_limite"):
+        try:
+            fecha = date.fromisoformat(str(payload["fecha_limite"])[:10])
+        except ValueError:
+            raise HTTPException(status_code=400, detail="fecha_limite debe tener formato YYYY-MM-DD")
+        region = repo.obtener_region_hito(cliente_proceso_hito_id)
+        payload["fecha_limite"] = calendario_laboral.dia_habil_anterior(fecha, region)
+
     actualizado = repo.actualizar_hito_departamento(cliente_proceso_hito_id, payload)
     if not actualizado:
         raise HTTPException(status_code=404, detail="Registro no encontrado o sin campos válidos para actualizar")
@@ -1,26 +1,27 @@
 from fastapi import APIRouter, Depends, HTTPException, Body, Path, Query
 from sqlalchemy.orm import Session
-from typing import Optional
+from typing import Optional, Union
 from datetime import datetime
-from app.infrastructure.db.database import SessionLocal
+from app.infrastructure.db.unidad_trabajo import get_db, get_db_lectura
 from app.infrastructure.db.repositories.auditoria_calendarios_repository_sql import AuditoriaCalendariosRepositorySQL
 from app.interfaces.schemas.auditoria_calendarios import (
     AuditoriaCalendariosCreate,
     AuditoriaCalendariosUpdate,
-    AuditoriaCalendariosResponse
+    AuditoriaCalendariosResponse,
+    AuditoriaCalendariosPaginadosResponse,
+    AuditoriaCalendariosCursorResponse
 )
 from app.domain.entities.auditoria_calendarios import AuditoriaCalendarios
+from app.domain.repositories.consulta_listado import ConsultaListado
+from app.interfaces.api.consulta_listado import parametros_listado, respuesta_cursor
 
 router = APIRouter(prefix="/auditoria-calendarios", tags=["AuditoriaCalendarios"])
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+def get_repo(db: Session = Depends(get_db, scope="function")):
+    return AuditoriaCalendariosRepositorySQL(db)
 
-def get_repo(db: Session = Depends(get_db)):
+def get_repo_lectura(db: Session = Depends(get_db_lectura, scope="function")):
+    # Consultas de auditoría: réplica de lectura si está configurada
     return AuditoriaCalendariosRepositorySQL(db)
 
 @router.post("/",
@@ -45,56 +46,19 @@ def crear(data: AuditoriaCalendariosCreate, repo = Depends(get_repo)):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error al crear registro de auditoría: {str(e)}")
 
-@router.get("/", summary="Listar registros de auditoría", description="Devuelve todos los registros de auditoría definidos en el sistema.")
+@router.get("/", response_model=Union[AuditoriaCalendariosPaginadosResponse, AuditoriaCalendariosCursorResponse],
+            summary="Listar registros de auditoría", description="Devuelve todos los registros de auditoría definidos en el sistema.")
 def listar(
-    page: Optional[int] = Query(None, ge=1, description="Página actual"),
-    limit: Optional[int] = Query(None, ge=1, le=100, description="Cantidad de resultados por página"),
-    sort_field: Optional[str] = Query(None, description="Campo por el cual ordenar"),
-    sort_direction: Optional[str] = Query("desc", regex="^(asc|desc)$", description="Dirección de ordenación: asc o desc"),
-    repo = Depends(get_repo)
+    consulta: ConsultaListado = Depends(parametros_listado("desc", cursor=True)),
+    repo = Depends(get_repo_lectura)
 ):
-    auditorias = repo.listar()
-    total = len(auditorias)
-
-    # Aplicar ordenación si se especifica y hay datos para ordenar
-    if sort_field and auditorias and hasattr(auditorias[0], sort_field):
-        reverse = sort_direction == "desc"
-
-        # Función de ordenación que maneja valores None
-        def sort_key(auditoria):
-            value = getattr(auditoria, sort_field, None)
-
-            # Manejo especial para diferentes tipos de campos
-            if sort_field in ["id", "id_hito"]:
-                if value is None:
-                    return -1 if not reverse else float('inf')
-                try:
-                    return int(value)
-                except (ValueError, TypeError):
-                    return -1 if not reverse else float('inf')
-
-            elif sort_field in ["fecha_modificacion", "created_at", "updated_at"]:
-                if value is None:
-                    return -1 if not reverse else float('inf')
-                try:
-                    if hasattr(value, 'timestamp'):
-                        return value.timestamp()
-                    return -1 if not reverse else float('inf')
-                except (ValueError, TypeError):
-                    return -1 if not reverse else float('inf')
-            else:
-                # Para campos de texto
-                if value is None:
-                    return ""
-                return str(value).lower()
-
-        auditorias.sort(key=sort_key, reverse=reverse)
-
-    # Aplicar paginación después de ordenar
-    if page is not None and limit is not None:
-        start = (page - 1) * limit
-        end = start + limit
-        auditorias = auditorias[start:end]
+    try:
+        if consulta.por_cursor:
+            auditorias, siguiente = repo.listar_por_cursor(consulta)
+            return respuesta_cursor("auditoria_calendarios", auditorias, consulta, siguiente)
+        auditorias, total = repo.listar_paginado(consulta)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
     return {
         "total": total,
@@ -106,7 +70,7 @@ def obtener_por_id(id: int = Path(...), repo = Depends(get_repo)):
     return repo.obtener_por_id(id)
 
 @router.get("/hito/{id_hito}", summary="Obtener auditoría de un hito específico", description="Obtiene todos los registros de auditoría de un hito específico")
-def obtener_por_hito(id_hito: int = Path(...), repo = Depends(get_repo)):
+def obtener_por_hito(id_hito: int = Path(...), repo = Depends(get_repo_lectura)):
     return repo.obtener_por_hito(id_hito)
 
 @router.get("/cliente/{cliente_id}", summary="Obtener auditoría de un cliente específico", description="Devuelve todos los registros de auditoría de un cliente específico.")
@@ -116,7 +80,7 @@ def obtener_por_cliente(
     limit: Optional[int] = Query(None, ge=1, le=100, description="Cantidad de resultados por página"),
     sort_field: Optional[str] = Query(None, description="Campo por el cual ordenar"),
     sort_direction: Optional[str] = Query("desc", regex="^(asc|desc)$", description="Dirección de ordenación: asc o desc"),
-    repo = Depends(get_repo)
+    repo = Depends(get_repo_lectura)
 ):
     resultados = repo.obtener_por_cliente(cliente_id)
     total = len(resultados)
@@ -1,57 +1,27 @@
 from fastapi import APIRouter, Depends, HTTPException, Path, Query
 from sqlalchemy.orm import Session
 from typing import Optional
-from app.infrastructure.db.database import SessionLocal
+from app.infrastructure.db.unidad_trabajo import get_db
 from app.infrastructure.db.repositories.cliente_repository_sql import ClienteRepositorySQL
+from app.infrastructure.db.compartido.clientes_scope import invalidar_clientes_empleado
+from app.domain.repositories.consulta_listado import ConsultaListado
+from app.interfaces.api.consulta_listado import parametros_listado
+from app.interfaces.schemas.cliente import ClientesPaginadosResponse
 
 router = APIRouter(prefix="/clientes", tags=["Cliente"])
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-def get_repo(db: Session = Depends(get_db)):
+def get_repo(db: Session = Depends(get_db, scope="function")):
     return ClienteRepositorySQL(db)
-@router.get("/", summary="Listar clientes",
+@router.get("/", response_model=ClientesPaginadosResponse, summary="Listar clientes",
     description="Devuelve la lista completa de clientes registrados en el sistema.")
 def obtener_todos(
-    page: Optional[int] = Query(None, ge=1, description="Página actual"),
-    limit: Optional[int] = Query(None, ge=1, le=100, description="Cantidad de resultados por página"),
-    sort_field: Optional[str] = Query(None, description="Campo por el cual ordenar"),
-    sort_direction: Optional[str] = Query("asc", regex="^(asc|desc)$", description="Dirección de ordenación: asc o desc"),
+    consulta: ConsultaListado = Depends(parametros_listado()),
     repo = Depends(get_repo)
 ):
-    clientes = repo.listar()
-    total = len(clientes)
-
-    # Aplicar ordenación si se especifica
-    if sort_field and hasattr(clientes[0] if clientes else None, sort_field):
-        reverse = sort_direction == "desc"
-
-        # Función de ordenación que maneja valores None
-        def sort_key(cliente):
-            value = getattr(cliente, sort_field, None)
-            if value is None:
-                return ""  # Los valores None van al final
-            # Si es numérico (como idcliente), convertir a número para ordenación correcta
-            if sort_field == "idcliente":
-                try:
-                    return int(value)
-                except (ValueError, TypeError):
-                    return 0
-            # Para campos de texto, convertir a minúsculas para ordenación insensible a mayúsculas
-            return str(value).lower()
-
-        clientes.sort(key=sort_key, reverse=reverse)
-
-    # Aplicar paginación después de ordenar
-    if page is not None and limit is not None:
-        start = (page - 1) * limit
-        end = start + limit
-        clientes = clientes[start:end]
+    try:
+        clientes, total = repo.listar_paginado(consulta)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
     if not clientes:
         raise HTTPException(status_code=404, detail="No se encontraron clientes")
@@ -83,6 +53,14 @@ def buscar_cif(
         raise HTTPException(status_code=404, detail="Cliente no encontrado")
     return cliente
 
+@router.delete("/alcance-empleado/cache", summary="Invalidar caché de clientes por empleado",
+    description="Descarta el conjunto de clientes cacheado para un empleado (o para todos si no se indica email).")
+def invalidar_alcance_empleado(
+    email: Optional[str] = Query(None, description="Email del empleado; si se omite se invalida toda la caché")
+):
+    eliminadas = invalidar_clientes_empleado(email)
+    return {"mensaje": "Caché invalidada", "entradas_eliminadas": eliminadas}
+
 @router.get("/{id}", summary="Obtener cliente por ID",
     description="Devuelve la información de un cliente específico por su ID.")
 def get_hito(
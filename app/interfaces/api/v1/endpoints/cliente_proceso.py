@@ -1,54 +1,78 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException
 from sqlalchemy.orm import Session
-from app.infrastructure.db.database import SessionLocal
-from app.interfaces.schemas.cliente_proceso import GenerarClienteProcesoRequest
+from app.infrastructure.db.unidad_trabajo import get_db
+from app.interfaces.schemas.cliente_proceso import (
+    GenerarClienteProcesoRequest,
+    GenerarCalendarioLoteRequest,
+    ClienteProcesoResponse,
+    ClienteProcesosCursorResponse,
+    ClienteProcesosPorClienteResponse,
+)
 from app.infrastructure.db.repositories.cliente_proceso_repository_sql import ClienteProcesoRepositorySQL
 from app.infrastructure.db.repositories.proceso_repository_sql import ProcesoRepositorySQL
 from app.infrastructure.db.repositories.proceso_hito_maestro_repository_sql import ProcesoHitoMaestroRepositorySQL
 from app.infrastructure.db.repositories.cliente_proceso_hito_repository_sql import ClienteProcesoHitoRepositorySQL
+from app.infrastructure.db.repositories.cliente_repository_sql import ClienteRepositorySQL
+from app.infrastructure.db.repositories.plantilla_repository_sql import PlantillaRepositorySQL
+from app.infrastructure.db.repositories.plantilla_proceso_repository_sql import PlantillaProcesoRepositorySQL
+from app.infrastructure.jobs.generacion_calendario_lote import registro_trabajos, ejecutar_generacion_lote
+from app.infrastructure.db.compartido.festivos import calendario_laboral
 
 from app.application.use_cases.cliente_proceso.crear_cliente_proceso import crear_cliente_proceso
 from app.application.use_cases.cliente_proceso.generar_calendario_cliente_proceso import generar_calendario_cliente_proceso
-from typing import Optional
+from app.domain.repositories.consulta_listado import ConsultaListado
+from app.interfaces.api.consulta_listado import parametros_cursor, respuesta_cursor
+from typing import List, Optional, Union
 from fastapi import Query, Depends
 
 router = APIRouter(prefix="/cliente-procesos", tags=["ClienteProceso"])
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-def get_repo(db: Session = Depends(get_db)):
+def get_repo(db: Session = Depends(get_db, scope="function")):
     return ClienteProcesoRepositorySQL(db)
 
-def get_repo_proceso(db: Session = Depends(get_db)):
+def get_repo_proceso(db: Session = Depends(get_db, scope="function")):
     return ProcesoRepositorySQL(db)
 
-def get_repo_proceso_hito_maestro(db: Session = Depends(get_db)):
+def get_repo_proceso_hito_maestro(db: Session = Depends(get_db, scope="function")):
     return ProcesoHitoMaestroRepositorySQL(db)
 
-def get_repo_cliente_proceso_hito(db: Session = Depends(get_db)):
+def get_repo_cliente_proceso_hito(db: Session = Depends(get_db, scope="function")):
     return ClienteProcesoHitoRepositorySQL(db)
 
+def get_repo_cliente(db: Session = Depends(get_db, scope="function")):
+    return ClienteRepositorySQL(db)
+
+def get_repo_plantilla(db: Session = Depends(get_db, scope="function")):
+    return PlantillaRepositorySQL(db)
+
+def get_repo_plantilla_proceso(db: Session = Depends(get_db, scope="function")):
+    return PlantillaProcesoRepositorySQL(db)
+
 @router.post("/")
 def crear(data: dict, repo = Depends(get_repo)):
     return crear_cliente_proceso(data, repo)
 
-@router.get("/")
-def listar(repo = Depends(get_repo)):
-    return repo.listar()
+@router.get("/", response_model=Union[List[ClienteProcesoResponse], ClienteProcesosCursorResponse])
+def listar(
+    consulta: ConsultaListado = Depends(parametros_cursor()),
+    repo = Depends(get_repo)
+):
+    if not consulta.por_cursor:
+        return repo.listar()
+    try:
+        cliente_procesos, siguiente = repo.listar_por_cursor(consulta)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return respuesta_cursor("cliente_procesos", cliente_procesos, consulta, siguiente)
 
-@router.get("/{id}")
+@router.get("/{id}", response_model=ClienteProcesoResponse)
 def get(id: int, repo = Depends(get_repo)):
     cliente_proceso = repo.obtener_por_id(id)
     if not cliente_proceso:
         raise HTTPException(status_code=404, detail="No encontrado")
     return cliente_proceso
 
-@router.get("/cliente/{cliente_id}")
+@router.get("/cliente/{cliente_id}", response_model=ClienteProcesosPorClienteResponse)
 def get_por_cliente(cliente_id: str,
                     page: Optional[int] = Query(None, ge=1, description="Página actual"),
                     limit: Optional[int] = Query(None, ge=1, le=100, description="Cantidad de resultados por página"),
@@ -67,12 +91,13 @@ def get_por_cliente(cliente_id: str,
         "total": total
     }
 
-@router.get("/habilitados", summary="Listar procesos de cliente habilitados",
+@router.get("/habilitados", response_model=List[ClienteProcesoResponse], summary="Listar procesos de cliente habilitados",
     description="Devuelve solo los procesos de cliente que están habilitados (habilitado=True).")
 def listar_habilitados(repo = Depends(get_repo)):
     return repo.listar_habilitados()
 
-@router.get("/cliente/{cliente_id}/habilitados", summary="Listar procesos de cliente habilitados por cliente",
+@router.get("/cliente/{cliente_id}/habilitados", response_model=ClienteProcesosPorClienteResponse,
+    summary="Listar procesos de cliente habilitados por cliente",
     description="Devuelve solo los procesos de cliente habilitados de un cliente específico.")
 def get_habilitados_por_cliente(
     cliente_id: str,
@@ -107,6 +132,53 @@ def generar_calendario_cliente_by_proceso(request: GenerarClienteProcesoRequest,
                                         repo = Depends(get_repo),
                                         proceso_repo = Depends(get_repo_proceso),
                                         repo_proceso_hito_maestro = Depends(get_repo_proceso_hito_maestro),
-                                        repo_cliente_proceso_hito = Depends(get_repo_cliente_proceso_hito)):
+                                        repo_cliente_proceso_hito = Depends(get_repo_cliente_proceso_hito),
+                                        repo_cliente = Depends(get_repo_cliente)):
     proceso_maestro = proceso_repo.obtener_por_id(request.proceso_id) #esto podria hacerse tambien en vez de mediante el repo, con el caso de uso...
-    return generar_calendario_cliente_proceso(request,proceso_maestro, repo,repo_proceso_hito_maestro, repo_cliente_proceso_hito)
+    return generar_calendario_cliente_proceso(request,proceso_maestro, repo,repo_proceso_hito_maestro, repo_cliente_proceso_hito,
+                                              repo_cliente, calendario_laboral)
+
+@router_calendario.post("/generar-calendario-cliente-proceso/lote", status_code=202,
+    summary="Generar calendarios de varios clientes en segundo plano",
+    description="Acepta una lista de pares (cliente_id, proceso_id) o una plantilla aplicada a una lista de clientes. "
+                "Devuelve el trabajo creado; su progreso se consulta en /generar-calendario-cliente-proceso/lote/{trabajo_id}.")
+def generar_calendario_lote(request: GenerarCalendarioLoteRequest,
+                            background_tasks: BackgroundTasks,
+                            repo_plantilla = Depends(get_repo_plantilla),
+                            repo_plantilla_proceso = Depends(get_repo_plantilla_proceso)):
+    pares = [(p.cliente_id, p.proceso_id) for p in request.pares]
+
+    if request.plantilla_id is not None:
+        if not request.cliente_ids:
+            raise HTTPException(status_code=400, detail="cliente_ids es obligatorio al indicar plantilla_id")
+        if not repo_plantilla.obtener_por_id(request.plantilla_id):
+            raise HTTPException(status_code=404, detail="Plantilla no encontrada")
+        proceso_ids = [r.proceso_id for r in repo_plantilla_proceso.listar_procesos_por_plantilla(request.plantilla_id)]
+        pares.extend((cliente_id, proceso_id) for cliente_id in request.cliente_ids for proceso_id in proceso_ids)
+
+    if not pares:
+        raise HTTPException(status_code=400, detail="No hay pares (cliente, proceso) que generar")
+
+    # Sin duplicados, respetando el orden de llegada
+    solicitudes = [
+        GenerarClienteProcesoRequest(cliente_id=cliente_id, proceso_id=proceso_id, fecha_inicio=request.fecha_inicio)
+        for cliente_id, proceso_id in dict.fromkeys(pares)
+    ]
+
+    trabajo = registro_trabajos.crear(len(solicitudes), {
+        "plantilla_id": request.plantilla_id,
+        "clientes": len({s.cliente_id for s in solicitudes}),
+    })
+    background_tasks.add_task(ejecutar_generacion_lote, trabajo, solicitudes)
+    return trabajo.to_dict()
+
+@router_calendario.get("/generar-calendario-cliente-proceso/lote/{trabajo_id}",
+    summary="Progreso de una generación de calendarios por lotes",
+    description="Lo puede atender cualquier worker: el progreso se guarda en base de datos tras cada bloque. "
+                "estado es pendiente, en_curso, completado, error o interrumpido (sin progreso en "
+                "CALENDARIO_LOTE_INTERRUMPIDO_SECONDS: el worker que lo ejecutaba se ha parado).")
+def get_generar_calendario_lote(trabajo_id: str):
+    trabajo = registro_trabajos.obtener(trabajo_id)
+    if not trabajo:
+        raise HTTPException(status_code=404, detail="Trabajo no encontrado")
+    return trabajo.to_dict()
@@ -1,20 +1,17 @@
 from fastapi import APIRouter, Depends, HTTPException, Body, Path, Query
 from sqlalchemy.orm import Session
-from app.infrastructure.db.database import SessionLocal
+from typing import List, Union
+from app.infrastructure.db.unidad_trabajo import get_db
 from app.infrastructure.db.repositories.cliente_proceso_hito_repository_sql import ClienteProcesoHitoRepositorySQL
 
 from app.domain.entities.cliente_proceso_hito import ClienteProcesoHito
+from app.domain.repositories.consulta_listado import ConsultaListado
+from app.interfaces.api.consulta_listado import parametros_cursor, respuesta_cursor
+from app.interfaces.schemas.cliente_proceso_hito import ClienteProcesoHitoResponse, ClienteProcesoHitosCursorResponse
 
 router = APIRouter(prefix="/cliente-proceso-hitos", tags=["ClienteProcesoHito"])
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-def get_repo(db: Session = Depends(get_db)):
+def get_repo(db: Session = Depends(get_db, scope="function")):
     return ClienteProcesoHitoRepositorySQL(db)
 
 @router.post("/cliente-proceso-hitos", tags=["ClienteProcesoHito"], summary="Crear relación cliente-proceso-hito",
@@ -42,12 +39,24 @@ def crear(
     )
     return repo.guardar(hito)
 
-@router.get("/", summary="Listar todas las relaciones cliente-proceso-hito",
-    description="Devuelve todas las relaciones entre clientes, procesos e hitos registradas.")
-def listar(repo = Depends(get_repo)):
-    return repo.listar()
+@router.get("/", response_model=Union[List[ClienteProcesoHitoResponse], ClienteProcesoHitosCursorResponse],
+    summary="Listar todas las relaciones cliente-proceso-hito",
+    description="Devuelve todas las relaciones entre clientes, procesos e hitos registradas. "
+                "Con el parámetro `cursor` (vacío en la primera petición) devuelve páginas de `limit` "
+                "relaciones y el `next_cursor` para pedir la siguiente.")
+def listar(
+    consulta: ConsultaListado = Depends(parametros_cursor()),
+    repo = Depends(get_repo)
+):
+    if not consulta.por_cursor:
+        return repo.listar()
+    try:
+        hitos, siguiente = repo.listar_por_cursor(consulta)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return respuesta_cursor("cliente_proceso_hitos", hitos, consulta, siguiente)
 
-@router.get("/{id}", summary="Obtener relación por ID",
+@router.get("/{id}", response_model=ClienteProcesoHitoResponse, summary="Obtener relación por ID",
     description="Devuelve una relación cliente-proceso-hito específica según su ID.")
 def get(
     id: int = Path(..., description="ID de la relación a consultar"),
@@ -105,7 +114,7 @@ def delete(
         raise HTTPException(status_code=404, detail="No encontrado")
     return {"mensaje": "Eliminado"}
 
-@router.get("/cliente-proceso/{id_cliente_proceso}", summary="Listar hitos de un proceso de cliente",
+@router.get("/cliente-proceso/{id_cliente_proceso}", response_model=List[ClienteProcesoHitoResponse], summary="Listar hitos de un proceso de cliente",
     description="Devuelve todos los hitos asociados a un proceso de cliente específico.")
 def get_hitos_por_proceso(
     id_cliente_proceso: int = Path(..., description="ID del proceso de cliente"),
@@ -116,12 +125,13 @@ def get_hitos_por_proceso(
         raise HTTPException(status_code=404, detail="No se encontraron hitos para este proceso")
     return hitos
 
-@router.get("/habilitados", summary="Listar hitos habilitados",
+@router.get("/habilitados", response_model=List[ClienteProcesoHitoResponse], summary="Listar hitos habilitados",
     description="Devuelve solo los hitos que están habilitados (habilitado=True).")
 def listar_habilitados(repo = Depends(get_repo)):
     return repo.listar_habilitados()
 
-@router.get("/cliente-proceso/{id_cliente_proceso}/habilitados", summary="Listar hitos habilitados de un proceso de cliente",
+@router.get("/cliente-proceso/{id_cliente_proceso}/habilitados", response_model=List[ClienteProcesoHitoResponse],
+    summary="Listar hitos habilitados de un proceso de cliente",
     description="Devuelve solo los hitos habilitados asociados a un proceso de cliente específico.")
 def get_hitos_habilitados_por_proceso(
     id_cliente_proceso: int = Path(..., description="ID del proceso de cliente"),
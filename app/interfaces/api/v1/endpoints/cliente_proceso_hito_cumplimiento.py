@@ -1,26 +1,22 @@
 from fastapi import APIRouter, Depends, HTTPException, Body, Path, Query
 from sqlalchemy.orm import Session
-from typing import Optional
+from typing import Optional, Union
 from datetime import datetime, date
-from app.infrastructure.db.database import SessionLocal
+from app.infrastructure.db.unidad_trabajo import get_db
 from app.infrastructure.db.repositories.cliente_proceso_hito_cumplimiento_repository_sql import ClienteProcesoHitoCumplimientoRepositorySQL
 from app.infrastructure.db.repositories.cliente_proceso_hito_repository_sql import ClienteProcesoHitoRepositorySQL
 
 from app.domain.entities.cliente_proceso_hito_cumplimiento import ClienteProcesoHitoCumplimiento
+from app.domain.repositories.consulta_listado import ConsultaListado
+from app.interfaces.api.consulta_listado import parametros_listado, respuesta_cursor
+from app.interfaces.schemas.cliente_proceso_hito_cumplimiento import CumplimientosPaginadosResponse, CumplimientosCursorResponse
 
 router = APIRouter(prefix="/cliente-proceso-hito-cumplimientos", tags=["ClienteProcesoHitoCumplimiento"])
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-def get_repo(db: Session = Depends(get_db)):
+def get_repo(db: Session = Depends(get_db, scope="function")):
     return ClienteProcesoHitoCumplimientoRepositorySQL(db)
 
-def get_repo_cliente_proceso_hito(db: Session = Depends(get_db)):
+def get_repo_cliente_proceso_hito(db: Session = Depends(get_db, scope="function")):
     return ClienteProcesoHitoRepositorySQL(db)
 
 @router.post("/", summary="Crear cumplimiento de hito",
@@ -62,43 +58,20 @@ def crear(
         # Manejar errores inesperados
         raise HTTPException(status_code=500, detail=f"Error interno del servidor: {str(e)}")
 
-@router.get("/", summary="Listar todos los cumplimientos",
+@router.get("/", response_model=Union[CumplimientosPaginadosResponse, CumplimientosCursorResponse],
+    summary="Listar todos los cumplimientos",
     description="Devuelve todos los registros de cumplimiento de hitos con soporte para paginación y ordenación.")
 def listar(
-    page: Optional[int] = Query(None, ge=1, description="Página actual"),
-    limit: Optional[int] = Query(None, ge=1, le=100, description="Cantidad de resultados por página"),
-    sort_field: Optional[str] = Query(None, description="Campo por el cual ordenar (id, cliente_proceso_hito_id, fecha, hora, observacion, usuario)"),
-    sort_direction: Optional[str] = Query("asc", regex="^(asc|desc)$", description="Dirección de ordenación: asc o desc"),
+    consulta: ConsultaListado = Depends(parametros_listado(cursor=True)),
     repo = Depends(get_repo)
 ):
-    cumplimientos = repo.listar()
-    total = len(cumplimientos)
-
-    # Aplicar ordenación si se especifica
-    if sort_field and hasattr(cumplimientos[0] if cumplimientos else None, sort_field):
-        reverse = sort_direction == "desc"
-
-        # Función de ordenación que maneja valores None
-        def sort_key(cumplimiento):
-            value = getattr(cumplimiento, sort_field, None)
-            if value is None:
-                return ""  # Los valores None van al final
-            # Si es numérico (como id, cliente_proceso_hito_id), convertir a número para ordenación correcta
-            if sort_field in ["id", "cliente_proceso_hito_id"]:
-                try:
-                    return int(value)
-                except (ValueError, TypeError):
-                    return 0
-            # Para campos de texto/fecha/hora, convertir a string para ordenación
-            return str(value).lower() if isinstance(value, str) else str(value)
-
-        cumplimientos.sort(key=sort_key, reverse=reverse)
-
-    # Aplicar paginación después de ordenar
-    if page is not None and limit is not None:
-        start = (page - 1) * limit
-        end = start + limit
-        cumplimientos = cumplimientos[start:end]
+    try:
+        if consulta.por_cursor:
+            cumplimientos, siguiente = repo.listar_por_cursor(consulta)
+            return respuesta_cursor("cumplimientos", cumplimientos, consulta, siguiente)
+        cumplimientos, total = repo.listar_paginado(consulta)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
     if not cumplimientos:
         raise HTTPException(status_code=404, detail="No se encontraron cumplimientos")
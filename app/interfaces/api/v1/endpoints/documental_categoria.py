@@ -2,76 +2,43 @@ from fastapi import APIRouter, Depends, HTTPException, Query, Path, Body
 from sqlalchemy.orm import Session
 from typing import List, Optional
 
-from app.infrastructure.db.database import SessionLocal
+from app.infrastructure.db.unidad_trabajo import get_db
 from app.infrastructure.db.repositories.documental_categoria_repository_sql import SqlDocumentalCategoriaRepository
 from app.interfaces.schemas.documental_categoria import (
     DocumentalCategoriaCreate,
     DocumentalCategoriaUpdate,
-    DocumentalCategoriaResponse
+    DocumentalCategoriaResponse,
+    DocumentalCategoriasPaginadasResponse
 )
 from app.domain.entities.documental_categoria import DocumentalCategoria
+from app.domain.repositories.consulta_listado import ConsultaListado
+from app.interfaces.api.consulta_listado import parametros_listado
+from app.interfaces.api.etag import etag_catalogo
 
 router = APIRouter(prefix="/documental-categorias", tags=["Documental Categorias"])
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-def get_repo(db: Session = Depends(get_db)):
+def get_repo(db: Session = Depends(get_db, scope="function")):
     return SqlDocumentalCategoriaRepository(session=db)
 
-@router.get("/",
+@router.get("/", dependencies=[Depends(etag_catalogo("documental_categoria"))],
+           response_model=DocumentalCategoriasPaginadasResponse,
            summary="Listar todas las categorias de documentos",
            description="Devuelve todas las categorías de documentos definidas en el sistema.")
 def listar(
-    page: Optional[int] = Query(None, ge=1, description="Página actual"),
-    limit: Optional[int] = Query(None, ge=1, le=100, description="Cantidad de resultados por página"),
-    sort_field: Optional[str] = Query(None, description="Campo por el cual ordenar"),
-    sort_direction: Optional[str] = Query("asc", regex="^(asc|desc)$", description="Dirección de ordenación: asc o desc"),
+    consulta: ConsultaListado = Depends(parametros_listado()),
     repo = Depends(get_repo)
 ):
-        documental_categorias = repo.listar()
-        total = len(documental_categorias)
-
-        # Aplicar ordenación si se especifica y hay datos para ordenar
-        if sort_field and documental_categorias and hasattr(documental_categorias[0], sort_field):
-            reverse = sort_direction == "desc"
-
-            # Función de ordenación que maneja valores None
-            def sort_key(categoria):
-                value = getattr(categoria, sort_field, None)
-                if value is None:
-                    return ""  # Los valores None van al final
-
-                # Manejo especial para diferentes tipos de campos
-                if sort_field == "id":
-                    try:
-                        return int(value)
-                    except (ValueError, TypeError):
-                        return 0
-                else:
-                    # Para campos de texto (nombre), convertir a minúsculas
-                    # para ordenación insensible a mayúsculas
-                    return str(value).lower()
-
-            documental_categorias.sort(key=sort_key, reverse=reverse)
-
-        # Aplicar paginación después de ordenar
-        if page is not None and limit is not None:
-            start = (page - 1) * limit
-            end = start + limit
-            documental_categorias = documental_categorias[start:end]
+    try:
+        documental_categorias, total = repo.listar_paginado(consulta)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
-        # Devolver respuesta exitosa incluso si no hay categorías después de la paginación
-        return {
-            "total": total,
-            "documental_categorias": documental_categorias
-        }
+    return {
+        "total": total,
+        "documental_categorias": documental_categorias
+    }
 
-@router.get("/cliente/{cliente_id}",
+@router.get("/cliente/{cliente_id}", dependencies=[Depends(etag_catalogo("documental_categoria"))],
            summary="Listar categorías de documentos por cliente",
            description="Devuelve todas las categorías de documentos de un cliente específico.")
 def listar_por_cliente(
@@ -122,7 +89,7 @@ def listar_por_cliente(
         }
 
 
-@router.get("/{id}",
+@router.get("/{id}", dependencies=[Depends(etag_catalogo("documental_categoria"))],
            response_model=DocumentalCategoriaResponse,
            summary="Obtener categoría de documento por ID",
            description="Devuelve una categoría de documento específica por su ID.")
@@ -1,73 +1,47 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, Path, File, Form, UploadFile
+from fastapi import APIRouter, Depends, HTTPException, Path, File, Form, UploadFile
 from fastapi.responses import FileResponse
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import List
 import os
 
-from app.infrastructure.db.database import SessionLocal
+from app.infrastructure.db.unidad_trabajo import get_db
 from app.infrastructure.db.repositories.documental_documentos_repository_sql import SqlDocumentalDocumentosRepository
 from app.infrastructure.db.repositories.cliente_repository_sql import ClienteRepositorySQL
 from app.infrastructure.file_storage.local_file_storage import LocalFileStorage
 from app.interfaces.schemas.documental_documentos import (
     DocumentalDocumentosCreate,
     DocumentalDocumentosUpdate,
-    DocumentalDocumentosResponse
+    DocumentalDocumentosResponse,
+    DocumentalDocumentosPaginadosResponse
 )
 from app.domain.entities.documental_documentos import DocumentalDocumentos
 from app.application.use_cases.documental_documentos.crear_documento_categoria import CrearDocumentoCategoriaUseCase
+from app.domain.repositories.consulta_listado import ConsultaListado
+from app.interfaces.api.consulta_listado import parametros_listado
 
 router = APIRouter(prefix="/documental-documentos", tags=["Documental Documentos"])
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-def get_repo(db: Session = Depends(get_db)):
+def get_repo(db: Session = Depends(get_db, scope="function")):
     return SqlDocumentalDocumentosRepository(session=db)
 
-def get_cliente_repo(db: Session = Depends(get_db)):
+def get_cliente_repo(db: Session = Depends(get_db, scope="function")):
     return ClienteRepositorySQL(session=db)
 
 def get_storage():
     return LocalFileStorage()
 
 @router.get("/",
+           response_model=DocumentalDocumentosPaginadosResponse,
            summary="Listar todos los documentos",
            description="Devuelve todos los documentos registrados en el sistema.")
 def listar(
-    page: Optional[int] = Query(None, ge=1, description="Página actual"),
-    limit: Optional[int] = Query(None, ge=1, le=100, description="Cantidad de resultados por página"),
-    sort_field: Optional[str] = Query(None, description="Campo por el cual ordenar"),
-    sort_direction: Optional[str] = Query("asc", regex="^(asc|desc)$", description="Dirección de ordenación: asc o desc"),
+    consulta: ConsultaListado = Depends(parametros_listado()),
     repo = Depends(get_repo)
 ):
-    documental_documentos = repo.listar()
-    total = len(documental_documentos)
-
-    if sort_field and documental_documentos and hasattr(documental_documentos[0], sort_field):
-        reverse = sort_direction == "desc"
-
-        def sort_key(documento):
-            value = getattr(documento, sort_field, None)
-            if value is None:
-                return ""
-            if sort_field == "id":
-                try:
-                    return int(value)
-                except (ValueError, TypeError):
-                    return 0
-            else:
-                return str(value).lower()
-
-        documental_documentos.sort(key=sort_key, reverse=reverse)
-
-    if page is not None and limit is not None:
-        start = (page - 1) * limit
-        end = start + limit
-        documental_documentos = documental_documentos[start:end]
+    try:
+        documental_documentos, total = repo.listar_paginado(consulta)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
     return {
         "total": total,
@@ -1,9 +1,11 @@
 # app/interfaces/api/v1/endpoints/documento.py
 
+from typing import Union
+
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form
 from sqlalchemy.orm import Session
 
-from app.infrastructure.db.database import SessionLocal
+from app.infrastructure.db.unidad_trabajo import get_db
 
 # Puertos de repositorio
 from app.domain.repositories.documento_repository import DocumentoRepositoryPort as DocumentoRepository
@@ -27,28 +29,25 @@ from app.application.use_cases.documento.actualizar_documento import ActualizarD
 from app.application.use_cases.documento.eliminar_documento import EliminarDocumentoUseCase
 
 # Esquema de salida
-from app.interfaces.schemas.documento import DocumentoResponse
+from app.interfaces.schemas.documento import DocumentoResponse, DocumentosCursorResponse
+
+# Paginación por cursor
+from app.domain.repositories.consulta_listado import ConsultaListado
+from app.interfaces.api.consulta_listado import parametros_cursor, respuesta_cursor
 
 router = APIRouter(prefix="/documentos", tags=["Documentos"])
 
 # — Dependencias de BD —
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-def get_repo(db: Session = Depends(get_db)) -> DocumentoRepository:
+def get_repo(db: Session = Depends(get_db, scope="function")) -> DocumentoRepository:
     return SQLDocumentoRepository(db)
 
-def get_repo_cph(db: Session = Depends(get_db)) -> ClienteProcesoHitoRepository:
+def get_repo_cph(db: Session = Depends(get_db, scope="function")) -> ClienteProcesoHitoRepository:
     return ClienteProcesoHitoRepositorySQL(db)
 
-def get_repo_cp(db: Session = Depends(get_db)) -> ClienteProcesoRepository:
+def get_repo_cp(db: Session = Depends(get_db, scope="function")) -> ClienteProcesoRepository:
     return ClienteProcesoRepositorySQL(db)
 
-def get_repo_cliente(db: Session = Depends(get_db)) -> ClienteRepository:
+def get_repo_cliente(db: Session = Depends(get_db, scope="function")) -> ClienteRepository:
     return ClienteRepositorySQL(db)
 
 # — Dependencia de almacenamiento de ficheros —
@@ -57,11 +56,18 @@ def get_storage() -> DocumentStoragePort:
 
 # — Endpoints —
 
-@router.get("/", response_model=list[DocumentoResponse])
+@router.get("/", response_model=Union[list[DocumentoResponse], DocumentosCursorResponse])
 def listar_documentos(
+    consulta: ConsultaListado = Depends(parametros_cursor()),
     repo_doc: DocumentoRepository = Depends(get_repo)
 ):
-    return repo_doc.get_all()
+    if not consulta.por_cursor:
+        return repo_doc.get_all()
+    try:
+        documentos, siguiente = repo_doc.listar_por_cursor(consulta)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return respuesta_cursor("documentos", documentos, consulta, siguiente)
 
 @router.get("/{id}", response_model=DocumentoResponse)
 def obtener_documento(
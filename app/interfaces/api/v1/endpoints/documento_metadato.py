@@ -2,7 +2,7 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from typing import List
 
-from app.infrastructure.db.database import SessionLocal
+from app.infrastructure.db.unidad_trabajo import get_db
 from app.infrastructure.db.repositories.documento_metadato_repository_sql import SqlDocumentoMetadatoRepository
 from app.infrastructure.db.repositories.documento_repository_sql import SQLDocumentoRepository
 from app.infrastructure.db.repositories.metadato_repositoy_sql import SQLMetadatoRepository
@@ -11,15 +11,7 @@ from app.interfaces.schemas.documento_metadato import DocumentoMetadatoCreate, D
 from app.domain.entities.documento_metadato import DocumentoMetadato
 
 router = APIRouter(prefix="/documento-metadatos", tags=["DocumentoMetadato"])
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-
-def get_service(db: Session = Depends(get_db)) -> DocumentoMetadatoService:
+def get_service(db: Session = Depends(get_db, scope="function")) -> DocumentoMetadatoService:
     repo = SqlDocumentoMetadatoRepository(db)
     doc_repo = SQLDocumentoRepository(db)
     meta_repo = SQLMetadatoRepository(db)
@@ -0,0 +1,55 @@
+from datetime import date
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Body, Query
+from sqlalchemy.orm import Session
+from app.infrastructure.db.unidad_trabajo import get_db
+from app.infrastructure.db.repositories.festivo_repository_sql import FestivoRepositorySQL
+from app.application.services.calendario_laboral import normalizar_region
+from app.domain.entities.festivo import Festivo
+
+
+router = APIRouter(prefix="/festivos", tags=["Festivo"])
+
+def get_repo(db: Session = Depends(get_db, scope="function")):
+    return FestivoRepositorySQL(db)
+
+@router.get("/", summary="Listar festivos",
+    description="Con region se devuelven los festivos de esa provincia más los nacionales.")
+def listar(
+    anio: Optional[int] = Query(None, ge=2000, le=2100, description="Año de los festivos"),
+    region: Optional[str] = Query(None, description="Provincia (clientes.provincia)"),
+    repo = Depends(get_repo)
+):
+    festivos = repo.listar(anio, normalizar_region(region))
+    return {
+        "total": len(festivos),
+        "festivos": festivos
+    }
+
+@router.post("/", summary="Crear festivo",
+    description="Sin region el festivo es nacional. Al confirmarse se invalida el calendario laboral "
+                "de todos los workers (los demás lo ven en la siguiente comprobación de catalogo_version).")
+def crear(data: dict = Body(..., example={"fecha": "2025-12-08", "region": None, "descripcion": "Inmaculada Concepción"}),
+          repo = Depends(get_repo)):
+    try:
+        fecha = date.fromisoformat(str(data.get("fecha"))[:10])
+    except ValueError:
+        raise HTTPException(status_code=400, detail="fecha debe tener formato YYYY-MM-DD")
+
+    festivo = Festivo(
+        fecha=fecha,
+        region=normalizar_region(data.get("region")),
+        descripcion=data.get("descripcion"),
+    )
+    try:
+        creado = repo.guardar(festivo)
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return creado
+
+@router.delete("/{id}")
+def delete(id: int, repo = Depends(get_repo)):
+    festivo = repo.eliminar(id)
+    if not festivo:
+        raise HTTPException(status_code=404, detail="No encontrado")
+    return {"mensaje": "Eliminado"}
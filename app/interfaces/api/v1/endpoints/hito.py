@@ -1,30 +1,33 @@
 from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, Query, Path, Body
 from sqlalchemy.orm import Session
-from app.infrastructure.db.database import SessionLocal
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.infrastructure.db.unidad_trabajo import get_db
+from app.infrastructure.db.database_async import get_async_db
 from app.infrastructure.db.repositories.hito_repository_sql import HitoRepositorySQL
+from app.infrastructure.db.repositories.hito_repository_async import HitoRepositoryAsync
 from app.infrastructure.db.repositories.cliente_proceso_hito_repository_sql import ClienteProcesoHitoRepositorySQL
 from app.infrastructure.db.repositories.proceso_hito_maestro_repository_sql import ProcesoHitoMaestroRepositorySQL
 
 from app.domain.entities.hito import Hito
 from app.application.use_cases.hitos.update_hito import actualizar_hito
+from app.domain.repositories.consulta_listado import ConsultaListado
+from app.interfaces.api.consulta_listado import parametros_listado
+from app.interfaces.api.etag import etag_catalogo
+from app.interfaces.schemas.hito import HitosPaginadosResponse
 
 router = APIRouter(prefix="/hitos", tags=["Hito"])
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-def get_repo(db: Session = Depends(get_db)):
+def get_repo(db: Session = Depends(get_db, scope="function")):
     return HitoRepositorySQL(db)
 
-def get_repo_cliente_proceso_hito(db: Session = Depends(get_db)):
+def get_repo_async(db: AsyncSession = Depends(get_async_db)):
+    return HitoRepositoryAsync(db)
+
+def get_repo_cliente_proceso_hito(db: Session = Depends(get_db, scope="function")):
     return ClienteProcesoHitoRepositorySQL(db)
 
-def get_repo_proceso_hito_maestro(db: Session = Depends(get_db)):
+def get_repo_proceso_hito_maestro(db: Session = Depends(get_db, scope="function")):
     return ProcesoHitoMaestroRepositorySQL(db)
 
 @router.post("/", summary="Crear un nuevo hito",
@@ -58,15 +61,15 @@ def crear(
 
 @router.get("/hitos-cliente-por-empleado", summary="Listar hitos por cliente/empleado",
     description="Devuelve todos los hitos asociados a los procesos de clientes gestionados por un empleado. Filtrable por fecha límite, mes y año.")
-def obtener_hitos_por_empleado(
+async def obtener_hitos_por_empleado(
     email: str = Query(..., description="Email del empleado"),
     fecha_inicio: Optional[str] = Query(None, description="Fecha mínima (YYYY-MM-DD) de fecha límite del hito"),
     fecha_fin: Optional[str] = Query(None, description="Fecha máxima (YYYY-MM-DD) de fecha límite del hito"),
     mes: Optional[int] = Query(None, ge=1, le=12, description="Mes de fecha límite del hito (1-12)"),
     anio: Optional[int] = Query(None, ge=2000, le=2100, description="Año de fecha límite del hito"),
-    repo = Depends(get_repo)
+    repo = Depends(get_repo_async)
 ):
-    return repo.listar_hitos_cliente_por_empleado(
+    return await repo.listar_hitos_cliente_por_empleado(
         email= email,
         fecha_inicio=fecha_inicio,
         fecha_fin=fecha_fin,
@@ -74,77 +77,29 @@ def obtener_hitos_por_empleado(
         anio=anio
     )
 
-@router.get("/habilitados", summary="Listar hitos habilitados",
+@router.get("/habilitados", dependencies=[Depends(etag_catalogo("hito"))], summary="Listar hitos habilitados",
     description="Devuelve solo los hitos que están habilitados (habilitado=True).")
 def listar_habilitados(repo = Depends(get_repo)):
     return repo.listar_habilitados()
 
-@router.get("/", summary="Listar todos los hitos",
+@router.get("/", dependencies=[Depends(etag_catalogo("hito"))], response_model=HitosPaginadosResponse,
+    summary="Listar todos los hitos",
     description="Devuelve todos los hitos definidos en el sistema.")
 def listar(
-    page: Optional[int] = Query(None, ge=1, description="Página actual"),
-    limit: Optional[int] = Query(None, ge=1, le=100, description="Cantidad de resultados por página"),
-    sort_field: Optional[str] = Query(None, description="Campo por el cual ordenar"),
-    sort_direction: Optional[str] = Query("asc", regex="^(asc|desc)$", description="Dirección de ordenación: asc o desc"),
+    consulta: ConsultaListado = Depends(parametros_listado()),
     repo = Depends(get_repo)
 ):
-    hitos = repo.listar()
-    total = len(hitos)
-
-    # Aplicar ordenación si se especifica y hay datos para ordenar
-    if sort_field and hitos and hasattr(hitos[0], sort_field):
-        reverse = sort_direction == "desc"
-
-        # Función de ordenación que maneja valores None
-        def sort_key(hito):
-            value = getattr(hito, sort_field, None)
-
-            # Manejo especial para diferentes tipos de campos
-            if sort_field in ["id", "frecuencia", "obligatorio"]:
-                if value is None:
-                    return -1 if not reverse else float('inf')  # None al inicio en asc, al final en desc
-                try:
-                    return int(value)
-                except (ValueError, TypeError):
-                    return -1 if not reverse else float('inf')
-
-            elif sort_field in ["fecha_inicio", "fecha_fin"]:
-                if value is None:
-                    return -1 if not reverse else float('inf')  # None al inicio en asc, al final en desc
-                try:
-                    # Convertir fecha a timestamp para ordenación
-                    from datetime import datetime, date
-                    if isinstance(value, str):
-                        return datetime.fromisoformat(value.replace('Z', '+00:00')).timestamp()
-                    elif isinstance(value, date):
-                        return datetime.combine(value, datetime.min.time()).timestamp()
-                    elif hasattr(value, 'timestamp'):
-                        return value.timestamp()
-                    else:
-                        return -1 if not reverse else float('inf')
-                except (ValueError, TypeError):
-                    return -1 if not reverse else float('inf')
-            else:
-                # Para campos de texto
-                if value is None:
-                    return ""  # Strings vacíos van al principio alfabéticamente
-                return str(value).lower()
-
-        hitos.sort(key=sort_key, reverse=reverse)
-
-    # Aplicar paginación después de ordenar
-    if page is not None and limit is not None:
-        start = (page - 1) * limit
-        end = start + limit
-        hitos = hitos[start:end]
-
-    # Devolver respuesta exitosa incluso si no hay hitos después de la paginación
+    try:
+        hitos, total = repo.listar_paginado(consulta)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
     return {
         "total": total,
         "hitos": hitos
     }
 
-@router.get("/{id}", summary="Obtener hito por ID",
+@router.get("/{id}", dependencies=[Depends(etag_catalogo("hito"))], summary="Obtener hito por ID",
     description="Devuelve la información de un hito específico por su ID.")
 def get_hito(
     id: int = Path(..., description="ID del hito a consultar"),
@@ -2,26 +2,20 @@ from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from typing import Optional
 from app.interfaces.schemas.metadato import MetadatoCreate, MetadatoRead, MetadatoUpdate
-from app.infrastructure.db.database import SessionLocal
+from app.infrastructure.db.unidad_trabajo import get_db
 from app.domain.entities.metadato import Metadato
 from app.infrastructure.db.repositories.metadato_repositoy_sql import SQLMetadatoRepository
 from app.infrastructure.db.repositories.metadatos_area_repository_sql import SQLMetadatosAreaRepository
 from app.application.use_cases.metadato.obtener_metadatos_visibles import ObtenerMetadatosVisibles
 from app.infrastructure.services.empleado_ceco_provider import EmpleadoCecoProvider
+from app.interfaces.api.etag import etag_catalogo
 
 router = APIRouter(prefix="/metadatos", tags=["Metadatos"])
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-def get_repo(db: Session = Depends(get_db)):
+def get_repo(db: Session = Depends(get_db, scope="function")):
     return SQLMetadatoRepository(db)
 
-@router.get("/")
+@router.get("/", dependencies=[Depends(etag_catalogo("metadato"))])
 def listar_metadatos(
     page: Optional[int] = Query(None, ge=1, description="Página actual"),
     limit: Optional[int] = Query(None, ge=1, le=100, description="Cantidad de resultados por página"),
@@ -69,7 +63,7 @@ def listar_metadatos(
 @router.get("/visibles", response_model=list[MetadatoRead])
 def obtener_metadatos_visibles(
     email: str = Query(...),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db, scope="function")
 ):
     metadato_repo = SQLMetadatoRepository(db)
     area_repo = SQLMetadatosAreaRepository(db)
@@ -77,7 +71,7 @@ def obtener_metadatos_visibles(
     use_case = ObtenerMetadatosVisibles(metadato_repo, area_repo, ceco_provider)
     return use_case.execute(email)
 
-@router.get("/{metadato_id}", response_model=MetadatoRead)
+@router.get("/{metadato_id}", dependencies=[Depends(etag_catalogo("metadato"))], response_model=MetadatoRead)
 def obtener_metadato(metadato_id: int, repo = Depends(get_repo)):
     result = repo.get_by_id(metadato_id)
     if not result:
@@ -1,6 +1,6 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
-from app.infrastructure.db.database import SessionLocal
+from app.infrastructure.db.unidad_trabajo import get_db
 from app.domain.repositories.metadatos_area_repository import MetadatosAreaRepository
 from app.interfaces.schemas.metadatos_area import MetadatosAreaCreate, MetadatosAreaRead
 from app.infrastructure.db.repositories.metadatos_area_repository_sql import SQLMetadatosAreaRepository
@@ -8,17 +8,10 @@ from app.infrastructure.db.repositories.metadato_repositoy_sql import SQLMetadat
 from app.application.use_cases.metadatos_area.crear_metadatos_area import CrearMetadatosAreaUseCase
 
 router = APIRouter(prefix="/metadatos-area", tags=["Metadatos Area"])
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-def get_repo(db: Session = Depends(get_db)):
+def get_repo(db: Session = Depends(get_db, scope="function")):
     return SQLMetadatosAreaRepository(db)
 
-def get_repo_metadato(db: Session = Depends(get_db)):
+def get_repo_metadato(db: Session = Depends(get_db, scope="function")):
     return SQLMetadatoRepository(db)
 
 @router.get("/", response_model=list[MetadatosAreaRead])
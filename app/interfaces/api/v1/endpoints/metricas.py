@@ -1,7 +1,7 @@
 from fastapi import APIRouter, Depends, Query
-from sqlalchemy.orm import Session
-from app.infrastructure.db.database import get_db
-from app.application.services.metricas_service import MetricasService
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.infrastructure.db.database_async import get_async_db_lectura
+from app.application.services.metricas_service_async import MetricasServiceAsync
 from app.interfaces.schemas.metricas import (
     CumplimientoHitosSchema,
     HitosPorProcesoSchema,
@@ -9,84 +9,92 @@ from app.interfaces.schemas.metricas import (
     HitosVencidosSchema,
     ClientesInactivosSchema,
     VolumenMensualSchema,
-    ResumenMetricasSchema
+    ResumenMetricasSchema,
+    DashboardMetricasSchema
 )
 
 router = APIRouter(prefix="/metricas", tags=["Metricas"])
 
+def get_metricas_service(db: AsyncSession = Depends(get_async_db_lectura)) -> MetricasServiceAsync:
+    # Una instancia por petición: los KPIs comparten la misma consulta agregada
+    return MetricasServiceAsync(db)
+
 @router.get("/cumplimiento-hitos", response_model=CumplimientoHitosSchema)
 async def get_cumplimiento_hitos(
     email: str = Query(..., description="Email del usuario para filtrar métricas"),
-    db: Session = Depends(get_db)
+    metricas_service: MetricasServiceAsync = Depends(get_metricas_service)
 ):
     """
     Obtiene el porcentaje de cumplimiento de hitos por cliente
     """
-    metricas_service = MetricasService(db)
-    return metricas_service.get_cumplimiento_hitos(email)
+    return await metricas_service.get_cumplimiento_hitos(email)
 
 @router.get("/hitos-por-proceso", response_model=HitosPorProcesoSchema)
 async def get_hitos_por_proceso(
     email: str = Query(..., description="Email del usuario para filtrar métricas"),
-    db: Session = Depends(get_db)
+    metricas_service: MetricasServiceAsync = Depends(get_metricas_service)
 ):
     """
     Obtiene el total de hitos abiertos/pendientes por tipo de proceso
     """
-    metricas_service = MetricasService(db)
-    return metricas_service.get_hitos_por_proceso(email)
+    return await metricas_service.get_hitos_por_proceso(email)
 
 @router.get("/tiempo-resolucion", response_model=TiempoResolucionSchema)
 async def get_tiempo_resolucion(
     email: str = Query(..., description="Email del usuario para filtrar métricas"),
-    db: Session = Depends(get_db)
+    metricas_service: MetricasServiceAsync = Depends(get_metricas_service)
 ):
     """
     Obtiene el tiempo medio de resolución de hitos
     """
-    metricas_service = MetricasService(db)
-    return metricas_service.get_tiempo_resolucion(email)
+    return await metricas_service.get_tiempo_resolucion(email)
 
 @router.get("/hitos-vencidos", response_model=HitosVencidosSchema)
 async def get_hitos_vencidos(
     email: str = Query(..., description="Email del usuario para filtrar métricas"),
-    db: Session = Depends(get_db)
+    metricas_service: MetricasServiceAsync = Depends(get_metricas_service)
 ):
     """
     Obtiene alertas de hitos vencidos sin cerrar
     """
-    metricas_service = MetricasService(db)
-    return metricas_service.get_hitos_vencidos(email)
+    return await metricas_service.get_hitos_vencidos(email)
 
 @router.get("/clientes-inactivos", response_model=ClientesInactivosSchema)
 async def get_clientes_inactivos(
     email: str = Query(..., description="Email del usuario para filtrar métricas"),
-    db: Session = Depends(get_db)
+    metricas_service: MetricasServiceAsync = Depends(get_metricas_service)
 ):
     """
     Obtiene clientes sin hitos activos
     """
-    metricas_service = MetricasService(db)
-    return metricas_service.get_clientes_inactivos(email)
+    return await metricas_service.get_clientes_inactivos(email)
 
 @router.get("/volumen-mensual", response_model=VolumenMensualSchema)
 async def get_volumen_mensual(
     email: str = Query(..., description="Email del usuario para filtrar métricas"),
-    db: Session = Depends(get_db)
+    metricas_service: MetricasServiceAsync = Depends(get_metricas_service)
 ):
     """
     Obtiene el volumen mensual de hitos
     """
-    metricas_service = MetricasService(db)
-    return metricas_service.get_volumen_mensual(email)
+    return await metricas_service.get_volumen_mensual(email)
 
 @router.get("/resumen", response_model=ResumenMetricasSchema)
 async def get_resumen_metricas(
     email: str = Query(..., description="Email del usuario para filtrar métricas"),
-    db: Session = Depends(get_db)
+    metricas_service: MetricasServiceAsync = Depends(get_metricas_service)
 ):
     """
     Obtiene el resumen de todas las métricas para el dashboard general
     """
-    metricas_service = MetricasService(db)
-    return metricas_service.get_resumen_metricas(email)
+    return await metricas_service.get_resumen_metricas(email)
+
+@router.get("/dashboard", response_model=DashboardMetricasSchema)
+async def get_dashboard(
+    email: str = Query(..., description="Email del usuario para filtrar métricas"),
+    metricas_service: MetricasServiceAsync = Depends(get_metricas_service)
+):
+    """
+    Obtiene todas las métricas del dashboard en una sola llamada
+    """
+    return await metricas_service.get_dashboard(email)
@@ -1,24 +1,20 @@
-from fastapi import APIRouter, Depends, HTTPException, Body, Query
+from fastapi import APIRouter, Depends, HTTPException, Body
 from sqlalchemy.orm import Session
-from typing import Optional
-from app.infrastructure.db.database import SessionLocal
+from app.infrastructure.db.unidad_trabajo import get_db
 from app.infrastructure.db.repositories.plantilla_repository_sql import PlantillaRepositorySQL
 
 from app.domain.entities.plantilla import Plantilla
 
 from app.application.use_cases.plantillas.update_plantilla import actualizar_plantilla
+from app.domain.repositories.consulta_listado import ConsultaListado
+from app.interfaces.api.consulta_listado import parametros_listado
+from app.interfaces.api.etag import etag_catalogo
+from app.interfaces.schemas.plantilla import PlantillasPaginadasResponse
 
 
 router = APIRouter(prefix="/plantillas", tags=["Plantilla"])
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-def get_repo(db: Session = Depends(get_db)):
+def get_repo(db: Session = Depends(get_db, scope="function")):
     return PlantillaRepositorySQL(db)
 
 # Crear un nuevo plantilla
@@ -31,45 +27,15 @@ def crear(data: dict = Body(..., example={"nombre": "Plantilla Fiscal", "descrip
     return repo.guardar(plantilla)
 
 # Listar todos los plantillas
-@router.get("/")
+@router.get("/", dependencies=[Depends(etag_catalogo("plantilla"))], response_model=PlantillasPaginadasResponse)
 def listar(
-    page: Optional[int] = Query(None, ge=1, description="Página actual"),
-    limit: Optional[int] = Query(None, ge=1, le=100, description="Cantidad de resultados por página"),
-    sort_field: Optional[str] = Query(None, description="Campo por el cual ordenar"),
-    sort_direction: Optional[str] = Query("asc", regex="^(asc|desc)$", description="Dirección de ordenación: asc o desc"),
+    consulta: ConsultaListado = Depends(parametros_listado()),
     repo = Depends(get_repo)
 ):
-    plantillas = repo.listar()
-    total = len(plantillas)
-
-    # Aplicar ordenación si se especifica
-    if sort_field and hasattr(plantillas[0] if plantillas else None, sort_field):
-        reverse = sort_direction == "desc"
-
-        # Función de ordenación que maneja valores None
-        def sort_key(plantilla):
-            value = getattr(plantilla, sort_field, None)
-            if value is None:
-                return ""  # Los valores None van al final
-
-            # Manejo especial para diferentes tipos de campos
-            if sort_field == "id":
-                try:
-                    return int(value)
-                except (ValueError, TypeError):
-                    return 0
-            else:
-                # Para campos de texto (nombre, descripcion), convertir a minúsculas
-                # para ordenación insensible a mayúsculas
-                return str(value).lower()
-
-        plantillas.sort(key=sort_key, reverse=reverse)
-
-    # Aplicar paginación después de ordenar
-    if page is not None and limit is not None:
-        start = (page - 1) * limit
-        end = start + limit
-        plantillas = plantillas[start:end]
+    try:
+        plantillas, total = repo.listar_paginado(consulta)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
     if not plantillas:
         raise HTTPException(status_code=404, detail="No se encontraron plantillas")
@@ -80,7 +46,7 @@ def listar(
     }
 
 # Obtener un plantilla por ID
-@router.get("/{id}")
+@router.get("/{id}", dependencies=[Depends(etag_catalogo("plantilla"))])
 def get_plantilla(id: int, repo = Depends(get_repo)):
     """
     Devuelve una plantilla con campos:
@@ -1,20 +1,13 @@
 from fastapi import APIRouter, Depends, HTTPException, Body, Path
 from sqlalchemy.orm import Session
-from app.infrastructure.db.database import SessionLocal
+from app.infrastructure.db.unidad_trabajo import get_db
 from app.infrastructure.db.repositories.plantilla_proceso_repository_sql import PlantillaProcesoRepositorySQL
 
 from app.domain.entities.plantilla_proceso import PlantillaProceso
 
 router = APIRouter(prefix="/plantilla-procesos", tags=["PlantillaProceso"])
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-def get_repo(db: Session = Depends(get_db)):
+def get_repo(db: Session = Depends(get_db, scope="function")):
     return PlantillaProcesoRepositorySQL(db)
 
 @router.post("/", summary="Crear relación plantilla-proceso",
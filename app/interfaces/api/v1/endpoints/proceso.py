@@ -1,25 +1,28 @@
 from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, Query, Path, Body
 from sqlalchemy.orm import Session
-from app.infrastructure.db.database import SessionLocal
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.infrastructure.db.unidad_trabajo import get_db
+from app.infrastructure.db.database_async import get_async_db
 from app.infrastructure.db.repositories.proceso_repository_sql import ProcesoRepositorySQL
+from app.infrastructure.db.repositories.proceso_repository_async import ProcesoRepositoryAsync
 
 from app.application.use_cases.procesos.crear_proceso import crear_proceso
 from app.application.use_cases.procesos.update_proceso import actualizar_proceso
 from app.application.use_cases.procesos.listar_procesos_cliente_por_empleado import listar_procesos_cliente_por_empleado
+from app.domain.repositories.consulta_listado import ConsultaListado
+from app.interfaces.api.consulta_listado import parametros_listado
+from app.interfaces.api.etag import etag_catalogo
+from app.interfaces.schemas.proceso import ProcesosPaginadosResponse
 
 router = APIRouter(prefix="/procesos", tags=["Proceso"])
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-def get_repo(db: Session = Depends(get_db)):
+def get_repo(db: Session = Depends(get_db, scope="function")):
     return ProcesoRepositorySQL(db)
 
+def get_repo_async(db: AsyncSession = Depends(get_async_db)):
+    return ProcesoRepositoryAsync(db)
+
 @router.post("/", summary="Crear un nuevo proceso",
     description="Crea un proceso especificando nombre, frecuencia, temporalidad y fechas.")
 def crear(
@@ -34,51 +37,22 @@ def crear(
 ):
     return crear_proceso(data, repo)
 
-@router.get("/habilitados", summary="Listar procesos habilitados",
+@router.get("/habilitados", dependencies=[Depends(etag_catalogo("proceso"))], summary="Listar procesos habilitados",
     description="Devuelve solo los procesos que están habilitados (habilitado=True).")
 def listar_habilitados(repo = Depends(get_repo)):
     return repo.listar_habilitados()
 
-@router.get("/", summary="Listar todos los procesos",
+@router.get("/", dependencies=[Depends(etag_catalogo("proceso"))], response_model=ProcesosPaginadosResponse,
+    summary="Listar todos los procesos",
     description="Devuelve todos los procesos registrados en el sistema.")
 def listar(
-    page: Optional[int] = Query(None, ge=1, description="Página actual"),
-    limit: Optional[int] = Query(None, ge=1, le=100, description="Cantidad de resultados por página"),
-    sort_field: Optional[str] = Query(None, description="Campo por el cual ordenar"),
-    sort_direction: Optional[str] = Query("asc", regex="^(asc|desc)$", description="Dirección de ordenación: asc o desc"),
+    consulta: ConsultaListado = Depends(parametros_listado()),
     repo = Depends(get_repo)
 ):
-    procesos = repo.listar()
-    total = len(procesos)
-
-    # Aplicar ordenación si se especifica
-    if sort_field and hasattr(procesos[0] if procesos else None, sort_field):
-        reverse = sort_direction == "desc"
-
-        # Función de ordenación que maneja valores None
-        def sort_key(proceso):
-            value = getattr(proceso, sort_field, None)
-            if value is None:
-                return ""  # Los valores None van al final
-
-            # Manejo especial para diferentes tipos de campos
-            if sort_field in ["id", "frecuencia"]:
-                try:
-                    return int(value)
-                except (ValueError, TypeError):
-                    return 0
-            else:
-                # Para campos de texto (nombre, descripcion, temporalidad),
-                # convertir a minúsculas para ordenación insensible a mayúsculas
-                return str(value).lower()
-
-        procesos.sort(key=sort_key, reverse=reverse)
-
-    # Aplicar paginación después de ordenar
-    if page is not None and limit is not None:
-        start = (page - 1) * limit
-        end = start + limit
-        procesos = procesos[start:end]
+    try:
+        procesos, total = repo.listar_paginado(consulta)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
     if not procesos:
         raise HTTPException(status_code=404, detail="No se encontraron procesos")
@@ -88,7 +62,7 @@ def listar(
         "procesos": procesos
     }
 
-@router.get("/{id}", summary="Obtener proceso por ID",
+@router.get("/{id}", dependencies=[Depends(etag_catalogo("proceso"))], summary="Obtener proceso por ID",
     description="Devuelve los datos de un proceso específico según su ID.")
 def get_proceso(
     id: int = Path(..., description="ID del proceso a consultar"),
@@ -130,17 +104,17 @@ def delete_proceso(
 
 @router.get("/procesos-cliente-por-empleado", summary="Listar procesos por cliente/empleado",
     description="Devuelve todos los procesos asociados a los clientes del empleado indicado. Se puede filtrar por mes y año.")
-def procesos_cliente_por_empleado(
+async def procesos_cliente_por_empleado(
     email: str = Query(..., description="Email del empleado que hace la consulta"),
     mes: Optional[int] = Query(None, ge=1, le=12, description="Mes de inicio (1-12)"),
     anio: Optional[int] = Query(None, ge=2000, le=2100, description="Año de inicio (ej: 2024)"),
-    repo = Depends(get_repo)
+    repo = Depends(get_repo_async)
 ):
     """
     Devuelve en UNA sola llamada todos los procesos (con sus hitos) de los clientes
     que gestiona el empleado identificado por su correo.
     """
-    return listar_procesos_cliente_por_empleado(
+    return await listar_procesos_cliente_por_empleado(
         email=email,
         repo=repo,
         mes=mes,
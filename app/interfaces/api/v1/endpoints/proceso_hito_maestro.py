@@ -1,20 +1,13 @@
 from fastapi import APIRouter, Depends, HTTPException, Body, Path
 from sqlalchemy.orm import Session
-from app.infrastructure.db.database import SessionLocal
+from app.infrastructure.db.unidad_trabajo import get_db
 from app.infrastructure.db.repositories.proceso_hito_maestro_repository_sql import ProcesoHitoMaestroRepositorySQL
 from app.domain.entities.proceso_hito_maestro import ProcesoHitoMaestro
 
 
 router = APIRouter(prefix="/proceso-hitos", tags=["ProcesoHitoMaestro"])
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-def get_repo(db: Session = Depends(get_db)):
+def get_repo(db: Session = Depends(get_db, scope="function")):
     return ProcesoHitoMaestroRepositorySQL(db)
 
 @router.post("/", summary="Crear relación proceso-hito",
@@ -0,0 +1,256 @@
+import asyncio
+import logging
+import time
+import uuid
+from abc import ABC, abstractmethod
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Deque, Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import delete, func, insert, select
+from starlette.concurrency import run_in_threadpool
+
+from app.infrastructure.db.models.ws_evento_model import WsEventoModel
+
+logger = logging.getLogger(__name__)
+
+# (message, cod_subdepars): hands an already serialized message to the local sockets
+Deliver = Callable[[str, List[str]], Awaitable[None]]
+# Departments with at least one socket in this worker
+Subscriptions = Callable[[], Iterable[str]]
+
+
+class WebsocketBroker(ABC):
+    """
+    Routes department messages to every worker that holds sockets for them.
+
+    Messages are always delivered to this worker's sockets right away; backends
+    that span several processes also forward them to the other workers.
+    """
+
+    name = "base"
+
+    def __init__(self, deliver: Deliver, subscriptions: Subscriptions):
+        self._deliver = deliver
+        self._subscriptions = subscriptions
+        self.published = 0
+        self.received = 0
+        self.errors = 0
+
+    async def start(self) -> None:
+        """Called on application startup, with the event loop running"""
+
+    async def stop(self) -> None:
+        """Called on application shutdown"""
+
+    @abstractmethod
+    async def publish(self, cod_subdepars: List[str], message: str) -> None:
+        ...
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "backend": self.name,
+            "published": self.published,
+            "received": self.received,
+            "errors": self.errors,
+        }
+
+
+class MemoryBroker(WebsocketBroker):
+    """Single-process backend: every socket lives in this worker"""
+
+    name = "memory"
+
+    async def publish(self, cod_subdepars: List[str], message: str) -> None:
+        self.published += 1
+        await self._deliver(message, cod_subdepars)
+
+
+class SqlPollingBroker(WebsocketBroker):
+    """
+    Multi-worker backend over the ws_evento table.
+
+    publish delivers locally and inserts one row per department. Each worker polls
+    for new rows, restricted to the departments it currently has sockets for and
+    skipping its own rows. Rows older than the retention window are purged by
+    whichever worker gets there first.
+
+    IDENTITY values are assigned at insert but only become visible at commit, so a
+    row can appear below an id that was already polled. Each poll therefore re-scans
+    from the highest id seen late_commit_seconds ago and skips the ids it has already
+    handled; a row whose insert takes longer than that to commit is still lost.
+    """
+
+    name = "sql"
+
+    def __init__(
+        self,
+        deliver: Deliver,
+        subscriptions: Subscriptions,
+        session_factory: Callable[[], Any],
+        poll_interval_ms: int = 250,
+        retention_seconds: int = 300,
+        late_commit_seconds: float = 5,
+    ):
+        super().__init__(deliver, subscriptions)
+        self._session_factory = session_factory
+        self.poll_interval = max(10, poll_interval_ms) / 1000.0
+        self.retention = max(1, retention_seconds)
+        self.late_commit = max(0.0, late_commit_seconds)
+        self.worker_id = uuid.uuid4().hex
+        self._last_id = 0
+        # (monotonic time, highest id seen) per poll, back to the re-scan floor
+        self._history: Deque[Tuple[float, int]] = deque()
+        # Ids above the floor already handled (delivered or not for us)
+        self._seen: Set[int] = set()
+        self._last_purge = 0.0
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        # Only messages published from now on: a restarting worker has no sockets to catch up
+        self._last_id = await run_in_threadpool(self._max_id)
+        self._history.append((time.monotonic(), self._last_id))
+        self._last_purge = time.monotonic()
+        self._task = asyncio.create_task(self._poll_loop())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def publish(self, cod_subdepars: List[str], message: str) -> None:
+        self.published += 1
+        await self._deliver(message, cod_subdepars)
+        if not cod_subdepars:
+            return
+        try:
+            await run_in_threadpool(self._insert, cod_subdepars, message)
+        except Exception as e:
+            self.errors += 1
+            logger.error(f"Failed to forward websocket message to other workers: {e}")
+
+    def _max_id(self) -> int:
+        session = self._session_factory()
+        try:
+            return session.execute(select(func.max(WsEventoModel.id))).scalar() or 0
+        finally:
+            session.close()
+
+    def _insert(self, cod_subdepars: List[str], message: str) -> None:
+        now = datetime.utcnow()
+        session = self._session_factory()
+        try:
+            session.execute(insert(WsEventoModel), [
+                {"cod_subdepar": cod, "payload": message, "origen": self.worker_id, "creado": now}
+                for cod in cod_subdepars
+            ])
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+
+    def _floor(self, now: float) -> int:
+        """Highest id seen at least late_commit seconds ago: ids above it may still show up"""
+        while len(self._history) > 1 and now - self._history[1][0] >= self.late_commit:
+            self._history.popleft()
+        return self._history[0][1] if self._history else self._last_id
+
+    def _fetch(self, cod_subdepars: List[str]) -> Dict[str, List[str]]:
+        """New rows since the re-scan floor for our departments, grouped as {payload: [cods]}"""
+        now = time.monotonic()
+        floor = self._floor(now)
+        session = self._session_factory()
+        try:
+            # Ids only, for every department and origin: the rows not handled yet
+            ids = session.execute(select(WsEventoModel.id).where(WsEventoModel.id > floor)).scalars().all()
+            new = set(ids) - self._seen
+            messages: Dict[str, List[str]] = {}
+            if new and cod_subdepars:
+                rows = session.execute(
+                    select(WsEventoModel.id, WsEventoModel.cod_subdepar, WsEventoModel.payload)
+                    .where(
+                        WsEventoModel.id >= min(new),
+                        WsEventoModel.id <= max(new),
+                        WsEventoModel.origen != self.worker_id,
+                        WsEventoModel.cod_subdepar.in_(cod_subdepars),
+                    )
+                    .order_by(WsEventoModel.id)
+                ).all()
+                for row_id, cod, payload in rows:
+                    if row_id in new:
+                        messages.setdefault(payload, []).append(cod)
+            # Departments without sockets here are skipped, not kept for later
+            self._seen |= new
+            self._last_id = max(self._last_id, max(ids, default=floor))
+            self._history.append((now, self._last_id))
+            self._seen = {i for i in self._seen if i > self._floor(now)}
+            return messages
+        finally:
+            session.close()
+
+    def _purge(self) -> None:
+        session = self._session_factory()
+        try:
+            limit = datetime.utcnow() - timedelta(seconds=self.retention)
+            session.execute(delete(WsEventoModel).where(WsEventoModel.creado < limit))
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+
+    async def _poll_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            try:
+                messages = await run_in_threadpool(self._fetch, list(self._subscriptions()))
+                for message, cods in messages.items():
+                    self.received += 1
+                    await self._deliver(message, cods)
+                if time.monotonic() - self._last_purge >= self.retention:
+                    self._last_purge = time.monotonic()
+                    await run_in_threadpool(self._purge)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.errors += 1
+                logger.error(f"Websocket broker poll failed: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **super().stats(),
+            "worker_id": self.worker_id,
+            "last_id": self._last_id,
+            "rescan_from_id": self._history[0][1] if self._history else self._last_id,
+            "subscriptions": len(list(self._subscriptions())),
+        }
+
+
+def create_broker(
+    backend: str,
+    deliver: Deliver,
+    subscriptions: Subscriptions,
+    poll_interval_ms: int = 250,
+    retention_seconds: int = 300,
+    session_factory: Optional[Callable[[], Any]] = None,
+    late_commit_seconds: float = 5,
+) -> WebsocketBroker:
+    """Build the backend named by settings.WS_BROKER ('memory' or 'sql')"""
+    backend = (backend or "memory").strip().lower()
+    if backend == "memory":
+        return MemoryBroker(deliver, subscriptions)
+    if backend == "sql":
+        if session_factory is None:
+            from app.infrastructure.db.database import SessionLocal
+            session_factory = SessionLocal
+        return SqlPollingBroker(
+            deliver, subscriptions, session_factory, poll_interval_ms, retention_seconds, late_commit_seconds
+        )
+    raise ValueError(f"Unknown websocket broker backend: {backend}")
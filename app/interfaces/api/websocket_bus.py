@@ -0,0 +1,157 @@
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterable, List, Optional, Tuple
+
+from starlette.concurrency import run_in_threadpool
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# (clave, ref) -> [(cod_subdepar, datos extra para el payload)]
+Destinos = Dict[Tuple[str, Hashable], List[Tuple[str, Dict[str, Any]]]]
+Resolver = Callable[[Iterable[Tuple[str, Hashable]]], Destinos]
+# (cods_subdepar, tipo, datos): un mismo payload para varios subdepartamentos
+Emisor = Callable[[List[str], str, Dict[str, Any]], Awaitable[None]]
+
+
+class EventoWebsocket:
+    """
+    Evento de escritura pendiente de difundir.
+
+    - tipo: tipo de mensaje para el front (p.ej. 'proceso_actualizado').
+    - clave/ref: cómo localizar los subdepartamentos afectados ('proceso', 12).
+    - datos: payload base; el resolver puede completar campos leídos de BD.
+    """
+
+    __slots__ = ("tipo", "clave", "ref", "datos", "encolado")
+
+    def __init__(self, tipo: str, clave: str, ref: Hashable, datos: Dict[str, Any]):
+        self.tipo = tipo
+        self.clave = clave
+        self.ref = ref
+        self.datos = datos
+        self.encolado = time.monotonic()
+
+
+class BusEventosWebsocket:
+    """
+    Bus asyncio en proceso entre el middleware de escrituras y los websockets.
+
+    El middleware publica sin esperar; un despachador en segundo plano agrupa los
+    eventos en lotes, resuelve sus subdepartamentos con una sola llamada al resolver
+    (una sesión y una consulta por tipo de clave) y los difunde. Si la cola se llena
+    se descarta el evento más antiguo.
+    """
+
+    def __init__(self, max_eventos: int, tam_lote: int, espera_ms: int):
+        self.max_eventos = max_eventos
+        self.tam_lote = max(1, tam_lote)
+        self.espera = max(0, espera_ms) / 1000.0
+        self._cola: Optional[asyncio.Queue] = None
+        self._tarea: Optional[asyncio.Task] = None
+        self._resolver: Optional[Resolver] = None
+        self._emisor: Optional[Emisor] = None
+
+        self.publicados = 0
+        self.despachados = 0
+        self.descartados = 0
+        self.errores = 0
+        self.lotes = 0
+        self.lag_ultimo_ms = 0.0
+        self.lag_max_ms = 0.0
+
+    def iniciar(self, resolver: Resolver, emisor: Emisor):
+        """Crea la cola y lanza el despachador; debe llamarse con el event loop en marcha"""
+        self._resolver = resolver
+        self._emisor = emisor
+        self._cola = asyncio.Queue(maxsize=self.max_eventos)
+        self._tarea = asyncio.create_task(self._bucle())
+
+    async def detener(self):
+        if self._tarea:
+            self._tarea.cancel()
+            try:
+                await self._tarea
+            except asyncio.CancelledError:
+                pass
+            self._tarea = None
+
+    def publicar(self, evento: EventoWebsocket) -> bool:
+        """Encola sin bloquear. Devuelve False si el bus no está en marcha."""
+        if self._cola is None:
+            self.descartados += 1
+            return False
+        if self._cola.full():
+            self._cola.get_nowait()
+            self.descartados += 1
+        self._cola.put_nowait(evento)
+        self.publicados += 1
+        return True
+
+    async def _siguiente_lote(self) -> List[EventoWebsocket]:
+        lote = [await self._cola.get()]
+        # Pequeña ventana para agrupar ráfagas de escrituras en la misma resolución
+        if self.espera:
+            await asyncio.sleep(self.espera)
+        while len(lote) < self.tam_lote and not self._cola.empty():
+            lote.append(self._cola.get_nowait())
+        return lote
+
+    async def _bucle(self):
+        while True:
+            lote = await self._siguiente_lote()
+            try:
+                await self._despachar(lote)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.errores += 1
+                logger.error(f"Error despachando lote de {len(lote)} eventos websocket: {e}")
+
+    async def _despachar(self, lote: List[EventoWebsocket]):
+        destinos = await run_in_threadpool(self._resolver, [(e.clave, e.ref) for e in lote])
+        for evento in lote:
+            # Los subdepartamentos con los mismos datos extra comparten un único envío
+            grupos: List[Tuple[Dict[str, Any], List[str]]] = []
+            for cod, extra in destinos.get((evento.clave, evento.ref), []):
+                for extra_grupo, cods in grupos:
+                    if extra_grupo == extra:
+                        cods.append(cod)
+                        break
+                else:
+                    grupos.append((extra, [cod]))
+            for extra, cods in grupos:
+                datos = dict(evento.datos)
+                datos.update(extra)
+                await self._emisor(cods, evento.tipo, datos)
+            self._registrar_lag(evento)
+        self.lotes += 1
+
+    def _registrar_lag(self, evento: EventoWebsocket):
+        lag = (time.monotonic() - evento.encolado) * 1000.0
+        self.lag_ultimo_ms = lag
+        self.lag_max_ms = max(self.lag_max_ms, lag)
+        self.despachados += 1
+
+    def metricas(self) -> Dict[str, Any]:
+        return {
+            "activo": self._tarea is not None and not self._tarea.done(),
+            "pendientes": self._cola.qsize() if self._cola else 0,
+            "capacidad": self.max_eventos,
+            "publicados": self.publicados,
+            "despachados": self.despachados,
+            "descartados": self.descartados,
+            "errores": self.errores,
+            "lotes": self.lotes,
+            "lag_ultimo_ms": round(self.lag_ultimo_ms, 2),
+            "lag_max_ms": round(self.lag_max_ms, 2),
+        }
+
+
+bus_eventos = BusEventosWebsocket(
+    max_eventos=settings.WS_BUS_MAX_EVENTOS,
+    tam_lote=settings.WS_BUS_TAM_LOTE,
+    espera_ms=settings.WS_BUS_ESPERA_MS,
+)
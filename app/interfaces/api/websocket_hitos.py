@@ -1,7 +1,8 @@
 from fastapi import WebSocket, WebSocketDisconnect, Depends, status, APIRouter
 from fastapi.exceptions import WebSocketException
 from sqlalchemy.orm import Session
-from typing import Dict, Optional, Any
+from typing import Dict, Optional, Any, Iterable, List
+import asyncio
 import json
 import jwt
 from datetime import datetime
@@ -9,7 +10,8 @@ import logging
 import importlib
 
 from app.config import settings
-from app.infrastructure.db.database import get_db
+from app.infrastructure.db.unidad_trabajo import get_db
+from app.interfaces.api.websocket_broker import create_broker
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -52,13 +54,38 @@ DepartamentoModel = _try_import_model(
 # WebSocket router
 router = APIRouter(tags=["WebSockets"])
 
+class ClientConnection:
+    """Outbound side of one socket: a bounded message queue drained by its own writer task"""
+
+    __slots__ = ("client_id", "cod_subdepar", "websocket", "queue", "task", "dropped")
+
+    def __init__(self, client_id: str, cod_subdepar: str, websocket: WebSocket, max_queue: int):
+        self.client_id = client_id
+        self.cod_subdepar = cod_subdepar
+        self.websocket = websocket
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max(1, max_queue))
+        self.task: Optional[asyncio.Task] = None
+        self.dropped = 0
+
+    def enqueue(self, message: str) -> None:
+        """Never blocks: with a full queue the oldest pending message is dropped"""
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+        self.queue.put_nowait(message)
+
+
 class ConnectionManager:
     """Manages active WebSocket connections grouped by department code"""
     
-    def __init__(self):
-        # Format: {cod_subdepar: {client_id: WebSocket}}
-        self.active_connections: Dict[str, Dict[str, WebSocket]] = {}
+    def __init__(self, max_queue: int = 256, send_timeout: float = 5.0):
+        # Format: {cod_subdepar: {client_id: ClientConnection}}
+        self.active_connections: Dict[str, Dict[str, ClientConnection]] = {}
         self.connection_count = 0
+        self.max_queue = max_queue
+        self.send_timeout = send_timeout
+        self.dropped_total = 0
+        self.slow_disconnects = 0
     
     async def connect(self, websocket: WebSocket, cod_subdepar: str) -> str:
         """Connect a client to a specific department channel"""
@@ -72,8 +99,10 @@ class ConnectionManager:
         if cod_subdepar not in self.active_connections:
             self.active_connections[cod_subdepar] = {}
         
-        # Add connection to department
-        self.active_connections[cod_subdepar][client_id] = websocket
+        # Add connection to department and start its writer
+        connection = ClientConnection(client_id, cod_subdepar, websocket, self.max_queue)
+        connection.task = asyncio.create_task(self._writer(connection))
+        self.active_connections[cod_subdepar][client_id] = connection
         
         logger.info(f"Client {client_id} connected to department {cod_subdepar}")
         logger.info(f"Active connections: {sum(len(conns) for conns in self.active_connections.values())}")
@@ -83,7 +112,10 @@ class ConnectionManager:
     def disconnect(self, cod_subdepar: str, client_id: str) -> None:
         """Remove a client connection"""
         if cod_subdepar in self.active_connections and client_id in self.active_connections[cod_subdepar]:
-            del self.active_connections[cod_subdepar][client_id]
+            connection = self.active_connections[cod_subdepar].pop(client_id)
+            self.dropped_total += connection.dropped
+            if connection.task and connection.task is not asyncio.current_task():
+                connection.task.cancel()
             
             # Clean up empty department entries
             if not self.active_connections[cod_subdepar]:
@@ -92,37 +124,87 @@ class ConnectionManager:
             logger.info(f"Client {client_id} disconnected from department {cod_subdepar}")
             logger.info(f"Active connections: {sum(len(conns) for conns in self.active_connections.values())}")
     
+    async def _writer(self, connection: ClientConnection) -> None:
+        """Send queued messages to one socket; a failed or stalled send drops the client"""
+        try:
+            while True:
+                message = await connection.queue.get()
+                await asyncio.wait_for(connection.websocket.send_text(message), timeout=self.send_timeout)
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            if isinstance(e, asyncio.TimeoutError):
+                self.slow_disconnects += 1
+                logger.error(f"Client {connection.client_id} did not accept a message within {self.send_timeout}s")
+            else:
+                logger.error(f"Failed to send message to client {connection.client_id}: {e}")
+            self.disconnect(connection.cod_subdepar, connection.client_id)
+            try:
+                await connection.websocket.close(code=status.WS_1011_INTERNAL_ERROR)
+            except Exception:
+                pass
+    
     async def send_personal_message(self, message: str, websocket: WebSocket) -> None:
         """Send a message to a specific client"""
         await websocket.send_text(message)
     
     async def broadcast(self, message: Any, cod_subdepar: str) -> None:
         """Broadcast a message to all clients in a department"""
-        if cod_subdepar not in self.active_connections:
-            logger.info(f"No active connections for department {cod_subdepar}")
-            return
-        
-        # Convert dict to JSON string if needed
+        await self.broadcast_many(message, [cod_subdepar])
+
+    async def broadcast_many(self, message: Any, cod_subdepars: Iterable[str]) -> None:
+        """
+        Broadcast one message to every client of several departments.
+
+        The message is serialized once and the same string is queued for each
+        recipient; delivery happens concurrently in the per-connection writers,
+        so a slow client only delays (and eventually drops) its own messages.
+        """
+        # Convert dict to JSON string once for every recipient
         if isinstance(message, dict):
             message = json.dumps(message)
         
-        disconnected = []
-        for client_id, connection in self.active_connections[cod_subdepar].items():
-            try:
-                await connection.send_text(message)
-            except Exception as e:
-                logger.error(f"Failed to send message to client {client_id}: {e}")
-                disconnected.append((cod_subdepar, client_id))
-        
-        # Clean up any failed connections
-        for dept, client in disconnected:
-            self.disconnect(dept, client)
+        for cod_subdepar in cod_subdepars:
+            connections = self.active_connections.get(cod_subdepar)
+            if not connections:
+                logger.info(f"No active connections for department {cod_subdepar}")
+                continue
+            for connection in connections.values():
+                connection.enqueue(message)
+
+    def departments(self) -> List[str]:
+        """Departments with at least one socket in this worker"""
+        return list(self.active_connections)
+
+    def stats(self) -> Dict[str, Any]:
+        connections = [c for conns in self.active_connections.values() for c in conns.values()]
+        return {
+            "departments": len(self.active_connections),
+            "connections": len(connections),
+            "max_queue_depth": max((c.queue.qsize() for c in connections), default=0),
+            "dropped_messages": self.dropped_total + sum(c.dropped for c in connections),
+            "slow_disconnects": self.slow_disconnects,
+        }
 
 # Create global connection manager instance
-manager = ConnectionManager()
+manager = ConnectionManager(
+    max_queue=settings.WS_CLIENT_QUEUE_SIZE,
+    send_timeout=settings.WS_SEND_TIMEOUT_SECONDS,
+)
+
+# Cross-worker delivery: every broadcast goes through the broker, which hands it
+# to the local manager and, with the 'sql' backend, to the other workers
+broker = create_broker(
+    settings.WS_BROKER,
+    deliver=manager.broadcast_many,
+    subscriptions=manager.departments,
+    poll_interval_ms=settings.WS_BROKER_POLL_MS,
+    retention_seconds=settings.WS_BROKER_RETENTION_SECONDS,
+    late_commit_seconds=settings.WS_BROKER_LATE_COMMIT_SECONDS,
+)
 
 async def get_current_user_from_token(
-    token: Optional[str], db: Session = Depends(get_db)
+    token: Optional[str], db: Session = Depends(get_db, scope="function")
 ) -> Any:
     """Validate JWT and (best-effort) user existence. Returns a dict with username."""
     if not token:
@@ -149,7 +231,7 @@ async def get_current_user_from_token(
 async def validate_department_access(
     cod_subdepar: str,
     user: Any,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db, scope="function")
 ) -> None:
     """Best-effort department validation (skipped if model not found)."""
     if DepartamentoModel is None:
@@ -166,7 +248,7 @@ async def validate_department_access(
 async def websocket_hitos_endpoint(
     websocket: WebSocket,
     cod_subdepar: str,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_db, scope="function"),
 ):
     """WebSocket endpoint for real-time hito updates by department"""
     client_id: Optional[str] = None
@@ -178,6 +260,9 @@ async def websocket_hitos_endpoint(
         # Validate department access (best-effort)
         await validate_department_access(cod_subdepar, user, db)
 
+        # The socket may stay open for hours: give the pooled connection back now
+        db.close()
+
         # Accept connection and register client
         client_id = await manager.connect(websocket, cod_subdepar)
 
@@ -250,7 +335,7 @@ async def websocket_hitos_endpoint(
                 obj["tipo"] = "hito_actualizado"
 
                 # Reenviar a todos los clientes del mismo departamento
-                await manager.broadcast(obj, cod_subdepar)
+                await broker.publish([cod_subdepar], json.dumps(obj))
                 logger.info(
                     f"Broadcast hito_actualizado dept={cod_subdepar} id={cliente_proceso_hito_id} estado={nuevo_estado}"
                 )
@@ -305,7 +390,8 @@ async def broadcast_hito_update(cod_subdepar: str, hito_data: dict):
     if isinstance(hito_data, dict) and "tipo" not in hito_data:
         hito_data["tipo"] = "hito_actualizado"
     
-    await manager.broadcast(hito_data, cod_subdepar)
+    message = json.dumps(hito_data) if isinstance(hito_data, dict) else hito_data
+    await broker.publish([cod_subdepar], message)
     logger.info(f"Broadcast hito update to department {cod_subdepar}")
 
 
@@ -321,6 +407,15 @@ async def broadcast_departament_event(cod_subdepar: str, tipo: str, data: Option
     - tipo: Event type string (e.g., 'proceso_actualizado', 'hito_actualizado')
     - data: Optional dict payload to include with the event
     """
+    await broadcast_departments_event([cod_subdepar], tipo, data)
+
+
+async def broadcast_departments_event(cod_subdepars: Iterable[str], tipo: str, data: Optional[dict] = None):
+    """
+    Same as broadcast_departament_event for several subdepartments at once:
+    the payload is built and serialized once and shared by every recipient.
+    """
+    cod_subdepars = list(cod_subdepars)
     payload: Dict[str, Any] = {}
     if isinstance(data, dict):
         payload.update(data)
@@ -328,5 +423,5 @@ async def broadcast_departament_event(cod_subdepar: str, tipo: str, data: Option
     payload.setdefault("tipo", tipo)
     payload.setdefault("timestamp", datetime.now().isoformat())
 
-    await manager.broadcast(payload, cod_subdepar)
-    logger.info(f"Broadcast event '{tipo}' to department {cod_subdepar}")
+    await broker.publish(cod_subdepars, json.dumps(payload))
+    logger.info(f"Broadcast event '{tipo}' to departments {', '.join(cod_subdepars)}")
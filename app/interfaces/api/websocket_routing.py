@@ -0,0 +1,241 @@
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import bindparam, text
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+# SQL Server admits up to 2100 parameters per statement
+_MAX_REFS_POR_CONSULTA = 1000
+
+_SQL_CLIENTES = """
+    SELECT csd.id AS cliente_id, sd.codSubDePar AS cod
+    FROM [ATISA_Input].dbo.clienteSubDePar csd
+    JOIN [ATISA_Input].dbo.SubDePar sd ON sd.codSubDePar = csd.codSubDePar
+"""
+_SQL_CLIENTE_PROCESOS = """
+    SELECT cp.id, cp.cliente_id, cp.proceso_id
+    FROM [ATISA_Input].dbo.cliente_proceso cp
+"""
+_SQL_HITO_PROCESOS = """
+    SELECT phm.hito_id, phm.proceso_id
+    FROM [ATISA_Input].dbo.proceso_hito_maestro phm
+"""
+
+
+def _in_chunks(session: Session, sql: str, column: str, refs: Iterable[Hashable]):
+    """Run `sql WHERE column IN :refs` in chunks, yielding the rows"""
+    stmt = text(f"{sql} WHERE {column} IN :refs").bindparams(bindparam("refs", expanding=True))
+    refs = list(refs)
+    for start in range(0, len(refs), _MAX_REFS_POR_CONSULTA):
+        yield from session.execute(stmt, {"refs": refs[start:start + _MAX_REFS_POR_CONSULTA]}).all()
+
+
+class RoutingIndex:
+    """
+    In-memory map from event keys to the subdepartments that must be notified.
+
+    - cliente_id -> codSubDePar
+    - cliente_proceso_id -> cliente_id
+    - proceso_id -> {codSubDePar} of the clients that run it
+    - hito_id -> {proceso_id} that include it
+
+    The whole index is loaded at startup and reloaded every ttl_seconds. Between
+    reloads, refs that are not in the index are loaded on demand with a keyed query
+    (and remembered, also when they have no subdepartment), and write events feed
+    the relations they create through observe().
+    """
+
+    def __init__(self, session_factory: Callable[[], Session], ttl_seconds: int = 900):
+        self._session_factory = session_factory
+        self.ttl = max(1, ttl_seconds)
+        self._lock = threading.RLock()
+        self._cliente_cods: Dict[str, Tuple[str, ...]] = {}
+        self._cp_cliente: Dict[int, Optional[str]] = {}
+        self._proceso_cods: Dict[int, Set[str]] = {}
+        self._hito_procesos: Dict[int, Set[int]] = {}
+        self.loaded_at: Optional[float] = None
+        self.hits = 0
+        self.misses = 0
+
+    # --- Full load ---
+
+    def warm(self, session: Optional[Session] = None) -> None:
+        own_session = session is None
+        session = session or self._session_factory()
+        try:
+            cliente_cods: Dict[str, List[str]] = {}
+            for cliente_id, cod in session.execute(text(_SQL_CLIENTES)).all():
+                if cod:
+                    cliente_cods.setdefault(str(cliente_id).strip(), []).append(cod)
+            clientes = {k: tuple(sorted(set(v))) for k, v in cliente_cods.items()}
+
+            cp_cliente: Dict[int, Optional[str]] = {}
+            proceso_cods: Dict[int, Set[str]] = {}
+            for cp_id, cliente_id, proceso_id in session.execute(text(_SQL_CLIENTE_PROCESOS)).all():
+                cliente = str(cliente_id).strip() if cliente_id is not None else None
+                cp_cliente[cp_id] = cliente
+                proceso_cods.setdefault(proceso_id, set()).update(clientes.get(cliente, ()))
+
+            hito_procesos: Dict[int, Set[int]] = {}
+            for hito_id, proceso_id in session.execute(text(_SQL_HITO_PROCESOS)).all():
+                hito_procesos.setdefault(hito_id, set()).add(proceso_id)
+        finally:
+            if own_session:
+                session.close()
+
+        with self._lock:
+            self._cliente_cods = clientes
+            self._cp_cliente = cp_cliente
+            self._proceso_cods = proceso_cods
+            self._hito_procesos = hito_procesos
+            self.loaded_at = time.monotonic()
+        logger.info(
+            f"Websocket routing index loaded: {len(clientes)} clientes, {len(cp_cliente)} cliente_procesos, "
+            f"{len(proceso_cods)} procesos, {len(hito_procesos)} hitos"
+        )
+
+    def _stale(self) -> bool:
+        return self.loaded_at is None or time.monotonic() - self.loaded_at >= self.ttl
+
+    # --- On-demand loads for refs missing from the index ---
+
+    def _load_clientes(self, session: Session, ids: Set[str]) -> None:
+        found: Dict[str, Set[str]] = {i: set() for i in ids}
+        for cliente_id, cod in _in_chunks(session, _SQL_CLIENTES, "csd.id", ids):
+            if cod:
+                found.setdefault(str(cliente_id).strip(), set()).add(cod)
+        with self._lock:
+            for cliente_id, cods in found.items():
+                self._cliente_cods[cliente_id] = tuple(sorted(cods))
+
+    def _load_cliente_procesos(self, session: Session, ids: Set[int]) -> None:
+        found: Dict[int, Optional[str]] = {i: None for i in ids}
+        procesos: Dict[int, int] = {}
+        for cp_id, cliente_id, proceso_id in _in_chunks(session, _SQL_CLIENTE_PROCESOS, "cp.id", ids):
+            found[cp_id] = str(cliente_id).strip() if cliente_id is not None else None
+            procesos[cp_id] = proceso_id
+        self._ensure_clientes(session, {c for c in found.values() if c})
+        with self._lock:
+            self._cp_cliente.update(found)
+            for cp_id, proceso_id in procesos.items():
+                if proceso_id in self._proceso_cods:
+                    self._proceso_cods[proceso_id].update(self._cliente_cods.get(found[cp_id], ()))
+
+    def _load_procesos(self, session: Session, ids: Set[int]) -> None:
+        clientes: Dict[int, Set[str]] = {i: set() for i in ids}
+        for _, cliente_id, proceso_id in _in_chunks(session, _SQL_CLIENTE_PROCESOS, "cp.proceso_id", ids):
+            if cliente_id is not None:
+                clientes[proceso_id].add(str(cliente_id).strip())
+        self._ensure_clientes(session, {c for cs in clientes.values() for c in cs})
+        with self._lock:
+            for proceso_id, cs in clientes.items():
+                cods = self._proceso_cods.setdefault(proceso_id, set())
+                for cliente_id in cs:
+                    cods.update(self._cliente_cods.get(cliente_id, ()))
+
+    def _load_hitos(self, session: Session, ids: Set[int]) -> None:
+        found: Dict[int, Set[int]] = {i: set() for i in ids}
+        for hito_id, proceso_id in _in_chunks(session, _SQL_HITO_PROCESOS, "phm.hito_id", ids):
+            found[hito_id].add(proceso_id)
+        with self._lock:
+            for hito_id, procesos in found.items():
+                self._hito_procesos.setdefault(hito_id, set()).update(procesos)
+
+    def _ensure_clientes(self, session: Session, ids: Set[str]) -> None:
+        missing = {i for i in ids if i not in self._cliente_cods}
+        if missing:
+            self._load_clientes(session, missing)
+
+    def _ensure(self, session: Session, index: Dict[Any, Any], ids: Set[Any], loader) -> None:
+        missing = {i for i in ids if i not in index}
+        self.hits += len(ids) - len(missing)
+        self.misses += len(missing)
+        if missing:
+            loader(session, missing)
+
+    # --- Lookups ---
+
+    def resolve(self, session: Session, key: str, refs: Iterable[Hashable]) -> Dict[Hashable, List[str]]:
+        """
+        Subdepartments per ref for 'cliente', 'cliente_proceso', 'proceso' or 'hito',
+        sorted by code. Unknown keys return an empty dict.
+        """
+        if self._stale():
+            self.warm(session)
+
+        refs = [r for r in refs if r is not None]
+        result: Dict[Hashable, List[str]] = {}
+
+        if key == "cliente":
+            ids = {r: str(r).strip() for r in refs}
+            self._ensure(session, self._cliente_cods, set(ids.values()), self._load_clientes)
+            for ref, cliente_id in ids.items():
+                result[ref] = list(self._cliente_cods.get(cliente_id, ()))
+
+        elif key == "cliente_proceso":
+            self._ensure(session, self._cp_cliente, set(refs), self._load_cliente_procesos)
+            for ref in refs:
+                result[ref] = list(self._cliente_cods.get(self._cp_cliente.get(ref), ()))
+
+        elif key == "proceso":
+            self._ensure(session, self._proceso_cods, set(refs), self._load_procesos)
+            for ref in refs:
+                result[ref] = sorted(self._proceso_cods.get(ref, ()))
+
+        elif key == "hito":
+            self._ensure(session, self._hito_procesos, set(refs), self._load_hitos)
+            procesos = {p for ref in refs for p in self._hito_procesos.get(ref, ())}
+            self._ensure(session, self._proceso_cods, procesos, self._load_procesos)
+            for ref in refs:
+                cods: Set[str] = set()
+                for proceso_id in self._hito_procesos.get(ref, ()):
+                    cods.update(self._proceso_cods.get(proceso_id, ()))
+                result[ref] = sorted(cods)
+
+        return result
+
+    # --- Incremental updates from write events ---
+
+    def observe(self, tipo: str, datos: Dict[str, Any]) -> None:
+        """Record the relations created by a write before its event is resolved"""
+        try:
+            if tipo == "cliente_proceso_creado":
+                cliente_id, proceso_id = datos.get("cliente_id"), datos.get("proceso_id")
+                if cliente_id is None or proceso_id is None:
+                    return
+                proceso_id = int(proceso_id)
+                with self._lock:
+                    cods = self._proceso_cods.get(proceso_id)
+                    cliente_cods = self._cliente_cods.get(str(cliente_id).strip())
+                    if cods is not None and cliente_cods is not None:
+                        cods.update(cliente_cods)
+                    elif cods is not None:
+                        # Client not indexed yet: reload the proceso on its next event
+                        del self._proceso_cods[proceso_id]
+
+            elif tipo == "proceso_hitos_actualizado":
+                cambios = datos.get("cambios") or {}
+                hito_id, proceso_id = cambios.get("hito_id"), cambios.get("proceso_id")
+                if hito_id is None or proceso_id is None:
+                    return
+                with self._lock:
+                    procesos = self._hito_procesos.get(int(hito_id))
+                    if procesos is not None:
+                        procesos.add(int(proceso_id))
+        except (TypeError, ValueError):
+            pass
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "clientes": len(self._cliente_cods),
+            "cliente_procesos": len(self._cp_cliente),
+            "procesos": len(self._proceso_cods),
+            "hitos": len(self._hito_procesos),
+            "hits": self.hits,
+            "misses": self.misses,
+            "age_seconds": round(time.monotonic() - self.loaded_at, 1) if self.loaded_at else None,
+        }
@@ -0,0 +1,233 @@
+import json
+import logging
+import re
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+# (path params, parsed JSON body or None, allowed body fields) -> (ref, datos) or None to skip
+Builder = Callable[[Dict[str, int], Optional[dict], Dict[str, Any]], Optional[Tuple[Any, Dict[str, Any]]]]
+# (tipo, clave, ref, datos)
+Publisher = Callable[[str, str, Any, Dict[str, Any]], None]
+
+_PARAM = re.compile(r"\{(\w+)\}")
+
+
+class WriteEventRoute:
+    """
+    One write endpoint that emits a websocket event after a 2xx response.
+
+    - path: template such as '/procesos/{id}'; parameters are integer ids and a
+      trailing slash is optional.
+    - fields: body fields copied into 'cambios'. Only routes with fields (or
+      needs_body) read the request body, and only when it is JSON.
+    - build: returns (ref, datos) for the event, or None to emit nothing.
+    """
+
+    __slots__ = ("method", "path", "tipo", "clave", "fields", "needs_body", "build", "pattern", "segment")
+
+    def __init__(self, method: str, path: str, tipo: str, clave: str, build: Builder,
+                 fields: Iterable[str] = (), needs_body: bool = False):
+        self.method = method.upper()
+        self.path = path.rstrip("/") or "/"
+        self.tipo = tipo
+        self.clave = clave
+        self.fields = frozenset(fields)
+        self.needs_body = needs_body or bool(self.fields)
+        self.build = build
+        self.pattern = _compile(self.path)
+        self.segment = _first_segment(self.path)
+
+
+def _compile(path: str) -> "re.Pattern[str]":
+    parts, pos = [], 0
+    for m in _PARAM.finditer(path):
+        parts.append(re.escape(path[pos:m.start()]))
+        parts.append(f"(?P<{m.group(1)}>\\d+)")
+        pos = m.end()
+    parts.append(re.escape(path[pos:]))
+    return re.compile("^" + "".join(parts) + "/?$")
+
+
+def _first_segment(path: str) -> str:
+    return path.lstrip("/").split("/", 1)[0]
+
+
+class WriteEventRoutes:
+    """Routes compiled into {method: {first path segment: [route]}} for constant-time rejection"""
+
+    def __init__(self, routes: Iterable[WriteEventRoute]):
+        self._index: Dict[str, Dict[str, List[WriteEventRoute]]] = {}
+        for route in routes:
+            self._index.setdefault(route.method, {}).setdefault(route.segment, []).append(route)
+
+    def match(self, method: str, path: str) -> Optional[Tuple[WriteEventRoute, Dict[str, int]]]:
+        candidates = self._index.get(method, {}).get(_first_segment(path))
+        if not candidates:
+            return None
+        for route in candidates:
+            m = route.pattern.match(path)
+            if m:
+                return route, {k: int(v) for k, v in m.groupdict().items()}
+        return None
+
+
+def _cliente_proceso_creado(params, body, cambios):
+    if not isinstance(body, dict):
+        return None
+    # Support both keys: 'cliente_id' and legacy 'idcliente'
+    cliente_id = body.get("cliente_id")
+    if cliente_id is None:
+        cliente_id = body.get("idcliente")
+    if cliente_id is None:
+        return None
+    return cliente_id, {
+        "cliente_id": cliente_id,
+        # Support both keys: 'proceso_id' and legacy 'id_proceso'
+        "proceso_id": body.get("proceso_id", body.get("id_proceso")),
+        "cambios": cambios,
+    }
+
+
+def _proceso_hitos_actualizado(params, body, cambios):
+    # A change in proceso-hito relation affects all subdepars using that proceso
+    try:
+        proceso_id = int(body["proceso_id"])  # type: ignore[index]
+    except Exception:
+        return None
+    if not proceso_id:
+        return None
+    cambios["accion"] = "creado"
+    return proceso_id, {"proceso_id": proceso_id, "cambios": cambios}
+
+
+WRITE_EVENT_ROUTES: List[WriteEventRoute] = [
+    WriteEventRoute(
+        "PUT", "/procesos/{id}", "proceso_actualizado", "proceso",
+        fields={"nombre", "descripcion", "frecuencia", "temporalidad", "inicia_dia_1"},
+        build=lambda p, body, cambios: (p["id"], {"proceso_id": p["id"], "cambios": cambios}),
+    ),
+    WriteEventRoute(
+        "PUT", "/hitos/{id}", "hito_master_actualizado", "hito",
+        fields={"nombre", "descripcion", "fecha_limite", "hora_limite", "obligatorio", "tipo", "habilitado"},
+        build=lambda p, body, cambios: (p["id"], {"hito_id": p["id"], "cambios": cambios}),
+    ),
+    WriteEventRoute(
+        "POST", "/proceso-hitos", "proceso_hitos_actualizado", "proceso",
+        fields={"proceso_id", "hito_id"},
+        build=_proceso_hitos_actualizado,
+    ),
+    WriteEventRoute(
+        "POST", "/cliente-procesos", "cliente_proceso_creado", "cliente",
+        fields={"cliente_id", "idcliente", "proceso_id", "id_proceso", "fecha_inicio", "fecha_fin",
+                "mes", "anio", "anterior_id", "id_anterior"},
+        build=_cliente_proceso_creado,
+    ),
+    WriteEventRoute(
+        "PUT", "/cliente-procesos/{id}", "cliente_proceso_actualizado", "cliente_proceso",
+        fields={"fecha_inicio", "fecha_fin", "mes", "anio", "anterior_id"},
+        build=lambda p, body, cambios: (p["id"], {"cliente_proceso_id": p["id"], "cambios": cambios}),
+    ),
+    WriteEventRoute(
+        "POST", "/admin-hitos/departamento-hito/{id}", "hito_actualizado", "cliente_proceso_hito",
+        fields={"estado", "fecha_limite", "hora_limite", "tipo"},
+        # nuevo_estado e hito_id los completa el resolver con el valor ya guardado
+        build=lambda p, body, cambios: (p["id"], {
+            "cliente_proceso_hito_id": p["id"],
+            "nuevo_estado": None,
+            "hito_id": None,
+            "cambios": cambios,
+        }),
+    ),
+]
+
+
+def _is_json(scope: Scope) -> bool:
+    for name, value in scope.get("headers", ()):
+        if name == b"content-type":
+            return value.split(b";", 1)[0].strip().lower() == b"application/json"
+    return False
+
+
+class WriteEventMiddleware:
+    """
+    ASGI middleware that publishes the websocket event of a matched write route.
+
+    Requests that match no route are passed through untouched (uploads stream as
+    usual). For matched JSON routes the body is read once, replayed to the app and
+    parsed after a 2xx response to build the event.
+    """
+
+    def __init__(self, app: ASGIApp, routes: WriteEventRoutes, publish: Publisher):
+        self.app = app
+        self.routes = routes
+        self.publish = publish
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        matched = self.routes.match(scope["method"], scope["path"])
+        if matched is None:
+            await self.app(scope, receive, send)
+            return
+
+        route, params = matched
+        raw_body: Optional[bytes] = None
+        if route.needs_body and _is_json(scope):
+            raw_body, receive = await self._buffer(receive)
+
+        status = 0
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+        # Only emit if successful change (2xx)
+        if 200 <= status < 300:
+            self._emit(route, params, raw_body, scope)
+
+    @staticmethod
+    async def _buffer(receive: Receive) -> Tuple[bytes, Receive]:
+        """Read the whole body and return a receive that replays it, then defers to the server"""
+        chunks = []
+        while True:
+            message = await receive()
+            if message["type"] != "http.request":
+                break
+            chunks.append(message.get("body", b""))
+            if not message.get("more_body", False):
+                break
+        body = b"".join(chunks)
+        replayed = False
+
+        async def replay() -> Message:
+            nonlocal replayed
+            if not replayed:
+                replayed = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            return await receive()
+
+        return body, replay
+
+    def _emit(self, route: WriteEventRoute, params: Dict[str, int], raw_body: Optional[bytes], scope: Scope) -> None:
+        try:
+            body = None
+            if raw_body:
+                try:
+                    body = json.loads(raw_body)
+                except ValueError:
+                    body = None
+            cambios = {k: v for k, v in body.items() if k in route.fields} if isinstance(body, dict) else {}
+            event = route.build(params, body, cambios)
+            if event is not None:
+                ref, datos = event
+                self.publish(route.tipo, route.clave, ref, datos)
+        except Exception as e:
+            logger.error(f"Websocket emit middleware error for {scope['method']} {scope['path']}: {e}")
@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 
 class AuditoriaCalendariosCreate(BaseModel):
@@ -31,3 +31,17 @@ class AuditoriaCalendariosResponse(BaseModel):
 
     class Config:
         orm_mode = True
+
+class AuditoriaCalendariosDetalleResponse(AuditoriaCalendariosResponse):
+    """Registro completo, con las marcas de creación y modificación (listados)"""
+    created_at: datetime
+    updated_at: datetime
+
+class AuditoriaCalendariosPaginadosResponse(BaseModel):
+    total: int
+    auditoria_calendarios: List[AuditoriaCalendariosDetalleResponse]
+
+class AuditoriaCalendariosCursorResponse(BaseModel):
+    auditoria_calendarios: List[AuditoriaCalendariosDetalleResponse]
+    next_cursor: Optional[str] = None
+    limit: int
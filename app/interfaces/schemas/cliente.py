@@ -0,0 +1,23 @@
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+class ClienteResponse(BaseModel):
+    idcliente: str
+    cif: Optional[str] = None
+    cif_empresa: Optional[str] = None
+    razsoc: Optional[str] = None
+    direccion: Optional[str] = None
+    localidad: Optional[str] = None
+    provincia: Optional[str] = None
+    cpostal: Optional[str] = None
+    codigop: Optional[str] = None
+    pais: Optional[str] = None
+    cif_factura: Optional[str] = None
+
+    class Config:
+        orm_mode = True
+
+class ClientesPaginadosResponse(BaseModel):
+    total: int
+    clientes: List[ClienteResponse]
@@ -1,6 +1,6 @@
 from pydantic import BaseModel, validator
 from datetime import date
-from typing import Optional
+from typing import List, Optional
 
 class GenerarClienteProcesoRequest(BaseModel):
     cliente_id: str
@@ -12,3 +12,47 @@ class GenerarClienteProcesoRequest(BaseModel):
         if v:
             return v.strip()  # Elimina espacios al inicio y final
         return v
+
+class ParClienteProceso(BaseModel):
+    cliente_id: str
+    proceso_id: int
+
+    @validator('cliente_id')
+    def limpiar_cliente_id(cls, v: str) -> str:
+        if v:
+            return v.strip()
+        return v
+
+class GenerarCalendarioLoteRequest(BaseModel):
+    """Pares (cliente, proceso) explícitos, o una plantilla aplicada a una lista de clientes"""
+    pares: List[ParClienteProceso] = []
+    plantilla_id: Optional[int] = None
+    cliente_ids: List[str] = []
+    fecha_inicio: Optional[date] = None
+
+    @validator('cliente_ids', each_item=True)
+    def limpiar_cliente_ids(cls, v: str) -> str:
+        return v.strip() if v else v
+
+class ClienteProcesoResponse(BaseModel):
+    id: int
+    cliente_id: Optional[str] = None
+    proceso_id: int
+    fecha_inicio: date
+    fecha_fin: Optional[date] = None
+    mes: Optional[int] = None
+    anio: Optional[int] = None
+    anterior_id: Optional[int] = None
+    habilitado: bool
+
+    class Config:
+        orm_mode = True
+
+class ClienteProcesosCursorResponse(BaseModel):
+    cliente_procesos: List[ClienteProcesoResponse]
+    next_cursor: Optional[str] = None
+    limit: int
+
+class ClienteProcesosPorClienteResponse(BaseModel):
+    clienteProcesos: List[ClienteProcesoResponse]
+    total: int
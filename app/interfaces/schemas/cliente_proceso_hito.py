@@ -0,0 +1,23 @@
+from datetime import date, datetime, time
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+class ClienteProcesoHitoResponse(BaseModel):
+    id: int
+    cliente_proceso_id: int
+    hito_id: int
+    estado: str
+    fecha_estado: Optional[datetime] = None
+    fecha_limite: Optional[date] = None
+    hora_limite: Optional[time] = None
+    tipo: str
+    habilitado: bool
+
+    class Config:
+        orm_mode = True
+
+class ClienteProcesoHitosCursorResponse(BaseModel):
+    cliente_proceso_hitos: List[ClienteProcesoHitoResponse]
+    next_cursor: Optional[str] = None
+    limit: int
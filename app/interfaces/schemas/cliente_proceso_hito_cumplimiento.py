@@ -0,0 +1,25 @@
+from datetime import date, datetime, time
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+class ClienteProcesoHitoCumplimientoResponse(BaseModel):
+    id: int
+    cliente_proceso_hito_id: int
+    fecha: date
+    hora: time
+    observacion: Optional[str] = None
+    usuario: str
+    fecha_creacion: Optional[datetime] = None
+
+    class Config:
+        orm_mode = True
+
+class CumplimientosPaginadosResponse(BaseModel):
+    total: int
+    cumplimientos: List[ClienteProcesoHitoCumplimientoResponse]
+
+class CumplimientosCursorResponse(BaseModel):
+    cumplimientos: List[ClienteProcesoHitoCumplimientoResponse]
+    next_cursor: Optional[str] = None
+    limit: int
@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import List, Optional
 
 class DocumentalCategoriaCreate(BaseModel):
     cliente_id: str
@@ -15,3 +15,7 @@ class DocumentalCategoriaResponse(BaseModel):
 
     class Config:
         orm_mode = True
+
+class DocumentalCategoriasPaginadasResponse(BaseModel):
+    total: int
+    documental_categorias: List[DocumentalCategoriaResponse]
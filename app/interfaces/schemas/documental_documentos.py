@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import List, Optional
 
 class DocumentalDocumentosCreate(BaseModel):
     cliente_id: str
@@ -25,3 +25,7 @@ class DocumentalDocumentosResponse(BaseModel):
 
     class Config:
         orm_mode = True
+
+class DocumentalDocumentosPaginadosResponse(BaseModel):
+    total: int
+    documental_documentos: List[DocumentalDocumentosResponse]
@@ -1,5 +1,7 @@
 # app/interfaces/schemas/documento.py
 
+from typing import List, Optional
+
 from pydantic import BaseModel
 
 class DocumentoResponse(BaseModel):
@@ -11,3 +13,8 @@ class DocumentoResponse(BaseModel):
 
     class Config:
         orm_mode = True
+
+class DocumentosCursorResponse(BaseModel):
+    documentos: List[DocumentoResponse]
+    next_cursor: Optional[str] = None
+    limit: int
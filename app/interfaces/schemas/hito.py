@@ -0,0 +1,21 @@
+from datetime import date, time
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+class HitoResponse(BaseModel):
+    id: int
+    nombre: str
+    fecha_limite: date
+    hora_limite: Optional[time] = None
+    descripcion: Optional[str] = None
+    obligatorio: int
+    tipo: str
+    habilitado: int
+
+    class Config:
+        orm_mode = True
+
+class HitosPaginadosResponse(BaseModel):
+    total: int
+    hitos: List[HitoResponse]
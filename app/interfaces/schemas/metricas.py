@@ -50,4 +50,11 @@ class ResumenMetricasSchema(BaseModel):
     hitosCompletados: MetricaResumenNumericaSchema
     hitosPendientes: MetricaResumenNumericaSchema
     hitosVencidos: MetricaResumenNumericaSchema
-    clientesInactivos: MetricaResumenNumericaSchema
\ No newline at end of file
+    clientesInactivos: MetricaResumenNumericaSchema
+
+class DashboardMetricasSchema(BaseModel):
+    resumen: ResumenMetricasSchema
+    cumplimientoHitos: CumplimientoHitosSchema
+    hitosPorProceso: HitosPorProcesoSchema
+    tiempoResolucion: TiempoResolucionSchema
+    volumenMensual: VolumenMensualSchema
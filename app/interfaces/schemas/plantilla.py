@@ -0,0 +1,15 @@
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+class PlantillaResponse(BaseModel):
+    id: int
+    nombre: str
+    descripcion: Optional[str] = None
+
+    class Config:
+        orm_mode = True
+
+class PlantillasPaginadasResponse(BaseModel):
+    total: int
+    plantillas: List[PlantillaResponse]
@@ -0,0 +1,19 @@
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+class ProcesoResponse(BaseModel):
+    id: int
+    nombre: str
+    descripcion: Optional[str] = None
+    frecuencia: int
+    temporalidad: str
+    inicia_dia_1: int
+    habilitado: bool
+
+    class Config:
+        orm_mode = True
+
+class ProcesosPaginadosResponse(BaseModel):
+    total: int
+    procesos: List[ProcesoResponse]
@@ -0,0 +1,20 @@
+from datetime import date
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+class SubdeparResponse(BaseModel):
+    id: int
+    codidepar: Optional[str] = None
+    ceco: Optional[str] = None
+    codSubDepar: Optional[str] = None
+    nombre: Optional[str] = None
+    fechaini: Optional[date] = None
+    fechafin: Optional[date] = None
+
+    class Config:
+        orm_mode = True
+
+class SubdepartamentosPaginadosResponse(BaseModel):
+    total: int
+    subdepartamentos: List[SubdeparResponse]
@@ -12,7 +12,20 @@ from app.interfaces.api import auth_routes
 from app.interfaces.api.security.auth import get_current_user
 
 # WebSocket integration
-from app.interfaces.api.websocket_integration import configure_websockets
+from app.interfaces.api.websocket_integration import configure_websockets, routing_index as websocket_routing_index
+
+# Métricas del bus de eventos websocket
+from app.interfaces.api.websocket_bus import bus_eventos
+from app.interfaces.api.websocket_hitos import manager as websocket_manager, broker as websocket_broker
+
+# Métricas del pool de conexiones a la base de datos
+from app.infrastructure.db.database import engine_replica, metricas_pool
+from app.infrastructure.db.database_async import metricas_pool_async
+from app.infrastructure.db.enrutado_lectura import monitor_replica
+from app.infrastructure.db.compartido import catalogo_cache
+
+# Refresco en segundo plano del agregado diario de KPIs
+from app.infrastructure.jobs.refresco_kpi_hitos import configurar_refresco_kpi
 
 # Importa todos tus routers de la versión 1
 from app.interfaces.api.v1.endpoints import (
@@ -35,7 +48,8 @@ from app.interfaces.api.v1.endpoints import (
     subdepar,
     metricas,
     auditoria_calendarios,
-    admin_hitos_departamento
+    admin_hitos_departamento,
+    festivo
 )
 
 
@@ -91,9 +105,11 @@ app.include_router(subdepar.router,             dependencies=[Depends(get_curren
 app.include_router(metricas.router,             dependencies=[Depends(get_current_user)])
 app.include_router(auditoria_calendarios.router, dependencies=[Depends(get_current_user)])
 app.include_router(admin_hitos_departamento.router, dependencies=[Depends(get_current_user)])
+app.include_router(festivo.router,              dependencies=[Depends(get_current_user)])
 
 
 configure_websockets(app)
+configurar_refresco_kpi(app)
 
 # --- Health check opcional ---
 @app.get("/health", tags=["Status"])
@@ -102,4 +118,26 @@ def health_check():
         "status": "ok",
         "environment": settings.ENV_NAME if hasattr(settings, "ENV_NAME") else "default",
         "storage_root": settings.FILE_STORAGE_ROOT,
+        "cache_catalogos": catalogo_cache.stats(),
     }
+
+# --- Estado del bus de eventos websocket (profundidad de cola, lag, descartes) ---
+@app.get("/health/websockets", tags=["Status"])
+def websockets_health():
+    return {
+        **bus_eventos.metricas(),
+        "conexiones": websocket_manager.stats(),
+        "broker": websocket_broker.stats(),
+        "enrutado": websocket_routing_index.stats(),
+    }
+
+# --- Estado del pool de conexiones (en uso, libres, espera media/máxima del checkout) ---
+@app.get("/health/pool", tags=["Status"])
+def pool_health():
+    metricas = metricas_pool()
+    metricas_async = metricas_pool_async()
+    if metricas_async is not None:
+        metricas["async"] = metricas_async
+    if engine_replica is not None:
+        metricas["replica"] = {**metricas_pool(engine_replica), **monitor_replica.stats()}
+    return metricas
@@ -0,0 +1,56 @@
+import importlib
+import pkgutil
+from logging.config import fileConfig
+
+from alembic import context
+
+from app.infrastructure.db import models
+from app.infrastructure.db.database import Base, engine
+
+# Registra en Base.metadata todos los modelos, también los que models/__init__ no importa
+for modulo in pkgutil.iter_modules(models.__path__):
+    importlib.import_module(f"{models.__name__}.{modulo.name}")
+
+target_metadata = Base.metadata
+
+if context.config.config_file_name is not None:
+    fileConfig(context.config.config_file_name)
+
+
+def include_object(objeto, nombre, tipo, reflejado, comparado):
+    """
+    La base de datos compartida tiene tablas que la aplicación no modela (clienteSubDepar,
+    SubDePar...) e índices que solo declara indices.py; autogenerate no debe proponer
+    eliminarlos.
+    """
+    if reflejado and comparado is None and tipo in ("table", "index"):
+        return False
+    return True
+
+
+def run_migrations_offline() -> None:
+    context.configure(
+        url=engine.url.render_as_string(hide_password=False),
+        target_metadata=target_metadata,
+        include_object=include_object,
+        literal_binds=True,
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online() -> None:
+    with engine.connect() as connection:
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            include_object=include_object,
+        )
+        with context.begin_transaction():
+            context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
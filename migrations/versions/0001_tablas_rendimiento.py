@@ -0,0 +1,65 @@
+"""Tablas de apoyo: kpi_hito_diario, festivo y ws_evento
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18
+
+Primera migración. El resto del esquema ya existía antes de usar Alembic y no se
+recrea; en una base de datos ya en uso las tablas de esta migración pueden existir
+(creadas a mano), por eso se crean solo si faltan.
+"""
+import sqlalchemy as sa
+from alembic import op
+
+from app.infrastructure.db.migraciones import existe_tabla
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    if not existe_tabla("kpi_hito_diario"):
+        op.create_table(
+            "kpi_hito_diario",
+            sa.Column("cliente_id", sa.String(9), primary_key=True),
+            sa.Column("proceso_id", sa.Integer, primary_key=True),
+            sa.Column("dia", sa.Date, primary_key=True),
+            sa.Column("estado", sa.String(50), primary_key=True),
+            sa.Column("hitos", sa.Integer, nullable=False),
+            sa.Column("dias_resolucion", sa.Integer, nullable=True),
+            sa.Column("resueltos", sa.Integer, nullable=False),
+            sa.Column("ultima_fecha_estado", sa.DateTime, nullable=True),
+        )
+
+    if not existe_tabla("festivo"):
+        op.create_table(
+            "festivo",
+            sa.Column("id", sa.Integer, primary_key=True),
+            sa.Column("fecha", sa.Date, nullable=False),
+            sa.Column("region", sa.String(50), nullable=True),
+            sa.Column("descripcion", sa.String(255), nullable=True),
+            sa.UniqueConstraint("fecha", "region", name="uq_festivo_fecha_region"),
+        )
+        op.create_index("ix_festivo_id", "festivo", ["id"])
+        op.create_index("ix_festivo_fecha", "festivo", ["fecha"])
+
+    if not existe_tabla("ws_evento"):
+        op.create_table(
+            "ws_evento",
+            sa.Column("id", sa.Integer, primary_key=True),
+            sa.Column("cod_subdepar", sa.String(6), nullable=False),
+            sa.Column("payload", sa.Text, nullable=False),
+            sa.Column("origen", sa.String(32), nullable=False),
+            sa.Column("creado", sa.DateTime, nullable=False),
+        )
+        op.create_index("ix_ws_evento_id", "ws_evento", ["id"])
+        op.create_index("ix_ws_evento_cod_subdepar", "ws_evento", ["cod_subdepar"])
+        op.create_index("ix_ws_evento_creado", "ws_evento", ["creado"])
+
+
+def downgrade() -> None:
+    op.drop_table("ws_evento")
+    op.drop_table("festivo")
+    op.drop_table("kpi_hito_diario")
@@ -0,0 +1,40 @@
+"""Columnas calculadas anio_limite/mes_limite en cliente_proceso_hito
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18
+
+Persistidas para poder indexarlas: los filtros por mes sin año
+(MONTH(fecha_limite) = :mes) se resuelven con mes_limite. Solo SQL Server.
+"""
+import sqlalchemy as sa
+from alembic import op
+
+from app.infrastructure.db.migraciones import es_mssql, existe_columna
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    if not es_mssql():
+        return
+    if not existe_columna("cliente_proceso_hito", "anio_limite"):
+        op.add_column(
+            "cliente_proceso_hito",
+            sa.Column("anio_limite", sa.Integer, sa.Computed("YEAR(fecha_limite)", persisted=True)),
+        )
+    if not existe_columna("cliente_proceso_hito", "mes_limite"):
+        op.add_column(
+            "cliente_proceso_hito",
+            sa.Column("mes_limite", sa.Integer, sa.Computed("MONTH(fecha_limite)", persisted=True)),
+        )
+
+
+def downgrade() -> None:
+    if not es_mssql():
+        return
+    op.drop_column("cliente_proceso_hito", "mes_limite")
+    op.drop_column("cliente_proceso_hito", "anio_limite")
@@ -0,0 +1,57 @@
+"""Índices de cobertura para los joins y filtros más frecuentes
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18
+
+Derivados de las consultas de los repositorios (ver app/infrastructure/db/indices.py,
+que es la lista que comprueba verificar_indices). Los índices que ya existan con el
+mismo nombre no se tocan.
+"""
+from app.infrastructure.db.migraciones import crear_indice, eliminar_indice, es_mssql
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+# (nombre, tabla, columnas, incluidas)
+INDICES = [
+    ("ix_cph_cliente_proceso_id", "cliente_proceso_hito", ["cliente_proceso_id"],
+     ["hito_id", "estado", "habilitado", "fecha_limite"]),
+    ("ix_cph_hito_id", "cliente_proceso_hito", ["hito_id"], ["cliente_proceso_id", "habilitado", "fecha_limite"]),
+    ("ix_cph_fecha_limite_habilitado", "cliente_proceso_hito", ["fecha_limite", "habilitado"],
+     ["estado", "cliente_proceso_id", "hito_id"]),
+    ("ix_cph_fecha_estado", "cliente_proceso_hito", ["fecha_estado"],
+     ["cliente_proceso_id", "hito_id", "estado", "fecha_limite"]),
+    ("ix_cliente_proceso_cliente_id", "cliente_proceso", ["cliente_id"], ["proceso_id", "fecha_inicio", "habilitado"]),
+    ("ix_cliente_proceso_proceso_id", "cliente_proceso", ["proceso_id"], ["cliente_id"]),
+    ("ix_cliente_proceso_fecha_inicio", "cliente_proceso", ["fecha_inicio"], ["cliente_id", "proceso_id"]),
+    ("ix_phm_proceso_id_hito_id", "proceso_hito_maestro", ["proceso_id", "hito_id"], []),
+    ("ix_phm_hito_id", "proceso_hito_maestro", ["hito_id"], ["proceso_id"]),
+    ("ix_clientesubdepar_cif", "clienteSubDepar", ["cif"], ["codSubDePar"]),
+    ("ix_clientesubdepar_codsubdepar", "clienteSubDepar", ["codSubDePar"], ["id"]),
+    ("ix_cphc_cliente_proceso_hito_id", "cliente_proceso_hito_cumplimiento", ["cliente_proceso_hito_id"], []),
+    ("ix_documentos_cliente_proceso_hito_id", "documentos", ["cliente_proceso_hito_id"], []),
+    ("ix_auditoria_calendarios_cliente_id", "auditoria_calendarios", ["cliente_id", "fecha_modificacion"], []),
+    ("ix_auditoria_calendarios_hito_id", "auditoria_calendarios", ["hito_id"], []),
+]
+
+# Sobre las columnas calculadas de 0002
+INDICES_MSSQL = [
+    ("ix_cph_mes_anio_limite", "cliente_proceso_hito", ["mes_limite", "anio_limite"],
+     ["habilitado", "estado", "cliente_proceso_id", "hito_id"]),
+]
+
+
+def upgrade() -> None:
+    for nombre, tabla, columnas, incluidas in INDICES:
+        crear_indice(nombre, tabla, columnas, incluidas)
+    if es_mssql():
+        for nombre, tabla, columnas, incluidas in INDICES_MSSQL:
+            crear_indice(nombre, tabla, columnas, incluidas)
+
+
+def downgrade() -> None:
+    for nombre, tabla, _, _ in INDICES_MSSQL + INDICES:
+        eliminar_indice(nombre, tabla)
@@ -0,0 +1,35 @@
+"""Tabla catalogo_version para invalidar las cachés de catálogo entre workers
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18
+
+Una fila por catálogo cacheado (proceso, hito, proceso_hito_maestro). Las escrituras
+incrementan su versión en la misma transacción y cada worker la consulta
+periódicamente para vaciar su copia en memoria.
+"""
+import sqlalchemy as sa
+from alembic import op
+
+from app.infrastructure.db.migraciones import existe_tabla
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+CATALOGOS = ("proceso", "hito", "proceso_hito_maestro")
+
+
+def upgrade() -> None:
+    if not existe_tabla("catalogo_version"):
+        tabla = op.create_table(
+            "catalogo_version",
+            sa.Column("catalogo", sa.String(50), primary_key=True),
+            sa.Column("version", sa.BigInteger, nullable=False),
+        )
+        op.bulk_insert(tabla, [{"catalogo": catalogo, "version": 0} for catalogo in CATALOGOS])
+
+
+def downgrade() -> None:
+    op.drop_table("catalogo_version")
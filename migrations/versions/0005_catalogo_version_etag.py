@@ -0,0 +1,39 @@
+"""Filas de catalogo_version para las tablas con ETag
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18
+
+plantilla, metadato y documental_categoria incrementan su versión en cada escritura de
+sus repositorios; los listados usan esa versión como ETag. subdepar no se escribe desde
+la aplicación: su ETag además caduca por tiempo.
+"""
+import sqlalchemy as sa
+from alembic import op
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+TABLAS = ("plantilla", "metadato", "documental_categoria", "subdepar")
+
+
+def upgrade() -> None:
+    conexion = op.get_bind()
+    existentes = {fila[0] for fila in conexion.execute(sa.text("SELECT catalogo FROM catalogo_version"))}
+    for tabla in TABLAS:
+        if tabla not in existentes:
+            conexion.execute(
+                sa.text("INSERT INTO catalogo_version (catalogo, version) VALUES (:catalogo, 0)"),
+                {"catalogo": tabla},
+            )
+
+
+def downgrade() -> None:
+    op.get_bind().execute(
+        sa.text("DELETE FROM catalogo_version WHERE catalogo IN :tablas").bindparams(
+            sa.bindparam("tablas", expanding=True)
+        ),
+        {"tablas": list(TABLAS)},
+    )
@@ -0,0 +1,102 @@
+"""Cola kpi_hito_pendiente alimentada por triggers para el refresco de kpi_hito_diario
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18
+
+El refresco incremental buscaba cambios por cph.fecha_estado posterior a la marca del
+agregado, pero fecha_estado la escribe el cliente (o no se toca, como en las
+actualizaciones de admin) y los borrados y cambios de fecha_limite no dejaban rastro de
+la clave anterior. Ahora los triggers encolan, en la misma transacción que la escritura,
+la clave (cliente, proceso, día) nueva y la anterior de cada fila afectada, sea cual sea
+la ruta que escribe.
+
+Se vacía kpi_hito_diario para que el siguiente refresco lo reconstruya completo y
+corrija lo que el refresco anterior hubiera dejado desfasado. ix_cph_fecha_estado solo
+servía a la marca y se elimina.
+"""
+import sqlalchemy as sa
+from alembic import op
+
+from app.infrastructure.db.migraciones import crear_indice, eliminar_indice, es_mssql, existe_tabla
+
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+# Los UPDATE que no tocan estas columnas no cambian el agregado (p. ej. habilitado)
+_TRIGGER_CPH = """
+CREATE TRIGGER dbo.tr_cph_kpi_pendiente ON dbo.cliente_proceso_hito
+AFTER INSERT, UPDATE, DELETE
+AS
+BEGIN
+    SET NOCOUNT ON;
+    IF EXISTS (SELECT 1 FROM inserted) AND EXISTS (SELECT 1 FROM deleted)
+       AND NOT (UPDATE(estado) OR UPDATE(fecha_estado) OR UPDATE(fecha_limite) OR UPDATE(cliente_proceso_id))
+        RETURN;
+
+    INSERT INTO dbo.kpi_hito_pendiente (cliente_id, proceso_id, dia)
+    SELECT DISTINCT cp.cliente_id, cp.proceso_id, f.fecha_limite
+    FROM (
+        SELECT cliente_proceso_id, fecha_limite FROM inserted
+        UNION
+        SELECT cliente_proceso_id, fecha_limite FROM deleted
+    ) f
+    JOIN dbo.cliente_proceso cp ON cp.id = f.cliente_proceso_id
+    WHERE cp.cliente_id IS NOT NULL AND f.fecha_limite IS NOT NULL;
+END
+"""
+
+_TRIGGER_CP = """
+CREATE TRIGGER dbo.tr_cp_kpi_pendiente ON dbo.cliente_proceso
+AFTER UPDATE
+AS
+BEGIN
+    SET NOCOUNT ON;
+    IF NOT (UPDATE(cliente_id) OR UPDATE(proceso_id))
+        RETURN;
+
+    INSERT INTO dbo.kpi_hito_pendiente (cliente_id, proceso_id, dia)
+    SELECT DISTINCT c.cliente_id, c.proceso_id, cph.fecha_limite
+    FROM (
+        SELECT id, cliente_id, proceso_id FROM inserted
+        UNION
+        SELECT id, cliente_id, proceso_id FROM deleted
+    ) c
+    JOIN dbo.cliente_proceso_hito cph ON cph.cliente_proceso_id = c.id
+    WHERE c.cliente_id IS NOT NULL AND cph.fecha_limite IS NOT NULL;
+END
+"""
+
+
+def upgrade() -> None:
+    if not existe_tabla("kpi_hito_pendiente"):
+        op.create_table(
+            "kpi_hito_pendiente",
+            sa.Column("id", sa.BigInteger, primary_key=True, autoincrement=True),
+            sa.Column("cliente_id", sa.String(9), nullable=False),
+            sa.Column("proceso_id", sa.Integer, nullable=False),
+            sa.Column("dia", sa.Date, nullable=False),
+        )
+
+    # El refresco de kpi_hito_diario es T-SQL: los triggers solo tienen sentido en SQL Server
+    if es_mssql():
+        op.execute("DROP TRIGGER IF EXISTS dbo.tr_cph_kpi_pendiente")
+        op.execute(_TRIGGER_CPH)
+        op.execute("DROP TRIGGER IF EXISTS dbo.tr_cp_kpi_pendiente")
+        op.execute(_TRIGGER_CP)
+
+    if existe_tabla("kpi_hito_diario"):
+        op.execute("DELETE FROM kpi_hito_diario")
+
+    eliminar_indice("ix_cph_fecha_estado", "cliente_proceso_hito")
+
+
+def downgrade() -> None:
+    crear_indice("ix_cph_fecha_estado", "cliente_proceso_hito", ["fecha_estado"],
+                 ["cliente_proceso_id", "hito_id", "estado", "fecha_limite"])
+    if es_mssql():
+        op.execute("DROP TRIGGER IF EXISTS dbo.tr_cp_kpi_pendiente")
+        op.execute("DROP TRIGGER IF EXISTS dbo.tr_cph_kpi_pendiente")
+    op.drop_table("kpi_hito_pendiente")
@@ -0,0 +1,28 @@
+"""Fila de catalogo_version para festivo
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18
+
+El calendario laboral de cada worker se guardaba sin caducidad y solo lo invalidaba el
+worker que atendía el alta o la baja del festivo. Ahora las escrituras en festivo
+incrementan esta versión y cada worker vacía su calendario al ver el cambio.
+"""
+import sqlalchemy as sa
+from alembic import op
+
+revision = "0007"
+down_revision = "0006"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    conexion = op.get_bind()
+    existe = conexion.execute(sa.text("SELECT 1 FROM catalogo_version WHERE catalogo = 'festivo'")).first()
+    if existe is None:
+        conexion.execute(sa.text("INSERT INTO catalogo_version (catalogo, version) VALUES ('festivo', 0)"))
+
+
+def downgrade() -> None:
+    op.get_bind().execute(sa.text("DELETE FROM catalogo_version WHERE catalogo = 'festivo'"))
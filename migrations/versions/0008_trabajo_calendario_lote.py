@@ -0,0 +1,44 @@
+"""Tabla trabajo_calendario_lote con el estado de las generaciones por lotes
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-18
+
+El progreso de los trabajos se guardaba en memoria del worker que los aceptaba: con
+varios workers el GET de progreso daba 404 en los demás, y un reinicio perdía los
+trabajos en curso. Ahora se guarda en esta tabla.
+"""
+import sqlalchemy as sa
+from alembic import op
+
+from app.infrastructure.db.migraciones import existe_tabla
+
+revision = "0008"
+down_revision = "0007"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    if not existe_tabla("trabajo_calendario_lote"):
+        op.create_table(
+            "trabajo_calendario_lote",
+            sa.Column("id", sa.String(32), primary_key=True),
+            sa.Column("estado", sa.String(20), nullable=False),
+            sa.Column("origen", sa.Text, nullable=False),
+            sa.Column("total", sa.Integer, nullable=False),
+            sa.Column("procesados", sa.Integer, nullable=False),
+            sa.Column("cliente_procesos", sa.Integer, nullable=False),
+            sa.Column("hitos", sa.Integer, nullable=False),
+            sa.Column("num_errores", sa.Integer, nullable=False),
+            sa.Column("errores", sa.Text, nullable=False),
+            sa.Column("creado", sa.DateTime, nullable=False),
+            sa.Column("iniciado", sa.DateTime, nullable=True),
+            sa.Column("finalizado", sa.DateTime, nullable=True),
+            sa.Column("actualizado", sa.DateTime, nullable=False),
+        )
+        op.create_index("ix_trabajo_calendario_lote_creado", "trabajo_calendario_lote", ["creado"])
+
+
+def downgrade() -> None:
+    op.drop_table("trabajo_calendario_lote")